@@ -8,6 +8,12 @@ class Settings:
     PROJECT_NAME: str = "AI Interviewer MVP"
 
     DATABASE_URL: str = os.getenv("DATABASE_URL", "").strip()
+    # Optional read replica for read-only endpoints; bypassed while its lag exceeds the max
+    # or it can't be reached within the connect timeout
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "").strip()
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "5"))
+    DATABASE_REPLICA_CHECK_SECONDS: float = float(os.getenv("DATABASE_REPLICA_CHECK_SECONDS", "5"))
+    DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "").strip()
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini").strip()
     EMAIL_PROVIDER: str = os.getenv("EMAIL_PROVIDER", "sendgrid").strip()
@@ -16,6 +22,83 @@ class Settings:
     FRONTEND_BASE_URL: str = os.getenv("FRONTEND_BASE_URL", "https://uninvaded-nonconcentrically-pok.ngrok-free.dev").strip()
     ADMIN_NOTIFY_EMAILS: str | None = os.getenv("ADMIN_NOTIFY_EMAILS")
 
+    # Bulk invites: recipients per email API call, pause between calls, max rows per request
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+    EMAIL_BATCH_INTERVAL_SECONDS: float = float(os.getenv("EMAIL_BATCH_INTERVAL_SECONDS", "1.0"))
+    BULK_INVITE_MAX_ROWS: int = int(os.getenv("BULK_INVITE_MAX_ROWS", "5000"))
+
+    # Bulk job import: max questions across all jobs in one request
+    JOB_IMPORT_MAX_QUESTIONS: int = int(os.getenv("JOB_IMPORT_MAX_QUESTIONS", "20000"))
+
+    # Job reads: browser max-age (0 = always revalidate via ETag), serialized jobs kept per worker
+    JOB_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("JOB_CACHE_MAX_AGE_SECONDS", "0"))
+    JOB_JSON_CACHE_SIZE: int = int(os.getenv("JOB_JSON_CACHE_SIZE", "256"))
+
+    # Invite links: token -> interview id cache per worker; unknown tokens are remembered briefly
+    INVITE_TOKEN_CACHE_SIZE: int = int(os.getenv("INVITE_TOKEN_CACHE_SIZE", "10000"))
+    INVITE_TOKEN_CACHE_SECONDS: float = float(os.getenv("INVITE_TOKEN_CACHE_SECONDS", "3600"))
+    INVITE_TOKEN_NEGATIVE_CACHE_SECONDS: float = float(os.getenv("INVITE_TOKEN_NEGATIVE_CACHE_SECONDS", "30"))
+
+    # Run pending migrations on startup (local dev only; use `python -m app.migrate` in production)
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "false").lower() == "true"
+
+    # LLM resilience
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+    LLM_DEADLINE_SECONDS: float = float(os.getenv("LLM_DEADLINE_SECONDS", "45"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_BACKOFF_BASE_SECONDS: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    LLM_BACKOFF_MAX_SECONDS: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "5"))
+    # Separate slots for background LLM work (rescoring, deferred scoring, follow-up bank)
+    LLM_BATCH_MAX_CONCURRENCY: int = int(os.getenv("LLM_BATCH_MAX_CONCURRENCY", "2"))
+    LLM_BATCH_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("LLM_BATCH_QUEUE_TIMEOUT_SECONDS", "30"))
+    LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Pre-gate: too-short answers under this many words skip the LLM on the request path
+    # (templated follow-up + heuristic provisional score; LLM scoring runs in the background)
+    LLM_PREGATE_ENABLED: bool = os.getenv("LLM_PREGATE_ENABLED", "true").lower() == "true"
+    LLM_PREGATE_MAX_WORDS: int = int(os.getenv("LLM_PREGATE_MAX_WORDS", "15"))
+    LLM_PREGATE_ASYNC_SCORING: bool = os.getenv("LLM_PREGATE_ASYNC_SCORING", "true").lower() == "true"
+    DEFERRED_SCORING_WORKERS: int = int(os.getenv("DEFERRED_SCORING_WORKERS", "2"))
+
+    # Follow-up bank: pre-generated follow-ups per question, used when the
+    # answer's deficiency is classified with at least this confidence
+    FOLLOWUP_BANK_ENABLED: bool = os.getenv("FOLLOWUP_BANK_ENABLED", "true").lower() == "true"
+    FOLLOWUP_BANK_MIN_CONFIDENCE: float = float(os.getenv("FOLLOWUP_BANK_MIN_CONFIDENCE", "0.7"))
+    FOLLOWUP_BANK_PER_CATEGORY: int = int(os.getenv("FOLLOWUP_BANK_PER_CATEGORY", "3"))
+    FOLLOWUP_BANK_CACHE_SECONDS: float = float(os.getenv("FOLLOWUP_BANK_CACHE_SECONDS", "300"))
+    FOLLOWUP_BANK_CACHE_SIZE: int = int(os.getenv("FOLLOWUP_BANK_CACHE_SIZE", "2000"))
+
+    # Near-duplicate answers (hashed n-gram vectors, cosine similarity per question).
+    # Above REUSE the earlier score is reused instead of calling the LLM; above FLAG
+    # the answer is marked as a possible copy in ai_suspect_reasons.
+    SIMILARITY_ENABLED: bool = os.getenv("SIMILARITY_ENABLED", "true").lower() == "true"
+    SIMILARITY_REUSE_THRESHOLD: float = float(os.getenv("SIMILARITY_REUSE_THRESHOLD", "0.97"))
+    SIMILARITY_FLAG_THRESHOLD: float = float(os.getenv("SIMILARITY_FLAG_THRESHOLD", "0.9"))
+    SIMILARITY_MIN_CHARS: int = int(os.getenv("SIMILARITY_MIN_CHARS", "80"))
+    SIMILARITY_DIM: int = int(os.getenv("SIMILARITY_DIM", "1024"))
+    SIMILARITY_INDEX_CAPACITY: int = int(os.getenv("SIMILARITY_INDEX_CAPACITY", "1000"))
+    SIMILARITY_MAX_QUESTIONS: int = int(os.getenv("SIMILARITY_MAX_QUESTIONS", "64"))
+    SIMILARITY_INDEX_TTL_SECONDS: float = float(os.getenv("SIMILARITY_INDEX_TTL_SECONDS", "600"))
+
+    # Summary prompt budgeting (estimated tokens)
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = int(os.getenv("SUMMARY_PROMPT_TOKEN_BUDGET", "6000"))
+    SUMMARY_ANSWER_MAX_TOKENS: int = int(os.getenv("SUMMARY_ANSWER_MAX_TOKENS", "400"))
+
+    # Raw proctoring events of completed interviews are rolled up into per-minute buckets after this
+    PROCTOR_RETENTION_DAYS: int = int(os.getenv("PROCTOR_RETENTION_DAYS", "30"))
+    # Proctoring rule set applied to new events (see services/proctoring_rules.py)
+    PROCTORING_RULES_VERSION: str = os.getenv("PROCTORING_RULES_VERSION", "v1")
+
+    # Request profiling (opt-in). Admins can also force a trace per request
+    # by sending "X-Profile: 1" with their bearer token.
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SLOW_MS: int = int(os.getenv("PROFILING_SLOW_MS", "1500"))
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles").strip()
+
 
     def __init__(self):
         # Normalize scheme for SQLAlchemy
@@ -1,7 +1,12 @@
 # app/database.py
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
+from .utils.profiling import instrument_engine
 
 # Create SQLAlchemy engine using DATABASE_URL from environment
 # pool_pre_ping helps avoid "stale connection" issues in managed DBs like Neon/Render
@@ -10,9 +15,37 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+# Emits "db.query" spans when a request is being profiled (no-op otherwise)
+instrument_engine(engine)
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _replica_connect_args(url: str) -> dict:
+    # The lag check runs on the request path: an unreachable replica must fail
+    # fast instead of waiting out the OS TCP timeout
+    if make_url(url).get_backend_name() == "postgresql":
+        return {"connect_timeout": max(1, settings.DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS)}
+    return {}
+
+
+# Optional read replica (DATABASE_REPLICA_URL); None means every read goes to the primary
+replica_engine = (
+    create_engine(
+        settings.DATABASE_REPLICA_URL,
+        pool_pre_ping=True,
+        connect_args=_replica_connect_args(settings.DATABASE_REPLICA_URL),
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+else:
+    ReplicaSessionLocal = None
+
 # Base for models
 Base = declarative_base()
 
@@ -27,3 +60,73 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ----------------------------
+# Read replica routing
+# ----------------------------
+# Zero when the replica has replayed everything it received (an idle primary
+# would otherwise look like growing lag); zero on a primary.
+_PG_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+_replica_lock = threading.Lock()
+_replica_state = {"usable": False, "lag": None, "checked_at": float("-inf")}
+
+
+def replica_lag_seconds() -> Optional[float]:
+    """Replication lag of the replica in seconds; None if it can't be reached."""
+    if replica_engine is None:
+        return None
+    try:
+        with replica_engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                # Nothing to measure (e.g. a local SQLite copy): treat as current
+                return 0.0
+            return float(conn.execute(_PG_LAG_SQL).scalar() or 0.0)
+    except Exception as e:
+        print(f"Read replica check failed: {e}")
+        return None
+
+
+def replica_usable() -> bool:
+    """
+    Whether reads may go to the replica now. The lag is re-checked at most
+    every DATABASE_REPLICA_CHECK_SECONDS per worker; reads fall back to the
+    primary while the replica is unreachable or further behind than
+    DATABASE_REPLICA_MAX_LAG_SECONDS.
+    """
+    if replica_engine is None:
+        return False
+
+    now = time.monotonic()
+    with _replica_lock:
+        if now - _replica_state["checked_at"] < settings.DATABASE_REPLICA_CHECK_SECONDS:
+            return _replica_state["usable"]
+        # Claim the check so concurrent requests keep using the last result
+        _replica_state["checked_at"] = now
+
+    lag = replica_lag_seconds()
+    usable = lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+    with _replica_lock:
+        _replica_state.update(usable=usable, lag=lag)
+    return usable
+
+
+def get_read_db():
+    """
+    Like get_db, but for read-only endpoints: uses the read replica when one is
+    configured and fresh enough, else the primary. Never write through it.
+    """
+    db = ReplicaSessionLocal() if replica_usable() else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
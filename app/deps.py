@@ -3,7 +3,6 @@ from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
 
 from sqlalchemy.orm import Session
 
@@ -20,6 +19,8 @@ def get_current_user(
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
 
+    from jose import JWTError
+
     try:
         payload = decode_token(token)
         subject: Optional[str] = payload.get("sub")
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import Base, engine
+from .database import engine
+from . import migrations
 from .middleware.rate_limit import RateLimitMiddleware
+from .middleware.profiling import ProfilingMiddleware
+from .config import settings
 
 from .routers import health, jobs, interviews, admin, auth, portal, candidate
 from .routers.public import router as public_router
@@ -31,6 +34,14 @@ app.add_middleware(
 
 app.add_middleware(RateLimitMiddleware, requests_per_minute=int(os.getenv("RATE_LIMIT_RPM", "120")))
 
+app.add_middleware(
+    ProfilingMiddleware,
+    enabled=settings.PROFILING_ENABLED,
+    slow_ms=settings.PROFILING_SLOW_MS,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    output_dir=settings.PROFILING_DIR,
+)
+
 # ----------------------------
 # Routers (NO double prefixing)
 # ----------------------------
@@ -45,4 +56,5 @@ app.include_router(candidate.router)
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    # Schema changes are applied by `python -m app.migrate`; startup only checks the version row
+    migrations.check_schema(engine, auto_migrate=settings.AUTO_MIGRATE)
@@ -0,0 +1,107 @@
+# app/middleware/profiling.py
+
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.utils.profiling import start_trace, end_trace
+
+PROFILE_HEADER = "x-profile"
+
+
+def _is_admin_request(request: Request) -> bool:
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return False
+
+    from app.security import decode_token
+
+    try:
+        payload = decode_token(auth.split(" ", 1)[1].strip())
+    except Exception:
+        return False
+    return payload.get("role") == "admin"
+
+
+def _route_path(request: Request) -> str:
+    # The matched template ("/interviews/start/{invite_token}"), never the raw
+    # path: that would put invite tokens into trace names and dump filenames
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Records a span tree (DB statements, LLM calls, emails, serialization) per request.
+
+    - PROFILING_ENABLED=true traces every request and dumps the slow ones
+      (>= PROFILING_SLOW_MS, sampled by PROFILING_SAMPLE_RATE) to PROFILING_DIR.
+    - Admins can send "X-Profile: 1" to trace and dump a single request on demand.
+    """
+
+    def __init__(
+        self,
+        app,
+        enabled: bool = False,
+        slow_ms: int = 1500,
+        sample_rate: float = 1.0,
+        output_dir: str = "profiles",
+    ):
+        super().__init__(app)
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+
+    async def dispatch(self, request: Request, call_next):
+        forced = request.headers.get(PROFILE_HEADER) == "1" and _is_admin_request(request)
+        if not (self.enabled or forced):
+            return await call_next(request)
+
+        # Routing happens inside call_next; the name is filled in once the route is known
+        trace, token = start_trace(request.method, method=request.method, forced=forced)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            end_trace(trace, token)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        path = _route_path(request)
+        trace.root.name = f"{request.method} {path}"
+        trace.root.attrs["path"] = path
+        trace.root.attrs["status_code"] = response.status_code
+
+        timings = [f"total;dur={elapsed_ms:.1f}"]
+        for cat, ms in sorted(trace.totals_by_category().items()):
+            timings.append(f"{cat};dur={ms:.1f}")
+        response.headers["Server-Timing"] = ", ".join(timings)
+
+        slow = elapsed_ms >= self.slow_ms and random.random() < self.sample_rate
+        if forced or slow:
+            # File I/O stays off the event loop
+            await run_in_threadpool(self._dump, trace, elapsed_ms)
+
+        return response
+
+    def _dump(self, trace, elapsed_ms: float) -> None:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", trace.root.name).strip("_")[:80]
+            path = os.path.join(self.output_dir, f"{stamp}-{slug}.json")
+
+            data = trace.to_dict()
+            data["elapsed_ms"] = round(elapsed_ms, 3)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, default=str)
+            print(f"[PROFILE] {trace.root.name} took {elapsed_ms:.0f}ms -> {path}")
+        except Exception as e:
+            print(f"Profile dump failed: {e}")
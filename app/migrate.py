@@ -0,0 +1,31 @@
+# app/migrate.py
+"""
+One-shot migration command, run separately from app startup:
+
+    python -m app.migrate           # apply pending migrations
+    python -m app.migrate --check   # exit 1 if migrations are pending
+"""
+import sys
+
+from .database import engine
+from . import migrations
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    if "--check" in argv:
+        with engine.connect() as conn:
+            current = migrations.current_version(conn) or 0
+        latest = migrations.latest_version()
+        print(f"Schema version {current}, latest {latest}")
+        return 0 if current >= latest else 1
+
+    applied = migrations.upgrade(engine)
+    if not applied:
+        print(f"Schema is up to date (version {migrations.latest_version()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# app/migrations/__init__.py
+"""
+Versioned schema migrations.
+
+Run pending migrations with `python -m app.migrate`. App startup only reads
+the current version from `schema_version` and refuses to boot against an
+out-of-date schema (unless AUTO_MIGRATE=true).
+
+To add a migration, create `versions/mNNNN_<name>.py` with VERSION,
+DESCRIPTION and `upgrade(conn)`, and append it to MIGRATIONS below.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from .versions import (
+    m0001_initial_schema,
+    m0002_rescore_jobs,
+    m0003_answer_idempotency_keys,
+    m0004_proctor_event_timeseries,
+    m0005_integrity_seq,
+    m0006_followup_templates,
+    m0007_search_indexes,
+    m0008_job_revision,
+)
+
+MIGRATIONS = [
+    m0001_initial_schema,
+    m0002_rescore_jobs,
+    m0003_answer_idempotency_keys,
+    m0004_proctor_event_timeseries,
+    m0005_integrity_seq,
+    m0006_followup_templates,
+    m0007_search_indexes,
+    m0008_job_revision,
+]
+
+# Arbitrary constant so concurrent `migrate` runs on Postgres serialize
+ADVISORY_LOCK_ID = 7_301_305
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].VERSION if MIGRATIONS else 0
+
+
+def current_version(conn: Connection) -> Optional[int]:
+    """
+    Returns the applied version, 0 for an empty version table, or None when
+    the version table does not exist yet.
+    """
+    try:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        conn.rollback()
+        return None
+
+
+def pending(conn: Connection) -> List:
+    current = current_version(conn) or 0
+    return [m for m in MIGRATIONS if m.VERSION > current]
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """Apply pending migrations, each in its own transaction. Returns applied versions."""
+    applied: List[int] = []
+
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+            conn.commit()
+
+        try:
+            _meta.create_all(bind=conn, checkfirst=True)
+            conn.commit()
+
+            todo = pending(conn)
+            conn.commit()
+
+            for migration in todo:
+                with conn.begin():
+                    migration.upgrade(conn)
+                    conn.execute(
+                        schema_version.insert().values(
+                            version=migration.VERSION,
+                            description=migration.DESCRIPTION,
+                            applied_at=datetime.now(timezone.utc),
+                        )
+                    )
+                applied.append(migration.VERSION)
+                print(f"Applied migration {migration.VERSION}: {migration.DESCRIPTION}")
+        finally:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": ADVISORY_LOCK_ID})
+                conn.commit()
+
+    return applied
+
+
+def check_schema(engine: Engine, auto_migrate: bool = False) -> None:
+    """
+    Startup check: a single SELECT against schema_version.
+    """
+    with engine.connect() as conn:
+        current = current_version(conn)
+
+    if current is not None and current >= latest_version():
+        return
+
+    if auto_migrate:
+        upgrade(engine)
+        return
+
+    raise RuntimeError(
+        f"Database schema is at version {current or 0}, app expects {latest_version()}. "
+        "Run `python -m app.migrate` before starting the app."
+    )
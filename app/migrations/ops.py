@@ -0,0 +1,35 @@
+# app/migrations/ops.py
+"""
+Small, idempotent DDL helpers for migrations.
+
+Databases created by the old `Base.metadata.create_all` startup may already
+have some of these objects, so every helper checks before it changes anything.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import Column, CreateColumn, Table
+
+
+def create_table(conn: Connection, table: Table) -> None:
+    table.create(bind=conn, checkfirst=True)
+
+
+def has_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    return any(c["name"] == column_name for c in inspect(conn).get_columns(table_name))
+
+
+def add_column(conn: Connection, table_name: str, column: Column) -> None:
+    if has_column(conn, table_name, column.name):
+        return
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+
+
+def create_index(conn: Connection, name: str, table_name: str, columns: str, unique: bool = False) -> None:
+    # IF NOT EXISTS is supported by both Postgres and SQLite
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table_name} ({columns})"))
+
+
+def drop_index(conn: Connection, name: str) -> None:
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
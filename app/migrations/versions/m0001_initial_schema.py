@@ -0,0 +1,111 @@
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+from ..ops import create_table
+
+VERSION = 1
+DESCRIPTION = "Initial schema (tables previously created by create_all on startup)"
+
+# Snapshot of the tables as the models defined them at this version. Migrations
+# must not use app.models: later columns and indexes belong to later migrations.
+_meta = MetaData()
+
+users = Table(
+    "users",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(200), nullable=False),
+    Column("email", String(255), unique=True, index=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("role", String(50), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+contact_leads = Table(
+    "contact_leads",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(150), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+jobs = Table(
+    "jobs",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("competencies", JSON, nullable=True),
+)
+
+job_questions = Table(
+    "job_questions",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id"), nullable=False),
+    Column("text", Text, nullable=False),
+    Column("competency", String(100), nullable=True),
+    Column("order_index", Integer, nullable=False),
+)
+
+interviews = Table(
+    "interviews",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id"), nullable=False),
+    Column("candidate_name", String(255), nullable=False),
+    Column("candidate_email", String(255), nullable=False),
+    Column("candidate_user_id", String, ForeignKey("users.id"), nullable=True),
+    Column("status", Enum("NOT_STARTED", "IN_PROGRESS", "COMPLETED", name="interviewstatus")),
+    Column("current_question_index", Integer, nullable=False),
+    Column("invite_token", String(255), unique=True, index=True, nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+    Column("transcript", Text, nullable=True),
+    Column("summary", Text, nullable=True),
+    Column("overall_score", Integer, nullable=True),
+    Column("active_question_id", Integer, ForeignKey("job_questions.id"), nullable=True),
+    Column("followup_round", Integer, nullable=False),
+    Column("followup_question_text", Text, nullable=True),
+    Column("max_followups_per_question", Integer, nullable=False),
+    Column("integrity_score", Integer, nullable=True),
+    Column("integrity_flags", JSON, nullable=True),
+    Column("proctoring_version", String(20), nullable=True),
+)
+
+interview_answers = Table(
+    "interview_answers",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id"), nullable=False),
+    Column("question_id", Integer, ForeignKey("job_questions.id"), nullable=True),
+    Column("question_text", Text, nullable=True),
+    Column("is_followup", Integer, nullable=False),
+    Column("parent_question_id", Integer, ForeignKey("job_questions.id"), nullable=True),
+    Column("followup_round", Integer, nullable=False),
+    Column("answer_text", Text, nullable=False),
+    Column("score", Integer, nullable=True),
+    Column("competency_scores", JSON, nullable=True),
+    Column("ai_feedback", Text, nullable=True),
+    Column("answer_meta", JSON, nullable=True),
+    Column("ai_suspect_score", Integer, nullable=True),
+    Column("ai_suspect_reasons", JSON, nullable=True),
+)
+
+interview_proctor_events = Table(
+    "interview_proctor_events",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("event_type", String(64), nullable=False),
+    Column("severity", Integer, nullable=False),
+    Column("payload", JSON, nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for table in (users, contact_leads, jobs, job_questions, interviews, interview_answers, interview_proctor_events):
+        create_table(conn, table)
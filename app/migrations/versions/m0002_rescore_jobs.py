@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+from ..ops import create_table
+
+VERSION = 2
+DESCRIPTION = "Add rescore_jobs"
+
+# Snapshot, not app.models (see m0001); jobs is only declared for the foreign key
+_meta = MetaData()
+Table("jobs", _meta, Column("id", Integer, primary_key=True))
+
+rescore_jobs = Table(
+    "rescore_jobs",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True),
+    Column("status", String(20), nullable=False),
+    Column("concurrency", Integer, nullable=False),
+    Column("batch_size", Integer, nullable=False),
+    Column("last_answer_id", Integer, nullable=False),
+    Column("total", Integer, nullable=True),
+    Column("processed", Integer, nullable=False),
+    Column("failed", Integer, nullable=False),
+    Column("elapsed_seconds", Float, nullable=False),
+    Column("error", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("updated_at", DateTime(timezone=True), nullable=True),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    create_table(conn, rescore_jobs)
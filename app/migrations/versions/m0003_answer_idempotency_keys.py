@@ -0,0 +1,26 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint, func
+from sqlalchemy.engine import Connection
+
+from ..ops import create_table
+
+VERSION = 3
+DESCRIPTION = "Add answer_idempotency_keys"
+
+# Snapshot, not app.models (see m0001); interviews is only declared for the foreign key
+_meta = MetaData()
+Table("interviews", _meta, Column("id", Integer, primary_key=True))
+
+answer_idempotency_keys = Table(
+    "answer_idempotency_keys",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False),
+    Column("key", String(255), nullable=False),
+    Column("response", JSON, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    UniqueConstraint("interview_id", "key", name="uq_answer_idempotency_interview_key"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    create_table(conn, answer_idempotency_keys)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint
+from sqlalchemy.engine import Connection
+
+from ..ops import create_index, create_table
+
+VERSION = 4
+DESCRIPTION = "Composite (interview_id, created_at) index on proctor events; per-minute proctor buckets"
+
+# Snapshot, not app.models (see m0001); interviews is only declared for the foreign key
+_meta = MetaData()
+Table("interviews", _meta, Column("id", Integer, primary_key=True))
+
+interview_proctor_buckets = Table(
+    "interview_proctor_buckets",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False),
+    Column("bucket_start", DateTime(timezone=True), nullable=False),
+    Column("event_type", String(64), nullable=False),
+    Column("count", Integer, nullable=False),
+    Column("max_severity", Integer, nullable=False),
+    UniqueConstraint(
+        "interview_id", "bucket_start", "event_type",
+        name="uq_interview_proctor_buckets_interview_bucket_type",
+    ),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(
+        conn,
+        "ix_interview_proctor_events_interview_created",
+        "interview_proctor_events",
+        "interview_id, created_at",
+    )
+    create_table(conn, interview_proctor_buckets)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+VERSION = 5
+DESCRIPTION = "Add interviews.integrity_seq (lock-free proctoring state updates)"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "interviews", Column("integrity_seq", Integer, nullable=False, server_default="0"))
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+from ..ops import create_table
+
+VERSION = 6
+DESCRIPTION = "Add followup_templates (pre-generated follow-up bank per job question)"
+
+# Snapshot, not app.models (see m0001); job_questions is only declared for the foreign key
+_meta = MetaData()
+Table("job_questions", _meta, Column("id", Integer, primary_key=True))
+
+followup_templates = Table(
+    "followup_templates",
+    _meta,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("question_id", Integer, ForeignKey("job_questions.id", ondelete="CASCADE"), nullable=False),
+    Column("category", String(32), nullable=False),
+    Column("text", Text, nullable=False),
+    Column("source", String(20), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_followup_templates_question_category", "question_id", "category"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    create_table(conn, followup_templates)
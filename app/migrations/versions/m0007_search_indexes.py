@@ -0,0 +1,63 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+DESCRIPTION = "Full-text search: GIN tsvector indexes (Postgres) / FTS5 tables (SQLite)"
+
+# (table, columns, text search config), frozen at this version. The tsvector
+# expressions must match search_service.pg_document() or Postgres won't use the
+# indexes; tests/test_search.py fails if the two drift apart. Changing a
+# search scope needs a new migration that rebuilds its index.
+DOCUMENTS = [
+    ("interview_answers", ["answer_text"], "english"),
+    ("interviews", ["candidate_name", "candidate_email"], "simple"),
+    ("contact_leads", ["name", "email", "message"], "english"),
+]
+
+
+def _pg_expression(columns, config: str) -> str:
+    joined = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+    return f"to_tsvector('{config}', {joined})"
+
+
+def _sqlite_fts(conn: Connection, table: str, columns) -> None:
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+
+    # External-content table: the FTS index stores only tokens, text stays in the base table
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END"
+    ))
+    # Only when indexed columns change: interviews are updated on every answer
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+    ))
+    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def upgrade(conn: Connection) -> None:
+    dialect = conn.dialect.name
+    for table, columns, config in DOCUMENTS:
+        if dialect == "postgresql":
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_fts ON {table} USING GIN ({_pg_expression(columns, config)})"
+            ))
+        elif dialect == "sqlite":
+            try:
+                _sqlite_fts(conn, table, columns)
+            except Exception as e:
+                # SQLite built without FTS5: search falls back to LIKE
+                print(f"FTS5 unavailable, skipping {table} search index: {e}")
+                return
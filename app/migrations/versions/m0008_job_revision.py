@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+VERSION = 8
+DESCRIPTION = "Add jobs.revision (ETags for job reads)"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "jobs", Column("revision", Integer, nullable=False, server_default="1"))
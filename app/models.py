@@ -6,7 +6,10 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     Enum,
+    Float,
     JSON,
+    Index,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.orm import relationship
@@ -27,6 +30,8 @@ class Job(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     competencies = Column(JSON, nullable=True)
+    # Bumped on every change to the job or its questions; drives read ETags
+    revision = Column(Integer, nullable=False, default=1, server_default="1")
 
     questions = relationship(
         "JobQuestion",
@@ -52,6 +57,12 @@ class JobQuestion(Base):
     order_index = Column(Integer, nullable=False, default=0)
 
     job = relationship("Job", back_populates="questions")
+    followup_templates = relationship(
+        "FollowupTemplate",
+        back_populates="question",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class InterviewAnswer(Base):
@@ -143,6 +154,8 @@ class Interview(Base):
     integrity_score = Column(Integer, nullable=True)          # 0-100
     integrity_flags = Column(JSON, nullable=True)            # {"tab_switches": 3, ...}
     proctoring_version = Column(String(20), nullable=True)   # "v1"
+    # Bumped on every integrity write; proctoring events compare-and-swap on it instead of locking the row
+    integrity_seq = Column(Integer, nullable=False, default=0, server_default="0")
     job = relationship("Job", back_populates="interviews")
 
     proctor_events = relationship(
@@ -165,6 +178,12 @@ class Interview(Base):
         cascade="all, delete-orphan",
     )
 
+    proctor_buckets = relationship(
+        "InterviewProctorBucket",
+        back_populates="interview",
+        cascade="all, delete-orphan",
+    )
+
     proctor_events = relationship(
         "InterviewProctorEvent",
         back_populates="interview",
@@ -175,6 +194,10 @@ class Interview(Base):
 
 class InterviewProctorEvent(Base):
     __tablename__ = "interview_proctor_events"
+    __table_args__ = (
+        # Timeline reads are always "events of one interview ordered by time"
+        Index("ix_interview_proctor_events_interview_created", "interview_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(
@@ -195,3 +218,99 @@ class InterviewProctorEvent(Base):
     payload = Column(JSON, nullable=True)
 
     interview = relationship("Interview", back_populates="proctor_events")
+
+
+class InterviewProctorBucket(Base):
+    """
+    Per-minute rollup of proctoring events, written by the retention job
+    once an interview is completed and its raw events are pruned.
+    """
+    __tablename__ = "interview_proctor_buckets"
+    __table_args__ = (
+        UniqueConstraint(
+            "interview_id", "bucket_start", "event_type",
+            name="uq_interview_proctor_buckets_interview_bucket_type",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(
+        Integer,
+        ForeignKey("interviews.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # truncated to the minute
+    event_type = Column(String(64), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    max_severity = Column(Integer, nullable=False, default=1)
+
+    interview = relationship("Interview", back_populates="proctor_buckets")
+
+
+class RescoreJob(Base):
+    __tablename__ = "rescore_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)  # optional filter
+
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, RUNNING, PAUSED, COMPLETED, FAILED
+    concurrency = Column(Integer, nullable=False, default=4)
+    batch_size = Column(Integer, nullable=False, default=100)
+
+    # Checkpoint: answers are processed in id order, resume from here
+    last_answer_id = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    elapsed_seconds = Column(Float, nullable=False, default=0.0)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AnswerIdempotencyKey(Base):
+    """
+    Stored AnswerScoringOut per (interview, Idempotency-Key) so retried
+    submissions replay the original response instead of re-scoring.
+    """
+    __tablename__ = "answer_idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("interview_id", "key", name="uq_answer_idempotency_interview_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(
+        Integer,
+        ForeignKey("interviews.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    key = Column(String(255), nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class FollowupTemplate(Base):
+    """
+    Pre-generated follow-up for a spine question, keyed by the deficiency
+    category it probes (DETAIL, OWNERSHIP, IMPACT, REFLECTION).
+    """
+    __tablename__ = "followup_templates"
+    __table_args__ = (
+        Index("ix_followup_templates_question_category", "question_id", "category"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    question_id = Column(
+        Integer,
+        ForeignKey("job_questions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category = Column(String(32), nullable=False)
+    text = Column(Text, nullable=False)
+    source = Column(String(20), nullable=False, default="LLM")  # LLM, DEFAULT
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    question = relationship("JobQuestion", back_populates="followup_templates")
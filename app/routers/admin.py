@@ -1,24 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from sqlalchemy.orm import Session, selectinload
 from typing import List
+from pydantic import TypeAdapter
 import secrets
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from .. import models, schemas
 from ..deps_admin import require_admin
 from sqlalchemy import desc
 from fastapi import BackgroundTasks
-from app.services.notification_service import send_candidate_invite
+from app.services.notification_service import send_candidate_invite, send_candidate_invites_bulk
+from app.services import rescoring_service, llm_service, proctoring_service, followup_bank_service, search_service, invite_service, job_service
+from app.config import settings
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from app.utils.responses import ORJSONResponse, adapter_response, etag_matches, etag_response, model_response
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Built once at import; list endpoints validate ORM rows through these a single time
+_job_list_adapter = TypeAdapter(List[schemas.JobOut])
+_interview_list_adapter = TypeAdapter(List[schemas.AdminInterviewOut])
+_proctor_event_list_adapter = TypeAdapter(List[schemas.ProctorEventOut])
+
 # --------------------
 # Leads
 # --------------------
 @router.get("/leads")
 def list_leads(
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
     return (
@@ -33,10 +44,16 @@ def list_leads(
 # --------------------
 @router.get("/jobs", response_model=List[schemas.JobOut])
 def admin_list_jobs(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
-    return db.query(models.Job).order_by(models.Job.id.desc()).all()
+    jobs = (
+        db.query(models.Job)
+        .options(selectinload(models.Job.questions))
+        .order_by(models.Job.id.desc())
+        .all()
+    )
+    return adapter_response(_job_list_adapter, jobs)
 
 @router.post("/jobs", response_model=schemas.JobOut)
 def admin_create_job(
@@ -44,40 +61,55 @@ def admin_create_job(
     db: Session = Depends(get_db),
     _admin: models.User = Depends(require_admin),
 ):
-    job = models.Job(
-        title=payload.title,
-        description=payload.description,
-        competencies=payload.competencies,
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-
-    if payload.questions:
-        for q in payload.questions:
-            db.add(
-                models.JobQuestion(
-                    job_id=job.id,
-                    text=q.text,
-                    competency=q.competency,
-                    order_index=q.order_index,
-                )
-            )
-        db.commit()
-        db.refresh(job)
-
-    return job
+    return job_service.create_job(db, payload)
+
+
+@router.post("/jobs/bulk", response_model=schemas.JobImportOut)
+def admin_import_jobs(
+    payload: schemas.JobImportIn,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    try:
+        return job_service.import_jobs(db, payload.jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/jobs/import", response_model=schemas.JobImportOut)
+def admin_import_jobs_file(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    """JSON, YAML or CSV file; the format is taken from `file_format` or the file name."""
+    fmt = (file_format or job_service.detect_format(file.filename, file.content_type)).lower()
+    try:
+        jobs = job_service.parse_import(file.file.read(), fmt)
+        return job_service.import_jobs(db, jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/jobs/{job_id}", response_model=schemas.JobDetailOut)
 def admin_get_job(
     job_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
+    revision = job_service.get_revision(db, job_id)
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    etag = job_service.job_etag(job_id, revision)
+    if etag_matches(request, etag):
+        return etag_response(etag, job_service.cache_control())
+
+    loaded = job_service.job_json(db, job_id, revision)
+    if loaded is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    revision, body = loaded
+    return etag_response(job_service.job_etag(job_id, revision), job_service.cache_control(), body)
 
 @router.post("/jobs/{job_id}/questions", response_model=schemas.JobQuestionOut)
 def admin_add_job_question(
@@ -86,20 +118,10 @@ def admin_add_job_question(
     db: Session = Depends(get_db),
     _admin: models.User = Depends(require_admin),
 ):
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
+    if job_service.get_revision(db, job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    q = models.JobQuestion(
-        job_id=job_id,
-        text=payload.text,
-        competency=payload.competency,
-        order_index=payload.order_index,
-    )
-    db.add(q)
-    db.commit()
-    db.refresh(q)
-    return q
+    return job_service.add_question(db, job_id, payload)
 
 @router.delete("/jobs/{job_id}")
 def admin_delete_job(
@@ -110,8 +132,7 @@ def admin_delete_job(
     job = db.query(models.Job).filter(models.Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    db.delete(job)
-    db.commit()
+    job_service.delete_job(db, job)
     return {"ok": True}
 
 # --------------------
@@ -119,10 +140,11 @@ def admin_delete_job(
 # --------------------
 @router.get("/interviews", response_model=List[schemas.AdminInterviewOut])
 def admin_list_interviews(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
-    return db.query(models.Interview).order_by(models.Interview.id.desc()).all()
+    interviews = db.query(models.Interview).order_by(models.Interview.id.desc()).all()
+    return adapter_response(_interview_list_adapter, interviews)
 
 @router.post("/interviews", response_model=schemas.AdminInterviewOut)
 def admin_create_interview(
@@ -162,29 +184,284 @@ def admin_create_interview(
     return interview
 
 
+def _bulk_invite(
+    db: Session,
+    background_tasks: BackgroundTasks,
+    job_id: int,
+    candidates: List[dict],
+    send_emails: bool,
+    skip_existing: bool,
+) -> dict:
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    try:
+        summary = invite_service.bulk_create_interviews(db, job, candidates, skip_existing=skip_existing)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    invites = invite_service.invites_to_send(summary)
+    if send_emails and invites:
+        background_tasks.add_task(send_candidate_invites_bulk, invites, job.title)
+    summary["emails_queued"] = len(invites) if send_emails else 0
+    return summary
+
+
+@router.post("/interviews/bulk", response_model=schemas.BulkInviteOut)
+def admin_bulk_create_interviews(
+    payload: schemas.BulkInviteIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    return _bulk_invite(
+        db,
+        background_tasks,
+        payload.job_id,
+        [c.model_dump() for c in payload.candidates],
+        payload.send_emails,
+        payload.skip_existing,
+    )
+
+
+@router.post("/interviews/bulk/csv", response_model=schemas.BulkInviteOut)
+def admin_bulk_create_interviews_csv(
+    background_tasks: BackgroundTasks,
+    job_id: int = Form(...),
+    file: UploadFile = File(...),
+    send_emails: bool = Form(True),
+    skip_existing: bool = Form(True),
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    """CSV with a header row: email (or candidate_email) and optionally name (or candidate_name)."""
+    try:
+        candidates = invite_service.parse_csv(file.file.read())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _bulk_invite(db, background_tasks, job_id, candidates, send_emails, skip_existing)
+
+
 @router.get("/interviews/{interview_id}", response_model=schemas.AdminInterviewDetailOut)
 def admin_get_interview(
     interview_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
-    interview = db.query(models.Interview).filter(models.Interview.id == interview_id).first()
+    interview = (
+        db.query(models.Interview)
+        .options(selectinload(models.Interview.answers))
+        .filter(models.Interview.id == interview_id)
+        .first()
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    return interview
+    return model_response(schemas.AdminInterviewDetailOut.model_validate(interview))
 
 
 @router.get("/interviews/{interview_id}/proctoring", response_model=List[schemas.ProctorEventOut])
 def admin_get_proctoring_events(
     interview_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _admin: models.User = Depends(require_admin),
 ):
     # Return newest first
-    return (
+    events = (
         db.query(models.InterviewProctorEvent)
         .filter(models.InterviewProctorEvent.interview_id == interview_id)
         .order_by(desc(models.InterviewProctorEvent.created_at))
         .limit(500)
         .all()
     )
+    return adapter_response(_proctor_event_list_adapter, events)
+
+
+@router.get(
+    "/interviews/{interview_id}/proctoring/timeline",
+    response_model=List[schemas.ProctorTimelineBucketOut],
+)
+def admin_get_proctoring_timeline(
+    interview_id: int,
+    db: Session = Depends(get_read_db),
+    _admin: models.User = Depends(require_admin),
+):
+    return proctoring_service.get_timeline(db, interview_id)
+
+
+@router.get("/proctoring/cohort", response_class=ORJSONResponse)
+def admin_proctoring_cohort(
+    job_id: Optional[int] = None,
+    top_n: int = 20,
+    version: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    _admin: models.User = Depends(require_admin),
+):
+    # Imported here: pulls in NumPy, which /health-only workers never need
+    from app.services.integrity_analytics_service import compute_cohort_integrity
+
+    try:
+        return compute_cohort_integrity(db, job_id=job_id, top_n=max(1, min(top_n, 500)), version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/proctoring/reevaluate", response_model=schemas.ProctorReevaluateOut)
+def admin_reevaluate_proctoring(
+    payload: schemas.ProctorReevaluateIn,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    try:
+        return proctoring_service.reevaluate_interviews(db, version=payload.version, job_id=payload.job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/proctoring/retention", response_model=schemas.ProctorRetentionOut)
+def admin_run_proctoring_retention(
+    older_than_days: Optional[int] = None,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    days = settings.PROCTOR_RETENTION_DAYS if older_than_days is None else older_than_days
+    return proctoring_service.downsample_completed_interviews(db, older_than_days=days)
+
+
+# --------------------
+# Re-scoring
+# --------------------
+def _rescore_job_out(job: models.RescoreJob) -> schemas.RescoreJobOut:
+    out = schemas.RescoreJobOut.model_validate(job)
+    return out.model_copy(update=rescoring_service.progress(job))
+
+@router.post("/rescore-jobs", response_model=schemas.RescoreJobOut)
+def admin_create_rescore_job(
+    payload: schemas.RescoreJobCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    if payload.job_id is not None:
+        job = db.query(models.Job).filter(models.Job.id == payload.job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    rescore_job = models.RescoreJob(
+        job_id=payload.job_id,
+        # Rescoring shares the batch LLM slots; more workers than that would just queue
+        concurrency=min(payload.concurrency, max(1, settings.LLM_BATCH_MAX_CONCURRENCY)),
+        batch_size=payload.batch_size,
+        status="PENDING",
+    )
+    db.add(rescore_job)
+    db.commit()
+    db.refresh(rescore_job)
+
+    background_tasks.add_task(rescoring_service.run_rescore_job, rescore_job.id)
+    return _rescore_job_out(rescore_job)
+
+@router.get("/rescore-jobs/{rescore_job_id}", response_model=schemas.RescoreJobOut)
+def admin_get_rescore_job(
+    rescore_job_id: int,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    rescore_job = db.query(models.RescoreJob).filter(models.RescoreJob.id == rescore_job_id).first()
+    if not rescore_job:
+        raise HTTPException(status_code=404, detail="Rescore job not found")
+    return _rescore_job_out(rescore_job)
+
+@router.post("/rescore-jobs/{rescore_job_id}/resume", response_model=schemas.RescoreJobOut)
+def admin_resume_rescore_job(
+    rescore_job_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    rescore_job = db.query(models.RescoreJob).filter(models.RescoreJob.id == rescore_job_id).first()
+    if not rescore_job:
+        raise HTTPException(status_code=404, detail="Rescore job not found")
+    if rescore_job.status == "COMPLETED":
+        raise HTTPException(status_code=400, detail="Rescore job already completed")
+
+    # A RUNNING job that checkpointed recently is still alive; only resume stale ones
+    last_seen = rescore_job.updated_at or rescore_job.started_at
+    if last_seen is not None and last_seen.tzinfo is None:
+        last_seen = last_seen.replace(tzinfo=timezone.utc)
+    if (
+        rescore_job.status == "RUNNING"
+        and last_seen is not None
+        and datetime.now(timezone.utc) - last_seen < timedelta(minutes=5)
+    ):
+        raise HTTPException(status_code=409, detail="Rescore job is still running")
+
+    background_tasks.add_task(rescoring_service.run_rescore_job, rescore_job.id)
+    return _rescore_job_out(rescore_job)
+
+
+# --------------------
+# Search
+# --------------------
+@router.get("/search", response_model=schemas.SearchResultsOut)
+def admin_search(
+    q: str,
+    scope: str = "answers",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    _admin: models.User = Depends(require_admin),
+):
+    """scope: answers | interviews | leads. Pass next_cursor back as cursor for the next page."""
+    try:
+        results = search_service.search(db, q, scope=scope, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(schemas.SearchResultsOut.model_validate(results))
+
+
+# --------------------
+# Follow-up bank
+# --------------------
+@router.post("/followup-bank/generate", response_model=schemas.FollowupBankGenerateOut)
+def admin_generate_followup_bank(
+    payload: schemas.FollowupBankGenerateIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _admin: models.User = Depends(require_admin),
+):
+    if payload.job_id is not None:
+        job = db.query(models.Job).filter(models.Job.id == payload.job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    background_tasks.add_task(
+        followup_bank_service.run_bank_generation,
+        job_id=payload.job_id,
+        overwrite=payload.overwrite,
+    )
+    return {"queued": True, "job_id": payload.job_id, "overwrite": payload.overwrite}
+
+
+@router.get("/questions/{question_id}/followup-bank", response_model=List[schemas.FollowupTemplateOut])
+def admin_get_followup_bank(
+    question_id: int,
+    db: Session = Depends(get_read_db),
+    _admin: models.User = Depends(require_admin),
+):
+    return (
+        db.query(models.FollowupTemplate)
+        .filter(models.FollowupTemplate.question_id == question_id)
+        .order_by(models.FollowupTemplate.category.asc(), models.FollowupTemplate.id.asc())
+        .all()
+    )
+
+
+# --------------------
+# LLM
+# --------------------
+@router.get("/llm/metrics", response_class=ORJSONResponse)
+def admin_llm_metrics(
+    _admin: models.User = Depends(require_admin),
+):
+    return llm_service.get_metrics()
@@ -1,16 +1,17 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_
 
-from ..database import get_db
+from ..database import get_read_db
 from ..deps import get_current_user
 from .. import models, schemas
+from ..utils.responses import model_response
 
 router = APIRouter(prefix="/candidate", tags=["candidate"])
 
 @router.get("/interviews", response_model=schemas.CandidateInterviewListOut)
 def get_my_interviews(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     interviews = (
@@ -21,6 +22,7 @@ def get_my_interviews(
                 models.Interview.candidate_email == current_user.email,
             )
         )
+        .options(selectinload(models.Interview.job))
         .order_by(models.Interview.id.desc())
         .all()
     )
@@ -42,12 +44,12 @@ def get_my_interviews(
             )
         )
 
-    return {"interviews": out}
+    return model_response(schemas.CandidateInterviewListOut(interviews=out))
 
 
 @router.get("/dashboard", response_model=schemas.CandidateDashboardOut)
 def candidate_dashboard(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     qs = db.query(models.Interview).filter(
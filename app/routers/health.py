@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
+from ..utils.responses import ORJSONResponse
+
 router = APIRouter(tags=["health"])
 
-@router.get("/health")
+@router.get("/health", response_class=ORJSONResponse)
 def health_check():
     return {"status": "ok"}
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
 import uuid
 from datetime import datetime, timezone
 
 from ..database import get_db
 from .. import models, schemas
 from ..services import interview_service
-from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
 from ..services import proctoring_service
+from ..services import idempotency_service
+from ..utils.profiling import span
+from ..utils.responses import ORJSONResponse, model_response
+from ..utils.concurrency import KeyedLock, SingleFlight
 
 router = APIRouter(prefix="/interviews", tags=["interviews"])
 
@@ -33,73 +39,83 @@ def create_interview(interview_in: schemas.InterviewCreate, db: Session = Depend
 
 @router.post("/start/{invite_token}", response_model=schemas.InterviewStartResponse)
 def start_interview(invite_token: str, db: Session = Depends(get_db)):
-    interview = db.query(models.Interview).filter(models.Interview.invite_token == invite_token).first()
+    interview = interview_service.load_interview_by_token(db, invite_token)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
 
-    if interview.started_at is None:
-        interview.started_at = datetime.now(timezone.utc)
+    result = interview_service.start_interview(db, interview)
 
-    next_q = interview_service.start_interview(db, interview)
-
-    next_question_out = None
-    if next_q:
-        next_question_out = schemas.InterviewQuestionOut(
-            question_id=next_q.id,
-            question_text=next_q.text,
-            competency=next_q.competency,
-            is_followup=False,
-            followup_round=0,
+    return model_response(
+        schemas.InterviewStartResponse(
+            interview_id=result["interview_id"],
+            status=result["status"],
+            next_question=_question_out(result["next_question"]),
         )
-
-    return schemas.InterviewStartResponse(
-        interview_id=interview.id,
-        status=interview.status,
-        next_question=next_question_out,
     )
 
 
+# One in-flight submit per (interview, answer); a concurrent duplicate waits for it
+_answer_flights = SingleFlight()
+# Different answers for the same interview are processed one at a time in this worker
+_interview_locks = KeyedLock()
+
+
 @router.post("/{interview_id}/answer", response_model=schemas.AnswerScoringOut)
-def submit_answer(interview_id: int, payload: schemas.AnswerSubmit, db: Session = Depends(get_db)):
-    interview = db.query(models.Interview).filter(models.Interview.id == interview_id).first()
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+def submit_answer(
+    interview_id: int,
+    payload: schemas.AnswerSubmit,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    try:
+        key = idempotency_service.extract_key(idempotency_key, payload.answer_meta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Retried submission: replay the original response, no LLM or DB writes.
+    # Checked before the status checks so a retry of the final answer still succeeds.
+    if key:
+        stored = idempotency_service.get_stored_response(db, interview_id, key)
+        if stored is not None:
+            return ORJSONResponse(stored, headers={"Idempotent-Replayed": "true"})
+
+    flight_key = (interview_id, key or hashlib.sha256(payload.answer_text.encode("utf-8")).hexdigest())
+    out, shared = _answer_flights.do(
+        flight_key,
+        lambda: _process_answer(db, interview_id, payload, key),
+    )
 
-    if interview.status == models.InterviewStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Interview already completed")
+    # Already validated: serialize once instead of re-validating against response_model
+    response = model_response(out)
+    if shared:
+        response.headers["Idempotent-Replayed"] = "true"
+    return response
 
-    result = interview_service.submit_answer_and_get_next(
-        db=db,
-        interview_id=interview.id,
-        answer_text=payload.answer_text,
-        answer_meta=payload.answer_meta,
+
+def _question_out(next_q: Optional[dict]) -> Optional[schemas.InterviewQuestionOut]:
+    # service returns plain dicts: FOLLOWUP or SPINE
+    if not next_q:
+        return None
+    if next_q.get("type") == "FOLLOWUP":
+        return schemas.InterviewQuestionOut(
+            question_id=None,
+            question_text=next_q["text"],
+            competency=None,
+            is_followup=True,
+            followup_round=int(next_q.get("round") or 1),
+        )
+    return schemas.InterviewQuestionOut(
+        question_id=next_q["id"],
+        question_text=next_q["text"],
+        competency=next_q.get("competency"),
+        is_followup=False,
+        followup_round=0,
     )
 
 
+def _build_answer_out(result: dict) -> schemas.AnswerScoringOut:
     scoring = result.get("scoring") or {}
-    next_q = result.get("next_question")
-    status = result["interview_status"]
-
-    next_question_out = None
-    if next_q:
-        # service returns either dict for followups OR JobQuestion model
-        if isinstance(next_q, dict) and next_q.get("type") == "FOLLOWUP":
-            next_question_out = schemas.InterviewQuestionOut(
-                question_id=None,
-                question_text=next_q["text"],
-                competency=None,
-                is_followup=True,
-                followup_round=int(next_q.get("round") or 1),
-            )
-        else:
-            # JobQuestion model
-            next_question_out = schemas.InterviewQuestionOut(
-                question_id=next_q.id,
-                question_text=next_q.text,
-                competency=getattr(next_q, "competency", None),
-                is_followup=False,
-                followup_round=0,
-            )
+    next_question_out = _question_out(result.get("next_question"))
 
     return schemas.AnswerScoringOut(
         asked_question_text=result.get("asked_question_text") or "",
@@ -109,49 +125,89 @@ def submit_answer(interview_id: int, payload: schemas.AnswerSubmit, db: Session
         competency_scores=scoring.get("competency_scores"),
         ai_feedback=scoring.get("feedback"),
         next_question=next_question_out,
-        interview_status=status,
+        interview_status=result["interview_status"],
     )
 
 
+def _process_answer(
+    db: Session,
+    interview_id: int,
+    payload: schemas.AnswerSubmit,
+    key: Optional[str],
+) -> schemas.AnswerScoringOut:
+    with _interview_locks.hold(interview_id):
+        # The previous holder may have just stored this key
+        if key:
+            stored = idempotency_service.get_stored_response(db, interview_id, key)
+            if stored is not None:
+                return schemas.AnswerScoringOut.model_validate(stored)
+
+        built = {}
+
+        def _before_commit(result: dict) -> None:
+            # Runs inside the service transaction: the stored idempotent
+            # response commits atomically with the answer and state change.
+            with span("serialize.AnswerScoringOut"):
+                built["out"] = _build_answer_out(result)
+            if key:
+                idempotency_service.add_response(db, interview_id, key, built["out"].model_dump(mode="json"))
+
+        with span("service.submit_answer_and_get_next", interview_id=interview_id):
+            try:
+                interview_service.submit_answer_and_get_next(
+                    db=db,
+                    interview_id=interview_id,
+                    answer_text=payload.answer_text,
+                    answer_meta=payload.answer_meta,
+                    before_commit=_before_commit,
+                )
+            except interview_service.InterviewNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except interview_service.InterviewCompletedError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except interview_service.InterviewStateChangedError as e:
+                # The client should reload the current question and answer that one
+                raise HTTPException(status_code=409, detail=str(e))
+            except IntegrityError:
+                # Another worker committed the same idempotency key first; its transaction won
+                db.rollback()
+                stored = idempotency_service.get_stored_response(db, interview_id, key) if key else None
+                if stored is None:
+                    raise
+                return schemas.AnswerScoringOut.model_validate(stored)
+
+        return built["out"]
+
+
 @router.post("/{interview_id}/proctoring/event", response_model=dict)
 def add_proctor_event(
     interview_id: int,
     payload: schemas.ProctorEventIn,
     db: Session = Depends(get_db),
 ):
-    interview = db.query(models.Interview).filter(models.Interview.id == interview_id).first()
-    if not interview:
+    if db.query(models.Interview.id).filter(models.Interview.id == interview_id).first() is None:
         raise HTTPException(status_code=404, detail="Interview not found")
 
     # Save event
     ev = models.InterviewProctorEvent(
         interview_id=interview_id,
+        created_at=datetime.now(timezone.utc),
         event_type=payload.event_type.upper().strip(),
         severity=int(payload.severity or 1),
         payload=payload.payload or {},
     )
     db.add(ev)
-    db.commit()
-
-    # Recompute integrity from latest N events (cheap + reliable)
-    recent = (
-        db.query(models.InterviewProctorEvent)
-        .filter(models.InterviewProctorEvent.interview_id == interview_id)
-        .order_by(desc(models.InterviewProctorEvent.created_at))
-        .limit(200)
-        .all()
-    )
-
-    computed = proctoring_service.compute_integrity(
-        [{"event_type": r.event_type} for r in recent]
-    )
+    db.flush()
 
-    interview.integrity_score = computed["score"]
-    interview.integrity_flags = computed["flags"]
-    interview.proctoring_version = computed["flags"].get("version", "v1")
+    # Incremental update of the integrity score without locking the interview
+    # row; event and score commit together
+    computed = proctoring_service.record_event(db, interview_id, ev)
+    if computed is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Interview not found")
     db.commit()
 
-    return {"ok": True, "integrity_score": interview.integrity_score}
+    return {"ok": True, "integrity_score": computed["score"]}
 
 
     # Follow-up next question
@@ -1,12 +1,15 @@
 # app/routers/jobs.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, selectinload
 from typing import List
+from pydantic import TypeAdapter
 
 from app.utils.auth import admin_api_key
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app import models, schemas
+from app.services import job_service
+from app.utils.responses import adapter_response, etag_matches, etag_response
 
 router = APIRouter(
     prefix="/jobs",
@@ -14,54 +17,40 @@ router = APIRouter(
     dependencies=[Depends(admin_api_key)]  # Secures all routes under /jobs
 )
 
+_job_list_adapter = TypeAdapter(List[schemas.JobOut])
+
 
 # -----------------------------
 # CREATE JOB
 # -----------------------------
 @router.post("/", response_model=schemas.JobOut)
 def create_job(job_in: schemas.JobCreate, db: Session = Depends(get_db)):
-    job = models.Job(
-        title=job_in.title,
-        description=job_in.description,
-        competencies=job_in.competencies or [],
-    )
-
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-
-    # Add questions
-    for q in job_in.questions:
-        jq = models.JobQuestion(
-            job_id=job.id,
-            text=q.text,
-            competency=q.competency,
-            order_index=q.order_index,
-        )
-        db.add(jq)
-
-    db.commit()
-    db.refresh(job)
-
-    return job
+    return job_service.create_job(db, job_in)
 
 
 # -----------------------------
 # LIST JOBS
 # -----------------------------
 @router.get("/", response_model=List[schemas.JobOut])
-def list_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(models.Job).all()
-    return jobs
+def list_jobs(db: Session = Depends(get_read_db)):
+    jobs = db.query(models.Job).options(selectinload(models.Job.questions)).all()
+    return adapter_response(_job_list_adapter, jobs)
 
 
 # -----------------------------
 # GET JOB
 # -----------------------------
 @router.get("/{job_id}", response_model=schemas.JobOut)
-def get_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(models.Job).get(job_id)
-    if not job:
+def get_job(job_id: int, request: Request, db: Session = Depends(get_read_db)):
+    revision = job_service.get_revision(db, job_id)
+    if revision is None:
         raise HTTPException(status_code=404, detail="Job not found")
+    etag = job_service.job_etag(job_id, revision)
+    if etag_matches(request, etag):
+        return etag_response(etag, job_service.cache_control())
 
-    return job
+    loaded = job_service.job_json(db, job_id, revision)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    revision, body = loaded
+    return etag_response(job_service.job_etag(job_id, revision), job_service.cache_control(), body)
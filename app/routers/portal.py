@@ -5,10 +5,11 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..deps import get_current_user
 from ..models import User
+from ..utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="/portal", tags=["portal"])
 
-@router.get("/dashboard")
+@router.get("/dashboard", response_class=ORJSONResponse)
 def dashboard(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -24,6 +24,16 @@ class JobCreate(BaseModel):
     questions: Optional[List[JobQuestionCreate]] = None
 
 
+class JobImportIn(BaseModel):
+    jobs: List[JobCreate]
+
+
+class JobImportOut(BaseModel):
+    jobs_created: int
+    questions_created: int
+    job_ids: List[int]
+
+
 class JobQuestionOut(BaseModel):
     id: int
     text: str
@@ -290,3 +300,122 @@ class CandidateDashboardOut(BaseModel):
     pending: int
     in_progress: int
     completed: int
+
+
+# ---------- Re-scoring ----------
+class RescoreJobCreate(BaseModel):
+    job_id: Optional[int] = None          # None = every answer
+    concurrency: int = Field(default=4, ge=1, le=32)
+    batch_size: int = Field(default=100, ge=1, le=1000)
+
+class RescoreJobOut(BaseModel):
+    id: int
+    job_id: Optional[int] = None
+    status: str
+    concurrency: int
+    batch_size: int
+    last_answer_id: int
+    total: Optional[int] = None
+    processed: int
+    failed: int
+    elapsed_seconds: float
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    percent: Optional[float] = None
+    answers_per_second: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ---------- Proctoring timeline ----------
+class ProctorTimelineBucketOut(BaseModel):
+    bucket_start: datetime
+    event_type: str
+    count: int
+    max_severity: int
+
+class ProctorRetentionOut(BaseModel):
+    interviews: int
+    events_removed: int
+    buckets_created: int
+
+
+class ProctorReevaluateIn(BaseModel):
+    version: str
+    job_id: Optional[int] = None
+
+
+class ProctorReevaluateOut(BaseModel):
+    version: str
+    interviews: int
+    changed: int
+
+
+# ---------- Follow-up bank ----------
+class FollowupBankGenerateIn(BaseModel):
+    job_id: Optional[int] = None          # None = every question without a bank
+    overwrite: bool = False
+
+class FollowupBankGenerateOut(BaseModel):
+    queued: bool
+    job_id: Optional[int] = None
+    overwrite: bool
+
+class FollowupTemplateOut(BaseModel):
+    id: int
+    question_id: int
+    category: str
+    text: str
+    source: str
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ---------- Search ----------
+class SearchHitOut(BaseModel):
+    kind: str                             # answers, interviews, leads
+    id: int
+    interview_id: Optional[int] = None
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    snippet: str                          # HTML-escaped, matches wrapped in <mark>
+    rank: float
+
+class SearchResultsOut(BaseModel):
+    items: List[SearchHitOut]
+    next_cursor: Optional[str] = None
+
+
+# ---------- Bulk invites ----------
+class BulkInviteCandidate(BaseModel):
+    candidate_name: Optional[str] = None
+    candidate_email: str                  # validated per row so one bad address doesn't reject the batch
+
+class BulkInviteIn(BaseModel):
+    job_id: int
+    candidates: List[BulkInviteCandidate]
+    send_emails: bool = True
+    skip_existing: bool = True            # skip candidates with an open interview for this job
+
+class BulkInviteRowOut(BaseModel):
+    row: int
+    candidate_email: str
+    candidate_name: Optional[str] = None
+    status: str                           # created, duplicate, exists, error
+    interview_id: Optional[int] = None
+    invite_token: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkInviteOut(BaseModel):
+    created: int
+    skipped: int
+    failed: int
+    emails_queued: int
+    results: List[BulkInviteRowOut]
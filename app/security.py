@@ -1,12 +1,17 @@
 # app/security.py
 import os
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
-from jose import jwt
-from passlib.context import CryptContext
+# passlib/bcrypt and jose are imported on first use to keep app import (cold start) fast.
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 JWT_SECRET = os.getenv("JWT_SECRET", "")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
@@ -19,10 +24,10 @@ if not JWT_SECRET:
     pass
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return get_pwd_context().verify(password, password_hash)
 
 def create_access_token(subject: str, extra: Optional[Dict[str, Any]] = None) -> str:
     now = datetime.now(timezone.utc)
@@ -36,7 +41,11 @@ def create_access_token(subject: str, extra: Optional[Dict[str, Any]] = None) ->
     if extra:
         payload.update(extra)
 
+    from jose import jwt
+
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def decode_token(token: str) -> Dict[str, Any]:
+    from jose import jwt
+
     return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
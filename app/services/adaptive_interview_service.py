@@ -1,41 +1,99 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 import re
 
 from sqlalchemy.orm import Session
 
 from .. import models
 
+# Compiled once at import and reused by analyze_answer
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+IMPACT_KEYWORDS = ("result", "impact", "improved", "reduced", "increased", "optimized")
+# One alternation scans the text once for all keywords (substring match, like `k in text`)
+_IMPACT_RE = re.compile("|".join(re.escape(k) for k in IMPACT_KEYWORDS))
+_OWNERSHIP_WORDS = frozenset(("i", "my"))
+
+MIN_CHARS = 60
+MIN_WORDS = 15
+
+
+class AnswerFeatures(NamedTuple):
+    chars: int          # length after strip()
+    words: int
+    has_number: bool
+    has_ownership: bool  # "I" / "my" as standalone words
+    has_impact: bool     # any IMPACT_KEYWORDS substring
+
+    @property
+    def too_short(self) -> bool:
+        return self.chars < MIN_CHARS or self.words < MIN_WORDS
+
+    @property
+    def heuristic_score(self) -> int:
+        if self.chars < 40:
+            return 1
+        score = 2
+        if self.words >= 30:
+            score += 1
+        if self.has_number:
+            score += 1
+        if self.has_impact:
+            score += 1
+        return max(1, min(5, score))
+
+
+def analyze_answer(text: Optional[str]) -> AnswerFeatures:
+    """Strip, lowercase and tokenize the answer once and derive every heuristic feature from that."""
+    a = (text or "").strip()
+    lowered = a.lower()
+    tokens = lowered.split()
+    return AnswerFeatures(
+        chars=len(a),
+        words=len(tokens),
+        has_number=_NUMBER_RE.search(a) is not None,
+        has_ownership=not _OWNERSHIP_WORDS.isdisjoint(tokens),
+        has_impact=_IMPACT_RE.search(lowered) is not None,
+    )
 
-def _has_number(text: str) -> bool:
-    return bool(re.search(r"\b\d+(\.\d+)?\b", text))
-
-
-def _is_too_short(text: str) -> bool:
-    t = text.strip()
-    return len(t) < 60 or len(t.split()) < 15
 
+# Deficiency categories, in the order decide_followup probes them
+DETAIL = "DETAIL"
+OWNERSHIP = "OWNERSHIP"
+IMPACT = "IMPACT"
+REFLECTION = "REFLECTION"
+DEFICIENCY_CATEGORIES = (DETAIL, OWNERSHIP, IMPACT, REFLECTION)
 
-def _missing_ownership(text: str) -> bool:
-    lowered = text.lower()
-    return (" i " not in f" {lowered} ") and (" my " not in f" {lowered} ")
+FOLLOWUP_TEMPLATES = {
+    DETAIL: "Can you add more detail? Walk me through what you did step-by-step and what the outcome was.",
+    OWNERSHIP: "What was your specific role in this? What did you personally do vs what the team did?",
+    IMPACT: "What was the measurable impact? For example: time saved, errors reduced, performance improved, or cost impact.",
+    REFLECTION: "That makes sense — what would you do differently next time, and why?",
+}
 
+DEFICIENCY_FEEDBACK = {
+    DETAIL: "Answer is too brief; needs more detail.",
+    OWNERSHIP: "Ownership is unclear.",
+    IMPACT: "Missing measurable impact.",
+    REFLECTION: "Needs deeper clarity/reflection.",
+}
 
-def _score_answer(answer: str) -> int:
-    a = answer.strip()
-    if len(a) < 40:
-        return 1
 
-    score = 2
-    if len(a.split()) >= 30:
-        score += 1
-    if _has_number(a):
-        score += 1
-    if any(k in a.lower() for k in ["result", "impact", "improved", "reduced", "increased", "optimized"]):
-        score += 1
-    return max(1, min(5, score))
+def classify_deficiency(f: AnswerFeatures) -> Tuple[str, float]:
+    """
+    Main thing an answer is missing, with a rough confidence (0-1) that a
+    generic probe for it is as good as a tailored one. REFLECTION is the
+    catch-all, so it gets low confidence.
+    """
+    if f.too_short:
+        return DETAIL, (0.95 if f.words < MIN_WORDS // 2 else 0.8)
+    if not f.has_ownership:
+        return OWNERSHIP, (0.85 if f.words >= 30 else 0.75)
+    if not f.has_number:
+        # Impact words without figures are a weaker signal than no impact at all
+        return IMPACT, (0.65 if f.has_impact else 0.8)
+    return REFLECTION, 0.4
 
 
 def decide_followup(
@@ -44,12 +102,15 @@ def decide_followup(
     answer_text: str,
     followup_round: int,
     max_followups: int,
+    features: Optional[AnswerFeatures] = None,
 ) -> Dict[str, Any]:
     """
     Deterministic MVP decision engine.
     Later you replace this body with an LLM call returning same keys.
+    Pass features if the caller already ran analyze_answer() on this text.
     """
-    score = _score_answer(answer_text)
+    f = features or analyze_answer(answer_text)
+    score = f.heuristic_score
 
     comp_scores: Dict[str, int] = {}
     if competency:
@@ -66,39 +127,13 @@ def decide_followup(
         }
 
     # Follow-up probes
-    if _is_too_short(answer_text):
-        return {
-            "needs_followup": True,
-            "followup_question": "Can you add more detail? Walk me through what you did step-by-step and what the outcome was.",
-            "score": score,
-            "competency_scores": comp_scores,
-            "feedback": "Answer is too brief; needs more detail.",
-        }
-
-    if _missing_ownership(answer_text):
-        return {
-            "needs_followup": True,
-            "followup_question": "What was your specific role in this? What did you personally do vs what the team did?",
-            "score": score,
-            "competency_scores": comp_scores,
-            "feedback": "Ownership is unclear.",
-        }
-
-    if not _has_number(answer_text):
-        return {
-            "needs_followup": True,
-            "followup_question": "What was the measurable impact? For example: time saved, errors reduced, performance improved, or cost impact.",
-            "score": score,
-            "competency_scores": comp_scores,
-            "feedback": "Missing measurable impact.",
-        }
-
+    category, _ = classify_deficiency(f)
     return {
         "needs_followup": True,
-        "followup_question": "That makes sense — what would you do differently next time, and why?",
+        "followup_question": FOLLOWUP_TEMPLATES[category],
         "score": score,
         "competency_scores": comp_scores,
-        "feedback": "Needs deeper clarity/reflection.",
+        "feedback": DEFICIENCY_FEEDBACK[category],
     }
 
 
@@ -0,0 +1,168 @@
+"""
+Deterministic anti-cheat signals from answer_meta (no LLM call).
+
+The frontend may send, per answer:
+
+  answer_meta = {
+    "keystrokes": [t_ms, ...],                 # keydown times, or [{"t": t_ms}, ...]
+    "pastes": [{"t": t_ms, "length": n}, ...], # or just lengths
+    "typing_ms": 53000,                        # optional totals when streams are not sent
+    "pasted_chars": 120,
+  }
+
+analyze_answer_meta() turns that into timing features with NumPy and a 0-100
+ai_suspect_score plus reasons. Everything is computed from arrays, so a
+keystroke log of 100k events costs roughly 15ms.
+"""
+from typing import Any, Dict, List, Optional
+
+SIGNALS_VERSION = "s1"
+
+# Inter-key gaps below this are faster than human typing (auto-typers, scripted input)
+BURST_INTERVAL_MS = 25.0
+# A run of this many inhumanly fast keys counts as a burst
+BURST_MIN_RUN = 15
+# Gaps above this are pauses (reading, switching windows), not typing rhythm
+PAUSE_INTERVAL_MS = 2000.0
+# Human typing rhythm varies a lot; very even gaps look scripted
+ROBOTIC_CV = 0.15
+MIN_KEYS_FOR_RHYTHM = 30
+# Cap per stream, so one oversized payload can't stall a submit
+MAX_EVENTS = 200_000
+
+SIGNAL_KEYS = ("keystrokes", "pastes", "typing_ms", "pasted_chars")
+
+
+def _times(stream: Any, field: str):
+    import numpy as np
+
+    if not isinstance(stream, list) or not stream:
+        return np.zeros(0, dtype=np.float64)
+    stream = stream[:MAX_EVENTS]
+    if isinstance(stream[0], dict):
+        stream = [e.get(field) for e in stream if isinstance(e, dict)]
+    try:
+        arr = np.asarray(stream, dtype=np.float64)  # C fast path for well-formed numeric lists
+    except (TypeError, ValueError):
+        arr = np.asarray([v for v in stream if isinstance(v, (int, float))], dtype=np.float64)
+    if arr.ndim != 1:
+        return np.zeros(0, dtype=np.float64)
+    return arr[np.isfinite(arr)]
+
+
+def _longest_run(mask) -> int:
+    import numpy as np
+
+    if not mask.size:
+        return 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return int((edges[1::2] - edges[::2]).max()) if edges.size else 0
+
+
+def extract_features(answer_text: str, answer_meta: Dict[str, Any]) -> Dict[str, Any]:
+    import numpy as np
+
+    text_len = len(answer_text or "")
+    keys = np.sort(_times(answer_meta.get("keystrokes"), "t"))
+    paste_lengths = _times(answer_meta.get("pastes"), "length")
+
+    features: Dict[str, Any] = {
+        "text_chars": text_len,
+        "keystrokes": int(keys.size),
+        "paste_count": int(paste_lengths.size),
+        "pasted_chars": int(paste_lengths.sum()) if paste_lengths.size else 0,
+    }
+
+    # Totals-only clients
+    if not paste_lengths.size and isinstance(answer_meta.get("pasted_chars"), (int, float)):
+        features["pasted_chars"] = int(answer_meta["pasted_chars"])
+        features["paste_count"] = int(answer_meta.get("paste_count") or (1 if features["pasted_chars"] else 0))
+
+    features["paste_ratio"] = round(min(1.0, features["pasted_chars"] / text_len), 3) if text_len else 0.0
+    features["typed_ratio"] = round(min(1.0, keys.size / text_len), 3) if text_len else 0.0
+
+    if keys.size >= 2:
+        gaps = np.diff(keys)
+        typing = gaps[gaps < PAUSE_INTERVAL_MS]
+        active_ms = float(typing.sum())
+        features["duration_ms"] = round(float(keys[-1] - keys[0]), 1)
+        features["pauses"] = int(gaps.size - typing.size)
+        features["longest_burst"] = _longest_run(gaps < BURST_INTERVAL_MS)
+        if typing.size:
+            mean = float(typing.mean())
+            features["gap_mean_ms"] = round(mean, 1)
+            features["gap_median_ms"] = round(float(np.median(typing)), 1)
+            features["gap_p10_ms"] = round(float(np.percentile(typing, 10)), 1)
+            features["gap_cv"] = round(float(typing.std() / mean), 3) if mean > 0 else 0.0
+            features["keys_per_minute"] = round(typing.size * 60000.0 / active_ms, 1) if active_ms > 0 else None
+    elif isinstance(answer_meta.get("typing_ms"), (int, float)):
+        features["duration_ms"] = float(answer_meta["typing_ms"])
+
+    return features
+
+
+def score_features(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Rule-based 0-100 score; each fired rule adds its weight and a reason."""
+    reasons: List[Dict[str, Any]] = []
+
+    def fire(code: str, weight: int, detail: str) -> None:
+        reasons.append({"code": code, "weight": weight, "detail": detail})
+
+    paste_ratio = features["paste_ratio"]
+    if paste_ratio >= 0.8:
+        fire("MOSTLY_PASTED", 45, f"{int(paste_ratio * 100)}% of the answer was pasted")
+    elif paste_ratio >= 0.4:
+        fire("PARTLY_PASTED", 25, f"{int(paste_ratio * 100)}% of the answer was pasted")
+
+    # Only meaningful if the client sends keystrokes at all
+    if features["keystrokes"] and features["text_chars"] >= 80 and features["typed_ratio"] < 0.3 and paste_ratio < 0.4:
+        fire("UNTYPED_TEXT", 25, f"only {features['keystrokes']} keys for {features['text_chars']} characters")
+
+    if features.get("longest_burst", 0) >= BURST_MIN_RUN:
+        fire("INHUMAN_BURST", 30, f"{features['longest_burst']} keys under {int(BURST_INTERVAL_MS)}ms apart")
+
+    cv = features.get("gap_cv")
+    if cv is not None and features["keystrokes"] >= MIN_KEYS_FOR_RHYTHM and cv < ROBOTIC_CV:
+        fire("ROBOTIC_RHYTHM", 20, f"inter-key gap variation {cv}")
+
+    kpm = features.get("keys_per_minute")
+    if kpm and kpm > 900:
+        fire("TYPING_TOO_FAST", 15, f"{int(kpm)} keys per minute")
+
+    score = min(100, sum(r["weight"] for r in reasons))
+    return {"score": score, "reasons": reasons}
+
+
+def analyze_answer_meta(answer_text: str, answer_meta: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"score": int, "reasons": {...}} for InterviewAnswer.ai_suspect_score /
+    ai_suspect_reasons, or None when there is no usable metadata.
+    """
+    if not isinstance(answer_meta, dict) or not any(k in answer_meta for k in SIGNAL_KEYS):
+        return None
+    try:
+        features = extract_features(answer_text, answer_meta)
+    except (TypeError, ValueError) as e:
+        print(f"answer_meta signal extraction failed: {e}")
+        return None
+
+    scored = score_features(features)
+    return {
+        "score": scored["score"],
+        "reasons": {"version": SIGNALS_VERSION, "signals": scored["reasons"], "features": features},
+    }
+
+
+def add_signal(
+    signals: Optional[Dict[str, Any]],
+    code: str,
+    weight: int,
+    detail: str,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """Add a signal found outside answer_meta (e.g. near-duplicate text) and re-total the score."""
+    if signals is None:
+        signals = {"score": 0, "reasons": {"version": SIGNALS_VERSION, "signals": [], "features": {}}}
+    signals["reasons"]["signals"].append({"code": code, "weight": weight, "detail": detail, **extra})
+    signals["score"] = min(100, sum(r["weight"] for r in signals["reasons"]["signals"]))
+    return signals
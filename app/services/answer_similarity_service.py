@@ -0,0 +1,221 @@
+"""
+Near-duplicate answer detection per spine question.
+
+Answers are embedded as signed hashed character 5-gram vectors (NumPy only,
+no model download) and kept in a per-question in-memory index: a unit-norm
+float32 matrix searched with one matrix-vector product. At the sizes a single
+question reaches (hundreds to low thousands of answers) an exact flat scan is
+sub-millisecond, so no approximate structure is needed.
+
+Indexes are built lazily from the database on first use, appended to as this
+worker scores answers, and rebuilt after SIMILARITY_INDEX_TTL_SECONDS so
+answers scored by other workers show up too. Re-scoring drops the indexes of
+the questions it touched (invalidate), so reused scores are never stale in
+the worker that ran it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+NGRAM = 5
+_PRIME = 1_099_511_628_211  # FNV-1a 64-bit prime
+_MIX = 0xBF58476D1CE4E5B9   # splitmix64 multiplier
+
+
+def embed(text: str):
+    """Unit-norm float32 vector of size SIMILARITY_DIM; zeros for very short text."""
+    import numpy as np
+
+    dim = settings.SIMILARITY_DIM
+    normalized = " ".join((text or "").lower().split())
+    b = np.frombuffer(normalized.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if b.size < NGRAM:
+        return np.zeros(dim, dtype=np.float32)
+
+    # Rolling polynomial hash of every byte 5-gram, computed column-wise (uint64 wraps)
+    n = b.size - NGRAM + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for k in range(NGRAM):
+        h = h * np.uint64(_PRIME) + b[k:k + n]
+    h ^= h >> np.uint64(31)
+    h *= np.uint64(_MIX)
+    h ^= h >> np.uint64(29)
+
+    idx = (h % np.uint64(dim)).astype(np.int64)
+    sign = np.where((h >> np.uint64(63)) == 0, 1.0, -1.0)  # signed hashing cancels collision bias
+    v = np.bincount(idx, weights=sign, minlength=dim)
+    norm = np.linalg.norm(v)
+    return (v / norm).astype(np.float32) if norm else v.astype(np.float32)
+
+
+class QuestionIndex:
+    """
+    Ring of up to `capacity` (vector, scored answer) pairs for one question.
+    The matrix starts at `initial` rows and doubles as answers arrive, so a
+    question with few answers doesn't hold capacity x dim floats.
+    """
+
+    def __init__(self, capacity: int, dim: int, initial: int = 16):
+        import numpy as np
+
+        self.capacity = capacity
+        rows = max(1, min(initial, capacity))
+        self.vectors = np.zeros((rows, dim), dtype=np.float32)
+        self.interview_ids = np.zeros(rows, dtype=np.int64)  # per row, to mask a candidate's own answers
+        self.entries: List[Dict[str, Any]] = []
+        self.size = 0
+        self.next = 0  # oldest slot, overwritten once the ring is full
+        self.built_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, vec, entry: Dict[str, Any]) -> None:
+        import numpy as np
+
+        with self.lock:
+            if self.size < self.capacity:
+                if self.size == len(self.vectors):
+                    rows = min(self.capacity, 2 * self.size)
+                    grown = np.zeros((rows, self.vectors.shape[1]), dtype=np.float32)
+                    grown[: self.size] = self.vectors
+                    self.vectors = grown
+                    self.interview_ids = np.resize(self.interview_ids, rows)
+                self.vectors[self.size] = vec
+                self.interview_ids[self.size] = entry["interview_id"]
+                self.entries.append(entry)
+                self.size += 1
+                return
+            self.vectors[self.next] = vec
+            self.interview_ids[self.next] = entry["interview_id"]
+            self.entries[self.next] = entry
+            self.next = (self.next + 1) % self.capacity
+
+    def best(self, vec, exclude_interview_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        import numpy as np
+
+        with self.lock:
+            if not self.size:
+                return None
+            sims = self.vectors[: self.size] @ vec
+            if exclude_interview_id is not None:
+                # Best match from another interview (a candidate repeating themselves is not a duplicate)
+                sims[self.interview_ids[: self.size] == exclude_interview_id] = -np.inf
+            i = int(np.argmax(sims))
+            if sims[i] == -np.inf:
+                return None
+            return {"similarity": float(sims[i]), **self.entries[i]}
+
+
+# question_id -> QuestionIndex, least recently used evicted first
+_indexes: "OrderedDict[int, QuestionIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _build(db: Session, question_id: int) -> QuestionIndex:
+    A = models.InterviewAnswer
+    capacity = max(1, settings.SIMILARITY_INDEX_CAPACITY)
+    rows = db.execute(
+        select(A.id, A.interview_id, A.answer_text, A.score, A.competency_scores, A.ai_feedback)
+        .where(
+            or_(A.question_id == question_id, A.parent_question_id == question_id),
+            A.score.isnot(None),
+        )
+        .order_by(A.id.desc())
+        .limit(capacity)
+    ).all()
+
+    index = QuestionIndex(capacity, settings.SIMILARITY_DIM, initial=len(rows))
+    for row in reversed(rows):  # oldest first, so the ring keeps the newest
+        if len(row.answer_text or "") < settings.SIMILARITY_MIN_CHARS:
+            continue
+        if settings.LLM_PREGATE_ENABLED and len(row.answer_text.split()) < settings.LLM_PREGATE_MAX_WORDS:
+            # May still hold a pre-gate heuristic score; only LLM scores are worth reusing
+            continue
+        index.add(embed(row.answer_text), _entry(row.id, row.interview_id, row))
+    return index
+
+
+def _entry(answer_id: int, interview_id: int, scored: Any) -> Dict[str, Any]:
+    if isinstance(scored, dict):
+        score, comps, feedback = scored.get("overall_score"), scored.get("competency_scores"), scored.get("feedback")
+    else:
+        score, comps, feedback = scored.score, scored.competency_scores, scored.ai_feedback
+    return {
+        "answer_id": answer_id,
+        "interview_id": interview_id,
+        "overall_score": score,
+        "competency_scores": comps,
+        "feedback": feedback,
+    }
+
+
+def get_index(db: Session, question_id: int) -> QuestionIndex:
+    with _indexes_lock:
+        index = _indexes.get(question_id)
+        if index is not None:
+            _indexes.move_to_end(question_id)
+    if index is not None and time.monotonic() - index.built_at < settings.SIMILARITY_INDEX_TTL_SECONDS:
+        return index
+
+    index = _build(db, question_id)
+    with _indexes_lock:
+        _indexes[question_id] = index
+        _indexes.move_to_end(question_id)
+        while len(_indexes) > max(1, settings.SIMILARITY_MAX_QUESTIONS):
+            _indexes.popitem(last=False)
+    return index
+
+
+def find_similar(
+    db: Session,
+    question_id: Optional[int],
+    answer_text: str,
+    interview_id: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"vector", "match"} where match is the most similar scored answer
+    from another interview ({"similarity", "answer_id", "interview_id",
+    "overall_score", ...}) or None. Returns None when disabled or the text is
+    too short to compare meaningfully.
+    """
+    if not settings.SIMILARITY_ENABLED or question_id is None:
+        return None
+    if len(answer_text or "") < settings.SIMILARITY_MIN_CHARS:
+        return None
+
+    vec = embed(answer_text)
+    match = get_index(db, question_id).best(vec, exclude_interview_id=interview_id)
+    return {"vector": vec, "match": match}
+
+
+def remember(
+    question_id: int,
+    answer_id: int,
+    interview_id: int,
+    vector,
+    scoring: Dict[str, Any],
+) -> None:
+    """
+    Add a freshly LLM-scored answer to this worker's index (no-op if the index
+    isn't loaded). Callers must not pass provisional or fallback scores.
+    """
+    with _indexes_lock:
+        index = _indexes.get(question_id)
+    if index is not None:
+        index.add(vector, _entry(answer_id, interview_id, scoring))
+
+
+def invalidate(question_ids: Optional[Iterable[int]] = None) -> None:
+    """Drop cached indexes (all, or for these base questions) after stored scores changed."""
+    with _indexes_lock:
+        if question_ids is None:
+            _indexes.clear()
+        else:
+            for qid in question_ids:
+                _indexes.pop(qid, None)
@@ -1,6 +1,8 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import threading
+from typing import Dict, List, Tuple
+
 from app.config import settings
+from app.utils.profiling import span
 
 
 class EmailService:
@@ -10,6 +12,8 @@ class EmailService:
         self.enabled = bool(self.api_key)
 
         if self.enabled:
+            from sendgrid import SendGridAPIClient
+
             self.client = SendGridAPIClient(self.api_key)
         else:
             self.client = None
@@ -20,6 +24,8 @@ class EmailService:
             print(f"[EMAIL DISABLED] To: {to_email} | Subject: {subject}")
             return
 
+        from sendgrid.helpers.mail import Mail
+
         message = Mail(
             from_email=self.from_email,
             to_emails=to_email,
@@ -28,9 +34,52 @@ class EmailService:
         )
 
         try:
-            self.client.send(message)
+            with span("email.send", subject=subject):
+                self.client.send(message)
         except Exception as e:
             print(f"Email send failed: {e}")
 
+    def send_batch(self, recipients: List[Tuple[str, Dict[str, str]]], subject: str, html_content: str):
+        """
+        One API call for many recipients. html_content may contain
+        substitution tags (e.g. "-invite_link-") filled per recipient from
+        its dict. Returns the number of recipients accepted by the call.
+        """
+        if not recipients:
+            return 0
+        if not self.enabled:
+            for to_email, _ in recipients:
+                print(f"[EMAIL DISABLED] To: {to_email} | Subject: {subject}")
+            return len(recipients)
+
+        from sendgrid.helpers.mail import Mail, Personalization, Substitution, To
+
+        message = Mail(from_email=self.from_email, subject=subject, html_content=html_content)
+        for to_email, substitutions in recipients:
+            p = Personalization()
+            p.add_to(To(to_email))
+            for key, value in substitutions.items():
+                p.add_substitution(Substitution(key, value))
+            message.add_personalization(p)
+
+        try:
+            with span("email.send_batch", subject=subject, recipients=len(recipients)):
+                self.client.send(message)
+            return len(recipients)
+        except Exception as e:
+            print(f"Email batch send failed ({len(recipients)} recipients): {e}")
+            return 0
+
+
+# Built on first send so importing the app doesn't pull in sendgrid
+_email_service = None
+_email_service_lock = threading.Lock()
+
 
-email_service = EmailService()
+def get_email_service() -> EmailService:
+    global _email_service
+    if _email_service is None:
+        with _email_service_lock:
+            if _email_service is None:
+                _email_service = EmailService()
+    return _email_service
@@ -0,0 +1,183 @@
+"""
+Pre-generated follow-up bank per spine question.
+
+An offline job (generate_bank) asks the LLM once per JobQuestion for
+follow-ups in each deficiency category and stores them as FollowupTemplate
+rows. At answer time pick_followup() classifies the answer with the
+deterministic analyzer and serves a stored follow-up from a process cache;
+it returns None (caller generates one live) when the classification is not
+confident enough or the question has no bank yet.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from .adaptive_interview_service import (
+    DEFICIENCY_CATEGORIES,
+    FOLLOWUP_TEMPLATES,
+    AnswerFeatures,
+    classify_deficiency,
+)
+from .llm_service import LLMUnavailableError, generate_followup_bank, record_metric
+
+# question_id -> (loaded_at, {category: [texts]}); empty dicts are cached too,
+# so questions without a bank don't cost a query per follow-up. Least
+# recently used evicted first.
+_cache: "OrderedDict[int, Tuple[float, Dict[str, List[str]]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def invalidate(question_ids: Optional[List[int]] = None) -> None:
+    with _cache_lock:
+        if question_ids is None:
+            _cache.clear()
+        else:
+            for qid in question_ids:
+                _cache.pop(qid, None)
+
+
+def get_bank(db: Session, question_id: int) -> Dict[str, List[str]]:
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(question_id)
+        if hit is not None and now - hit[0] < settings.FOLLOWUP_BANK_CACHE_SECONDS:
+            _cache.move_to_end(question_id)
+            return hit[1]
+
+    T = models.FollowupTemplate
+    bank: Dict[str, List[str]] = {}
+    for category, text in db.execute(
+        select(T.category, T.text).where(T.question_id == question_id).order_by(T.id.asc())
+    ):
+        bank.setdefault(category, []).append(text)
+
+    with _cache_lock:
+        _cache[question_id] = (now, bank)
+        _cache.move_to_end(question_id)
+        while len(_cache) > max(1, settings.FOLLOWUP_BANK_CACHE_SIZE):
+            _cache.popitem(last=False)
+    return bank
+
+
+def pick_followup(
+    db: Session,
+    question_id: Optional[int],
+    features: AnswerFeatures,
+    followup_round: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"followup_question", "category", "confidence"} from the bank,
+    or None when the caller should fall back to live generation.
+    """
+    if not settings.FOLLOWUP_BANK_ENABLED or question_id is None:
+        return None
+
+    category, confidence = classify_deficiency(features)
+    if confidence < settings.FOLLOWUP_BANK_MIN_CONFIDENCE:
+        record_metric("followup_bank_low_confidence")
+        return None
+
+    templates = get_bank(db, question_id).get(category)
+    if not templates:
+        record_metric("followup_bank_misses")
+        return None
+
+    record_metric("followup_bank_hits")
+    record_metric("llm_calls_saved")
+    # Rotate by round so consecutive follow-ups on the same question differ
+    return {
+        "followup_question": templates[followup_round % len(templates)],
+        "category": category,
+        "confidence": confidence,
+    }
+
+
+# ----------------------------
+# Offline generation
+# ----------------------------
+def _questions_query(job_id: Optional[int], overwrite: bool):
+    q = select(
+        models.JobQuestion.id,
+        models.JobQuestion.text,
+        models.Job.title,
+        models.Job.description,
+        models.Job.competencies,
+    ).join(models.Job, models.Job.id == models.JobQuestion.job_id)
+    if job_id is not None:
+        q = q.where(models.JobQuestion.job_id == job_id)
+    if not overwrite:
+        q = q.where(
+            ~select(models.FollowupTemplate.id)
+            .where(models.FollowupTemplate.question_id == models.JobQuestion.id)
+            .exists()
+        )
+    return q.order_by(models.JobQuestion.id.asc())
+
+
+def generate_bank(db: Session, job_id: Optional[int] = None, overwrite: bool = False) -> Dict[str, int]:
+    """
+    Fill the bank for every question (of one job, or all) that has none yet,
+    or for all of them with overwrite=True. One LLM call and one commit per
+    question, so a stopped run can simply be started again. Categories the
+    LLM left empty get the generic template (source=DEFAULT); questions the LLM
+    couldn't serve at all are skipped and picked up by the next run.
+    """
+    per_category = max(1, settings.FOLLOWUP_BANK_PER_CATEGORY)
+    totals = {"questions": 0, "templates": 0, "defaults": 0, "failed": 0}
+
+    for qid, text, title, description, competencies in db.execute(_questions_query(job_id, overwrite)).all():
+        try:
+            bank = generate_followup_bank(
+                text,
+                competencies or [],
+                per_category,
+                job_title=title or "",
+                job_description=description or "",
+            )
+        except (LLMUnavailableError, ValueError) as e:
+            print(f"Follow-up bank generation failed for question {qid}: {e}")
+            totals["failed"] += 1
+            continue
+
+        rows = [
+            {"question_id": qid, "category": category, "text": t, "source": "LLM"}
+            for category in DEFICIENCY_CATEGORIES
+            for t in bank.get(category, [])
+        ]
+        covered = {r["category"] for r in rows}
+        for category in DEFICIENCY_CATEGORIES:
+            if category not in covered:
+                rows.append(
+                    {"question_id": qid, "category": category, "text": FOLLOWUP_TEMPLATES[category], "source": "DEFAULT"}
+                )
+                totals["defaults"] += 1
+
+        db.execute(delete(models.FollowupTemplate).where(models.FollowupTemplate.question_id == qid))
+        db.execute(insert(models.FollowupTemplate), rows)
+        db.commit()
+        invalidate([qid])
+
+        totals["questions"] += 1
+        totals["templates"] += len(rows)
+
+    return totals
+
+
+def run_bank_generation(job_id: Optional[int] = None, overwrite: bool = False) -> None:
+    """Background-task entry point with its own session."""
+    db = SessionLocal()
+    try:
+        totals = generate_bank(db, job_id=job_id, overwrite=overwrite)
+        print(f"Follow-up bank generation finished: {totals}")
+    except Exception as e:
+        db.rollback()
+        print(f"Follow-up bank generation failed: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,38 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import models
+
+MAX_KEY_LENGTH = 255
+
+# Clients that can't set headers may send the key inside answer_meta instead
+META_KEY = "client_answer_id"
+
+
+def extract_key(header_value: Optional[str], answer_meta: Optional[Dict[str, Any]]) -> Optional[str]:
+    key = (header_value or "").strip()
+    if not key and answer_meta:
+        key = str(answer_meta.get(META_KEY) or "").strip()
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f"Idempotency key too long (max {MAX_KEY_LENGTH} characters)")
+    return key
+
+
+def get_stored_response(db: Session, interview_id: int, key: str) -> Optional[Dict[str, Any]]:
+    row = (
+        db.query(models.AnswerIdempotencyKey.response)
+        .filter(
+            models.AnswerIdempotencyKey.interview_id == interview_id,
+            models.AnswerIdempotencyKey.key == key,
+        )
+        .first()
+    )
+    return row.response if row else None
+
+
+def add_response(db: Session, interview_id: int, key: str, response: Dict[str, Any]) -> None:
+    """Stage the stored response in the caller's transaction (no commit)."""
+    db.add(models.AnswerIdempotencyKey(interview_id=interview_id, key=key, response=response))
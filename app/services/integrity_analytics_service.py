@@ -0,0 +1,167 @@
+"""
+Cohort-level integrity analytics for recruiter dashboards.
+
+compute_integrity() in proctoring_service scores one interview in a Python
+loop. Here a whole cohort is loaded in one query into columnar arrays
+(event types already mapped to codes in SQL) and scored with NumPy, using the weight table and escalations of a compiled
+rule set. Time-window rules need per-event timestamps and are not applied
+here; "window_rules_ignored" is true when the rule set has any, i.e. when
+these scores can differ from the ones stored on the interviews.
+
+NumPy is imported inside the functions so it doesn't add to app cold start.
+"""
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import case, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from .. import models
+from .proctoring_rules import CompiledRuleSet, get_ruleset
+from .proctoring_service import active_version
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def score_event_arrays(
+    interview_idx,
+    type_idx,
+    weights_n,
+    n_interviews: int,
+    ruleset: CompiledRuleSet,
+) -> Dict[str, Any]:
+    """
+    interview_idx: int array, row -> interview position (0..n_interviews-1)
+    type_idx:      int array, row -> position in ruleset.event_types (len(event_types) = unknown type)
+    weights_n:     int array, number of events the row stands for (1 for raw events, count for buckets)
+
+    Returns {"counts": (n_interviews, n_types+1), "penalty": (n,), "score": (n,)}.
+    """
+    import numpy as np
+
+    event_types = ruleset.event_types
+    n_types = len(event_types) + 1  # last column collects unknown types
+    flat = interview_idx.astype(np.int64) * n_types + type_idx.astype(np.int64)
+    counts = np.bincount(flat, weights=weights_n, minlength=n_interviews * n_types)
+    counts = counts.reshape(n_interviews, n_types)
+
+    weight_vec = np.array([ruleset.weights[t] for t in event_types] + [0], dtype=np.float64)
+    penalty = counts @ weight_vec
+
+    for et, from_count, per_event in ruleset.escalations:
+        if et in event_types:
+            n = counts[:, event_types.index(et)]
+            penalty += np.where(n >= from_count, (n - (from_count - 1)) * per_event, 0)
+
+    score = np.clip(100 - penalty, 0, 100)
+    return {"counts": counts, "penalty": penalty, "score": score}
+
+
+def _load_cohort(
+    db: Session,
+    job_id: Optional[int],
+    interview_ids: Optional[Sequence[int]],
+    event_types: Sequence[str],
+):
+    """
+    (cohort ids, event rows) as NumPy arrays, filled straight from the cursor.
+    Event rows carry (interview_id, type code, n); type codes are computed in
+    SQL (position in event_types, len(event_types) for unknown types).
+    """
+    import numpy as np
+
+    Event = models.InterviewProctorEvent
+    Bucket = models.InterviewProctorBucket
+
+    cohort_q = select(models.Interview.id)
+    if job_id is not None:
+        cohort_q = cohort_q.where(models.Interview.job_id == job_id)
+    if interview_ids is not None:
+        cohort_q = cohort_q.where(models.Interview.id.in_(list(interview_ids)))
+
+    ids = np.fromiter(db.execute(cohort_q.order_by(models.Interview.id.asc())).scalars(), dtype=np.int64)
+
+    def type_code(column):
+        return case(
+            {t: i for i, t in enumerate(event_types)},
+            value=func.upper(func.trim(column)),
+            else_=len(event_types),
+        )
+
+    # Raw events and downsampled buckets in one round trip
+    events_q = select(Event.interview_id, type_code(Event.event_type), literal(1).label("n")).where(
+        Event.interview_id.in_(cohort_q)
+    )
+    buckets_q = select(Bucket.interview_id, type_code(Bucket.event_type), Bucket.count.label("n")).where(
+        Bucket.interview_id.in_(cohort_q)
+    )
+    # Structured dtypes need plain tuples; Row only behaves like one
+    rows = np.fromiter(
+        (tuple(r) for r in db.execute(union_all(events_q, buckets_q)).tuples()),
+        dtype=[("interview_id", np.int64), ("type", np.int64), ("n", np.float64)],
+    )
+    return ids, rows
+
+
+def compute_cohort_integrity(
+    db: Session,
+    job_id: Optional[int] = None,
+    interview_ids: Optional[Sequence[int]] = None,
+    top_n: int = 20,
+    version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Score every interview in the cohort and return summary stats plus the
+    top_n outliers (lowest scores, with robust z-scores of the penalty).
+    """
+    import numpy as np
+
+    ruleset = get_ruleset(version or active_version())
+    event_types = ruleset.event_types
+    window_rules_ignored = bool(ruleset.windows_by_type)
+
+    ids, rows = _load_cohort(db, job_id, interview_ids, event_types)
+    if not len(ids):
+        return {
+            "version": ruleset.version,
+            "window_rules_ignored": window_rules_ignored,
+            "interviews": 0,
+            "events": 0,
+            "percentiles": {},
+            "outliers": [],
+        }
+
+    n_arr = rows["n"]
+    result = score_event_arrays(np.searchsorted(ids, rows["interview_id"]), rows["type"], n_arr, len(ids), ruleset)
+    counts, penalty, score = result["counts"], result["penalty"], result["score"]
+
+    # Robust z-score (median / MAD) so a few extreme cheaters don't mask each other
+    median = float(np.median(penalty))
+    mad = float(np.median(np.abs(penalty - median))) or 1.0
+    z = 0.6745 * (penalty - median) / mad
+
+    k = min(top_n, len(ids))
+    order = np.lexsort((-penalty, score))[:k]  # lowest score first, ties by higher penalty
+
+    outliers = []
+    for i in order:
+        outliers.append(
+            {
+                "interview_id": int(ids[i]),
+                "score": int(score[i]),
+                "penalty": int(penalty[i]),
+                "z_score": round(float(z[i]), 2),
+                "counts": {
+                    t: int(counts[i, j]) for j, t in enumerate(event_types) if counts[i, j]
+                },
+            }
+        )
+
+    return {
+        "version": ruleset.version,
+        "window_rules_ignored": window_rules_ignored,
+        "interviews": int(len(ids)),
+        "events": int(n_arr.sum()),
+        "mean_score": round(float(score.mean()), 2),
+        "percentiles": {str(p): float(v) for p, v in zip(PERCENTILES, np.percentile(score, PERCENTILES))},
+        "outliers": outliers,
+    }
@@ -1,12 +1,35 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, joinedload
+from typing import Callable, Optional, List, Dict, Any
 from datetime import datetime, timezone
 
 from .. import models
-from .llm_service import score_answer, summarise_interview, generate_followup_question
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.profiling import span
+from .adaptive_interview_service import AnswerFeatures, analyze_answer, decide_followup
+from .answer_signals_service import add_signal, analyze_answer_meta
+from . import answer_similarity_service, followup_bank_service
+from .llm_service import record_metric, score_answer, summarise_interview, generate_followup_question
 from .notification_service import notify_admin_interview_completed
 
 
+class InterviewNotFoundError(ValueError):
+    pass
+
+
+class InterviewCompletedError(ValueError):
+    pass
+
+
+class InterviewStateChangedError(ValueError):
+    """A concurrent request advanced the interview while this answer was being scored."""
+
+
 def get_next_question(job: models.Job, current_index: int) -> Optional[models.JobQuestion]:
     ordered = sorted(job.questions, key=lambda q: (q.order_index, q.id))
     if current_index >= len(ordered):
@@ -15,8 +38,7 @@ def get_next_question(job: models.Job, current_index: int) -> Optional[models.Jo
 
 
 def _too_short(answer_text: str) -> bool:
-    a = (answer_text or "").strip()
-    return (len(a) < 60) or (len(a.split()) < 15)
+    return analyze_answer(answer_text).too_short
 
 
 def _should_followup(
@@ -44,22 +66,242 @@ def _should_followup(
     return False
 
 
-def start_interview(db: Session, interview: models.Interview) -> Optional[models.JobQuestion]:
-    if interview.status == models.InterviewStatus.NOT_STARTED:
-        interview.status = models.InterviewStatus.IN_PROGRESS
-        interview.current_question_index = 0
-        interview.started_at = interview.started_at or datetime.now(timezone.utc)
+DEFAULT_FOLLOWUP = "Can you clarify that further with a specific example and the outcome?"
+
+
+# ----------------------------
+# Heuristic pre-gate
+# ----------------------------
+def _pregated(features: AnswerFeatures) -> bool:
+    """
+    Too-short answers get a follow-up whatever the LLM would score them, and
+    once the follow-up cap is reached they move on regardless (see
+    _should_followup), so the LLM does not change the next step.
+    """
+    return (
+        settings.LLM_PREGATE_ENABLED
+        and features.too_short
+        and features.words < settings.LLM_PREGATE_MAX_WORDS
+    )
+
+
+def _provisional_scoring(
+    features: AnswerFeatures,
+    answer_text: str,
+    competencies: List[str],
+    followup_round: int,
+    max_followups: int,
+) -> Dict[str, Any]:
+    decision = decide_followup(
+        competency=None,
+        answer_text=answer_text,
+        followup_round=followup_round,
+        max_followups=max_followups,
+        features=features,
+    )
+    score = decision["score"]
+    return {
+        "overall_score": score,
+        "competency_scores": {c: score for c in competencies},
+        "feedback": decision["feedback"],
+        "followup_question": decision["followup_question"],
+        "provisional": True,
+    }
+
 
-        first_q = get_next_question(interview.job, interview.current_question_index)
-        interview.active_question_id = first_q.id if first_q else None
-        interview.followup_round = 0
-        interview.followup_question_text = None
+_scoring_pool: Optional[ThreadPoolExecutor] = None
+_scoring_pool_lock = threading.Lock()
 
-        db.add(interview)
+
+def _get_scoring_pool() -> ThreadPoolExecutor:
+    global _scoring_pool
+    if _scoring_pool is None:
+        with _scoring_pool_lock:
+            if _scoring_pool is None:
+                _scoring_pool = ThreadPoolExecutor(
+                    max_workers=max(1, settings.DEFERRED_SCORING_WORKERS),
+                    thread_name_prefix="deferred-scoring",
+                )
+    return _scoring_pool
+
+
+def _score_deferred(
+    answer_id: int,
+    base_question: str,
+    answer_text: str,
+    competencies: List[str],
+    job_title: str,
+    job_description: str,
+) -> None:
+    """Replace a provisional score with the LLM score. Runs in the pool with its own session."""
+    try:
+        scoring = score_answer(
+            base_question,
+            answer_text,
+            competencies,
+            job_title=job_title,
+            job_description=job_description,
+            lane="batch",
+        )
+    except Exception as e:
+        print(f"Deferred scoring failed for answer {answer_id}: {e}")
+        return
+    if scoring.get("fallback"):
+        # LLM unavailable: keep the provisional score (a rescore job can pick it up later)
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(models.InterviewAnswer)
+            .where(models.InterviewAnswer.id == answer_id)
+            .values(
+                score=scoring.get("overall_score"),
+                competency_scores=scoring.get("competency_scores"),
+                ai_feedback=scoring.get("feedback"),
+            )
+        )
         db.commit()
-        db.refresh(interview)
+    except Exception as e:
+        db.rollback()
+        print(f"Deferred scoring update failed for answer {answer_id}: {e}")
+    finally:
+        db.close()
+
+
+# ----------------------------
+# Invite links
+# ----------------------------
+# invite_token -> (interview id or None for unknown tokens, expires_at); tokens never change
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def resolve_invite_token(db: Session, invite_token: str) -> Optional[int]:
+    now = time.monotonic()
+    with _token_cache_lock:
+        hit = _token_cache.get(invite_token)
+        if hit is not None and hit[1] > now:
+            _token_cache.move_to_end(invite_token)
+            return hit[0]
+
+    interview_id = db.execute(
+        select(models.Interview.id).where(models.Interview.invite_token == invite_token)
+    ).scalar_one_or_none()
+
+    ttl = settings.INVITE_TOKEN_CACHE_SECONDS if interview_id is not None else settings.INVITE_TOKEN_NEGATIVE_CACHE_SECONDS
+    with _token_cache_lock:
+        _token_cache[invite_token] = (interview_id, now + ttl)
+        _token_cache.move_to_end(invite_token)
+        while len(_token_cache) > max(1, settings.INVITE_TOKEN_CACHE_SIZE):
+            _token_cache.popitem(last=False)
+    return interview_id
+
+
+def forget_invite_token(invite_token: str) -> None:
+    with _token_cache_lock:
+        _token_cache.pop(invite_token, None)
+
+
+def load_interview_by_token(db: Session, invite_token: str) -> Optional[models.Interview]:
+    """Interview with its job and questions in one query, or None for an unknown token."""
+    interview_id = resolve_invite_token(db, invite_token)
+    if interview_id is None:
+        return None
+
+    interview = (
+        db.query(models.Interview)
+        .options(
+            joinedload(models.Interview.job, innerjoin=True).joinedload(models.Job.questions)
+        )
+        .filter(models.Interview.id == interview_id)
+        .first()
+    )
+    if interview is None:
+        # Deleted since it was cached
+        forget_invite_token(invite_token)
+    return interview
+
+
+def current_question(interview: models.Interview) -> Optional[Dict[str, Any]]:
+    """The question the candidate should see now: a pending follow-up or the current spine question."""
+    if interview.status == models.InterviewStatus.COMPLETED:
+        return None
+    if interview.followup_question_text:
+        return {"type": "FOLLOWUP", "text": interview.followup_question_text, "round": interview.followup_round}
+    q = get_next_question(interview.job, interview.current_question_index)
+    return _question_payload(q) if q else None
+
+
+def start_interview(db: Session, interview: models.Interview) -> Dict[str, Any]:
+    """
+    Start a NOT_STARTED interview. Returns {"interview_id", "status",
+    "next_question"} as plain data. Interviews already in progress (link
+    clicked again, page reloaded) are reported as they are, without writing.
+    """
+    result = {"interview_id": interview.id, "status": interview.status}
+    if interview.status != models.InterviewStatus.NOT_STARTED:
+        result["next_question"] = current_question(interview)
+        return result
+
+    first_q = get_next_question(interview.job, 0)
+    interview.status = models.InterviewStatus.IN_PROGRESS
+    interview.current_question_index = 0
+    interview.started_at = interview.started_at or datetime.now(timezone.utc)
+    interview.active_question_id = first_q.id if first_q else None
+    interview.followup_round = 0
+    interview.followup_question_text = None
+
+    result["status"] = models.InterviewStatus.IN_PROGRESS
+    result["next_question"] = _question_payload(first_q) if first_q else None
+    db.commit()
+    return result
+
+
+def _question_payload(q: models.JobQuestion) -> Dict[str, Any]:
+    # Plain data, so callers can read it after commit without a refresh SELECT
+    return {"type": "SPINE", "id": q.id, "text": q.text, "competency": q.competency}
+
 
-    return get_next_question(interview.job, interview.current_question_index)
+def _release_connection(db: Session) -> None:
+    # Reads are done: end the transaction so no connection or row lock is held while the LLM runs
+    if db.in_transaction():
+        db.rollback()
+
+
+def _lock_progress(db: Session, interview_id: int, expected: tuple) -> None:
+    """
+    SELECT ... FOR UPDATE of the interview's progress columns. Raises if another
+    request moved the interview on since `expected` was read; the lock is held
+    until the caller commits.
+    """
+    row = db.execute(
+        select(
+            models.Interview.status,
+            models.Interview.current_question_index,
+            models.Interview.followup_round,
+            models.Interview.followup_question_text,
+        )
+        .where(models.Interview.id == interview_id)
+        .with_for_update()
+    ).one_or_none()
+    if row is None:
+        db.rollback()
+        raise InterviewNotFoundError("Interview not found")
+    if tuple(row) != expected:
+        db.rollback()
+        if row.status == models.InterviewStatus.COMPLETED:
+            raise InterviewCompletedError("Interview already completed")
+        raise InterviewStateChangedError("Interview moved on while this answer was being scored")
+
+
+def _update_interview(db: Session, interview_id: int, values: Dict[str, Any]) -> None:
+    db.execute(
+        update(models.Interview)
+        .where(models.Interview.id == interview_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
 
 
 def submit_answer_and_get_next(
@@ -67,154 +309,271 @@ def submit_answer_and_get_next(
     interview_id: int,
     answer_text: str,
     answer_meta: dict | None = None,
+    before_commit: Optional[Callable[[Dict[str, Any]], None]] = None,
 ):
-
-    interview = db.query(models.Interview).filter(models.Interview.id == interview_id).first()
+    """
+    Score an answer and advance the interview.
+
+    1. Unlocked load (interview + job + questions). The read transaction is
+       ended before any LLM call, so no connection or row lock is held while
+       scoring and follow-up generation run.
+    2. LLM calls (skipped for pre-gated answers, reused scores, banked follow-ups).
+    3. SELECT ... FOR UPDATE of the progress columns: if a concurrent request
+       moved the interview on meanwhile, InterviewStateChangedError. Otherwise
+       INSERT ... RETURNING for the answer, one interview UPDATE, one commit.
+
+    before_commit(result) lets the caller add its own rows (e.g. the stored
+    idempotent response) to the same transaction.
+    """
+    interview = (
+        db.query(models.Interview)
+        .options(
+            joinedload(models.Interview.job, innerjoin=True).joinedload(models.Job.questions)
+        )
+        .filter(models.Interview.id == interview_id)
+        .populate_existing()
+        .first()
+    )
     if not interview:
-        raise ValueError("Interview not found")
-
-    job = db.query(models.Job).filter(models.Job.id == interview.job_id).first()
-    if not job:
-        raise ValueError("Job not found for interview")
-    
-    prev_status = interview.status
-
-    # Mark as started if first interaction
-    if interview.status == models.InterviewStatus.NOT_STARTED:
-        interview.status = models.InterviewStatus.IN_PROGRESS
-        if not interview.started_at:
-            interview.started_at = datetime.now(timezone.utc)
-
+        raise InterviewNotFoundError("Interview not found")
+    if interview.status == models.InterviewStatus.COMPLETED:
+        raise InterviewCompletedError("Interview already completed")
+
+    # Plain snapshot: the ORM objects expire once the read transaction ends
+    state = (
+        interview.status,
+        interview.current_question_index,
+        interview.followup_round,
+        interview.followup_question_text,
+    )
+    job = interview.job
+    questions = [_question_payload(q) for q in sorted(job.questions, key=lambda q: (q.order_index, q.id))]
+    job_title = job.title or "Interview"
+    llm_job_title = job.title
+    job_description = job.description
     comp_list = job.competencies or []
+    candidate_email = interview.candidate_email
+    max_followups = interview.max_followups_per_question
+    index = interview.current_question_index
+    was_not_started = interview.status == models.InterviewStatus.NOT_STARTED
 
     # Are we answering a follow-up right now?
     is_followup = bool(interview.followup_question_text)
     current_followup_round = interview.followup_round if is_followup else 0
+    followup_question_text = interview.followup_question_text
 
-    spine_q = get_next_question(job, interview.current_question_index)
+    spine_q = questions[index] if index < len(questions) else None
+    now = datetime.now(timezone.utc)
 
     # If spine_q doesn't exist AND we aren't in follow-up mode => done
     if not spine_q and not is_followup:
-        interview.status = models.InterviewStatus.COMPLETED
-        interview.completed_at = interview.completed_at or datetime.now(timezone.utc)
-        db.add(interview)
-        db.commit()
-        db.refresh(interview)
-
-        # Send completion notification exactly once
-        if prev_status != models.InterviewStatus.COMPLETED:
-            notify_admin_interview_completed(
-                interview.candidate_email,
-                job.title or "Interview",
-            )
+        _lock_progress(db, interview_id, state)
+        _update_interview(
+            db,
+            interview_id,
+            {
+                "status": models.InterviewStatus.COMPLETED,
+                "completed_at": func.coalesce(models.Interview.completed_at, now),
+            },
+        )
 
-        return {
-            "answer": None,
+        result = {
+            "answer_id": None,
             "next_question": None,
-            "interview_status": interview.status,
+            "interview_status": models.InterviewStatus.COMPLETED,
             "scoring": None,
             "asked_question_text": "",
             "is_followup": False,
             "followup_round": 0,
         }
+        if before_commit:
+            before_commit(result)
+        db.commit()
 
+        # Send completion notification exactly once (the lock guarantees we did the transition)
+        notify_admin_interview_completed(candidate_email, job_title)
+        return result
+
+    base_question_text = spine_q["text"] if spine_q else ""
+    asked_question_text = followup_question_text if is_followup else base_question_text
+
+    features = analyze_answer(answer_text)
+    pregated = _pregated(features)
+    if pregated:
+        # Obviously insufficient answer: templated follow-up + heuristic score, no LLM wait
+        scoring = _provisional_scoring(
+            features,
+            answer_text,
+            comp_list,
+            current_followup_round,
+            max_followups,
+        )
 
-    base_question_text = spine_q.text if spine_q else ""
-    asked_question_text = interview.followup_question_text if is_followup else base_question_text
-
-    # Store the answer row
-    db_answer = models.InterviewAnswer(
-    interview_id=interview.id,
-    question_id=None if is_followup else (spine_q.id if spine_q else None),
-    question_text=asked_question_text,
-    is_followup=1 if is_followup else 0,
-    parent_question_id=(spine_q.id if (is_followup and spine_q) else None),
-    followup_round=current_followup_round,
-    answer_text=answer_text,
-    answer_meta=answer_meta or None,
-)
-
-
-    # If you added these columns in your DB/model, store them:
-    if hasattr(db_answer, "question_text"):
-        db_answer.question_text = asked_question_text
-    if hasattr(db_answer, "is_followup"):
-        db_answer.is_followup = 1 if is_followup else 0
-    if hasattr(db_answer, "parent_question_id"):
-        db_answer.parent_question_id = spine_q.id if (is_followup and spine_q) else None
-    if hasattr(db_answer, "followup_round"):
-        db_answer.followup_round = current_followup_round
-    if hasattr(db_answer, "answer_meta"):
-        db_answer.answer_meta = answer_meta or None
-
-    db.add(db_answer)
-    db.commit()
-    db.refresh(db_answer)
-
-    # Score against BASE question (even if user answered follow-up)
-    scoring = score_answer(base_question_text, answer_text, comp_list)
+    # Near-duplicate of an answer another candidate gave to the same base question?
+    similar = None
+    reused = False
+    if not pregated and spine_q:
+        with span("similarity.find", question_id=spine_q["id"]):
+            similar = answer_similarity_service.find_similar(db, spine_q["id"], answer_text, interview_id)
+    match = similar["match"] if similar else None
+
+    if not pregated:
+        if match and match["similarity"] >= settings.SIMILARITY_REUSE_THRESHOLD:
+            # Same answer, same question: reuse its score instead of asking the LLM again
+            reused = True
+            scoring = {
+                "overall_score": match["overall_score"],
+                "competency_scores": match["competency_scores"],
+                "feedback": match["feedback"],
+                "reused_from": match["answer_id"],
+            }
+        else:
+            _release_connection(db)
+            # Score against BASE question (even if user answered follow-up)
+            scoring = score_answer(
+                base_question_text,
+                answer_text,
+                comp_list,
+                job_title=llm_job_title,
+                job_description=job_description,
+            )
 
-    db_answer.score = scoring.get("overall_score")
-    db_answer.competency_scores = scoring.get("competency_scores")
-    db_answer.ai_feedback = scoring.get("feedback")
-    db.add(db_answer)
+    # Typing/paste signals from answer_meta: array math only, no LLM
+    with span("signals.answer_meta"):
+        signals = analyze_answer_meta(answer_text, answer_meta)
+    if match and match["similarity"] >= settings.SIMILARITY_FLAG_THRESHOLD:
+        signals = add_signal(
+            signals,
+            "NEAR_DUPLICATE",
+            40,
+            f"{int(match['similarity'] * 100)}% similar to an answer in interview {match['interview_id']}",
+            similar_answer_id=match["answer_id"],
+            similarity=round(match["similarity"], 3),
+        )
 
     # Decide: follow-up or move to next spine question
     needs_followup = _should_followup(
         scoring=scoring,
         answer_text=answer_text,
         followup_round=current_followup_round,
-        max_followups=interview.max_followups_per_question,
+        max_followups=max_followups,
     )
 
     next_q: Any = None
+    banked = None
+    values: Dict[str, Any] = {"status": models.InterviewStatus.IN_PROGRESS}
+    if was_not_started:
+        values["started_at"] = func.coalesce(models.Interview.started_at, now)
 
     if needs_followup:
-        followup_payload = generate_followup_question(
-            base_question=base_question_text,
-            answer=answer_text,
-            competencies=comp_list,
-            scoring=scoring,
-            followup_round=current_followup_round,
+        # Stored follow-up for this question when the gap is clear; live generation otherwise
+        banked = followup_bank_service.pick_followup(
+            db, spine_q["id"] if spine_q else None, features, current_followup_round
         )
-        followup_text = (followup_payload.get("followup_question") or "").strip()
+        if banked:
+            followup_text = banked["followup_question"]
+        elif pregated:
+            followup_text = (scoring.get("followup_question") or "").strip()
+        else:
+            _release_connection(db)
+            followup_payload = generate_followup_question(
+                base_question=base_question_text,
+                answer=answer_text,
+                competencies=comp_list,
+                scoring=scoring,
+                followup_round=current_followup_round,
+                job_title=llm_job_title,
+                job_description=job_description,
+            )
+            followup_text = (followup_payload.get("followup_question") or "").strip()
         if not followup_text:
-            followup_text = "Can you clarify that further with a specific example and the outcome?"
+            followup_text = DEFAULT_FOLLOWUP
 
-        interview.followup_round = current_followup_round + 1 if is_followup else 1
-        interview.followup_question_text = followup_text
-        next_q = {"type": "FOLLOWUP", "text": followup_text, "round": interview.followup_round}
+        next_round = current_followup_round + 1 if is_followup else 1
+        values.update(followup_round=next_round, followup_question_text=followup_text)
+        next_q = {"type": "FOLLOWUP", "text": followup_text, "round": next_round}
 
     else:
-        interview.followup_round = 0
-        interview.followup_question_text = None
-
-        interview.current_question_index += 1
-        next_spine = get_next_question(job, interview.current_question_index)
-        interview.active_question_id = next_spine.id if next_spine else None
+        next_spine = questions[index + 1] if index + 1 < len(questions) else None
+        values.update(
+            followup_round=0,
+            followup_question_text=None,
+            current_question_index=index + 1,
+            active_question_id=next_spine["id"] if next_spine else None,
+        )
         next_q = next_spine
 
         if next_spine is None:
-            interview.status = models.InterviewStatus.COMPLETED
-            interview.completed_at = interview.completed_at or datetime.now(timezone.utc)
-
-    db.add(interview)
-    db.commit()
-    db.refresh(interview)
-    if interview.status == models.InterviewStatus.COMPLETED and prev_status != models.InterviewStatus.COMPLETED:
-        notify_admin_interview_completed(
-            interview.candidate_email,
-            job.title or "Interview",
+            values["status"] = models.InterviewStatus.COMPLETED
+            values["completed_at"] = func.coalesce(models.Interview.completed_at, now)
+
+    # Write phase: lock, re-check nothing moved, then answer + interview in one commit
+    _lock_progress(db, interview_id, state)
+
+    # Store the answer row, already scored: one INSERT ... RETURNING instead of insert + refresh + update
+    answer_id = db.execute(
+        insert(models.InterviewAnswer)
+        .values(
+            interview_id=interview_id,
+            question_id=None if is_followup else (spine_q["id"] if spine_q else None),
+            question_text=asked_question_text,
+            is_followup=1 if is_followup else 0,
+            parent_question_id=(spine_q["id"] if (is_followup and spine_q) else None),
+            followup_round=current_followup_round,
+            answer_text=answer_text,
+            answer_meta=answer_meta or None,
+            score=scoring.get("overall_score"),
+            competency_scores=scoring.get("competency_scores"),
+            ai_feedback=scoring.get("feedback"),
+            ai_suspect_score=signals["score"] if signals else None,
+            ai_suspect_reasons=signals["reasons"] if signals else None,
         )
-    return {
-        "answer": db_answer,
+        .returning(models.InterviewAnswer.id)
+    ).scalar_one()
+    _update_interview(db, interview_id, values)
+
+    result = {
+        "answer_id": answer_id,
         "next_question": next_q,
-        "interview_status": interview.status,
+        "interview_status": values["status"],
         "scoring": scoring,
         "asked_question_text": asked_question_text,
         "is_followup": is_followup,
         "followup_round": current_followup_round,
     }
+    if before_commit:
+        before_commit(result)
+    db.commit()
+
+    if reused:
+        record_metric("similarity_reuse_hits")
+        record_metric("llm_calls_saved")
+    elif similar and spine_q and not pregated and not scoring.get("fallback"):
+        # Only LLM scores go into the index: pre-gate and fallback scores are heuristics
+        answer_similarity_service.remember(spine_q["id"], answer_id, interview_id, similar["vector"], scoring)
+
+    if pregated:
+        record_metric("pregate_hits")
+        # Template follow-ups (bank hits are counted by the bank)
+        if needs_followup and not banked:
+            record_metric("llm_calls_saved")
+        if settings.LLM_PREGATE_ASYNC_SCORING:
+            record_metric("llm_calls_deferred")
+            _get_scoring_pool().submit(
+                _score_deferred,
+                answer_id,
+                base_question_text,
+                answer_text,
+                comp_list,
+                llm_job_title,
+                job_description,
+            )
+        else:
+            record_metric("llm_calls_saved")
+
+    if result["interview_status"] == models.InterviewStatus.COMPLETED:
+        notify_admin_interview_completed(candidate_email, job_title)
+    return result
 
 
 def generate_interview_summary(db: Session, interview: models.Interview) -> Dict:
@@ -230,6 +589,8 @@ def generate_interview_summary(db: Session, interview: models.Interview) -> Dict
                 "competency_scores": ans.competency_scores or {},
                 "is_followup": bool(ans.is_followup),
                 "followup_round": ans.followup_round,
+                "question_id": ans.question_id,
+                "parent_question_id": ans.parent_question_id,
             }
         )
 
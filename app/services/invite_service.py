@@ -0,0 +1,161 @@
+"""
+Bulk interview invitations.
+
+bulk_create_interviews() validates rows, resolves existing candidate users
+with one IN query, skips candidates that already have an open interview for
+the job, and inserts the rest with one multi-row INSERT ... RETURNING. Emails
+are sent afterwards in batches (notification_service.send_candidate_invites_bulk).
+"""
+import csv
+import io
+import secrets
+from typing import Any, Dict, List, Tuple
+
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+_email_adapter = TypeAdapter(EmailStr)
+
+OPEN_STATUSES = (models.InterviewStatus.NOT_STARTED, models.InterviewStatus.IN_PROGRESS)
+NAME_HEADERS = ("candidate_name", "name", "full_name")
+EMAIL_HEADERS = ("candidate_email", "email")
+
+
+def parse_csv(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Rows from a CSV with a header line. Accepts candidate_name/name/full_name
+    and candidate_email/email columns (case-insensitive).
+    """
+    try:
+        decoded = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("CSV must be UTF-8 encoded")
+
+    reader = csv.DictReader(io.StringIO(decoded))
+    headers = {(h or "").strip().lower(): h for h in (reader.fieldnames or [])}
+    name_key = next((headers[h] for h in NAME_HEADERS if h in headers), None)
+    email_key = next((headers[h] for h in EMAIL_HEADERS if h in headers), None)
+    if email_key is None:
+        raise ValueError("CSV needs an 'email' (or 'candidate_email') column")
+
+    rows = []
+    for record in reader:
+        rows.append(
+            {
+                "candidate_name": (record.get(name_key) or "").strip() if name_key else "",
+                "candidate_email": (record.get(email_key) or "").strip(),
+            }
+        )
+        if len(rows) > settings.BULK_INVITE_MAX_ROWS:
+            break
+    return rows
+
+
+def bulk_create_interviews(
+    db: Session,
+    job: models.Job,
+    candidates: List[Dict[str, Any]],
+    skip_existing: bool = True,
+) -> Dict[str, Any]:
+    """
+    Returns {"created", "skipped", "failed", "results": [...]} with one result
+    per input row, in input order: status is "created", "duplicate" (repeated
+    in this request), "exists" (open interview for this job already) or "error".
+    """
+    if len(candidates) > settings.BULK_INVITE_MAX_ROWS:
+        raise ValueError(f"Too many rows (max {settings.BULK_INVITE_MAX_ROWS})")
+
+    results: List[Dict[str, Any]] = []
+    valid: Dict[str, int] = {}  # email -> index into results
+
+    for i, row in enumerate(candidates):
+        raw_email = str(row.get("candidate_email") or "").strip()
+        name = str(row.get("candidate_name") or "").strip()
+        result: Dict[str, Any] = {"row": i, "candidate_email": raw_email, "status": "error"}
+        results.append(result)
+
+        try:
+            email = str(_email_adapter.validate_python(raw_email)).lower()
+        except ValidationError:
+            result["error"] = "Invalid email"
+            continue
+        result["candidate_email"] = email
+
+        if email in valid:
+            result["status"] = "duplicate"
+            result["error"] = f"Same email as row {valid[email]}"
+            continue
+
+        result["candidate_name"] = name or email.split("@")[0]
+        valid[email] = i
+
+    emails = list(valid)
+    if skip_existing and emails:
+        existing = db.execute(
+            select(models.Interview.candidate_email, models.Interview.id).where(
+                models.Interview.job_id == job.id,
+                models.Interview.candidate_email.in_(emails),
+                models.Interview.status.in_(OPEN_STATUSES),
+            )
+        ).all()
+        for email, interview_id in existing:
+            if email in valid:
+                result = results[valid.pop(email)]
+                result["status"] = "exists"
+                result["interview_id"] = interview_id
+
+    rows = []
+    if valid:
+        # Link invites to existing accounts, one query for the whole batch
+        user_ids = dict(
+            db.execute(
+                select(models.User.email, models.User.id).where(models.User.email.in_(list(valid)))
+            ).all()
+        )
+        for email, i in valid.items():
+            rows.append(
+                {
+                    "job_id": job.id,
+                    "candidate_name": results[i]["candidate_name"],
+                    "candidate_email": email,
+                    "candidate_user_id": user_ids.get(email),
+                    "invite_token": secrets.token_urlsafe(32),
+                    "status": models.InterviewStatus.NOT_STARTED,
+                    "current_question_index": 0,
+                }
+            )
+
+        inserted = db.execute(
+            insert(models.Interview).returning(
+                models.Interview.id,
+                models.Interview.candidate_email,
+                sort_by_parameter_order=True,
+            ),
+            rows,
+        ).all()
+        db.commit()
+
+        for row, (interview_id, email) in zip(rows, inserted):
+            result = results[valid[email]]
+            result["status"] = "created"
+            result["interview_id"] = interview_id
+            result["invite_token"] = row["invite_token"]
+
+    created = sum(1 for r in results if r["status"] == "created")
+    failed = sum(1 for r in results if r["status"] == "error")
+    return {
+        "created": created,
+        "skipped": len(results) - created - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
+def invites_to_send(summary: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(email, token) pairs for the rows created by bulk_create_interviews."""
+    return [(r["candidate_email"], r["invite_token"]) for r in summary["results"] if r["status"] == "created"]
+
@@ -0,0 +1,301 @@
+"""
+Job and question creation, single and bulk.
+
+Jobs and their questions are written in one transaction: questions go in
+with one executemany INSERT instead of an ORM add per row, and a bulk import
+inserts all jobs with one INSERT ... RETURNING to get their ids back in
+input order. Imports can be JSON, YAML or CSV; imported questions without
+an order_index are numbered by position and must not repeat an index.
+
+Every change to a job or its questions bumps jobs.revision. Reads check the
+revision with a one-column query (ETag / 304 without loading the job) and
+serve the serialized JSON from a per-worker cache keyed by revision.
+"""
+import csv
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from .. import models, schemas
+from ..config import settings
+
+FORMATS = ("json", "yaml", "csv")
+
+_jobs_adapter = TypeAdapter(List[schemas.JobCreate])
+_job_out_adapter = TypeAdapter(schemas.JobOut)
+
+
+def question_rows(job_in: schemas.JobCreate) -> List[Dict[str, Any]]:
+    """
+    Insert rows for an imported job's questions (without job_id). Questions
+    that omit order_index take their position in the list; the resulting
+    order_index values must be unique within the job.
+    """
+    rows = []
+    seen = set()
+    for i, q in enumerate(job_in.questions or []):
+        order_index = q.order_index if "order_index" in q.model_fields_set else i
+        if order_index in seen:
+            raise ValueError(f"Duplicate order_index {order_index}")
+        seen.add(order_index)
+        rows.append({"text": q.text, "competency": q.competency, "order_index": order_index})
+    return rows
+
+
+def create_job(db: Session, job_in: schemas.JobCreate) -> models.Job:
+    """Create one job with its questions and commit. Questions are stored as given."""
+    rows = [
+        {"text": q.text, "competency": q.competency, "order_index": q.order_index}
+        for q in job_in.questions or []
+    ]
+
+    job = models.Job(
+        title=job_in.title,
+        description=job_in.description,
+        competencies=job_in.competencies or [],
+    )
+    db.add(job)
+    db.flush()
+
+    if rows:
+        db.execute(insert(models.JobQuestion), [{**r, "job_id": job.id} for r in rows])
+    db.commit()
+    return job
+
+
+def import_jobs(db: Session, jobs: List[schemas.JobCreate]) -> Dict[str, Any]:
+    """
+    Create many jobs and their questions in one transaction: either all are
+    imported or none. Returns {"jobs_created", "questions_created", "job_ids"}.
+    Raises ValueError naming the first invalid job.
+    """
+    if not jobs:
+        raise ValueError("No jobs to import")
+
+    per_job = []
+    for i, job_in in enumerate(jobs):
+        try:
+            per_job.append(question_rows(job_in))
+        except ValueError as e:
+            raise ValueError(f"Job {i} ({job_in.title!r}): {e}")
+
+    total = sum(len(rows) for rows in per_job)
+    if total > settings.JOB_IMPORT_MAX_QUESTIONS:
+        raise ValueError(f"Too many questions ({total}, max {settings.JOB_IMPORT_MAX_QUESTIONS})")
+
+    try:
+        job_ids = db.execute(
+            insert(models.Job).returning(models.Job.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": j.title,
+                    "description": j.description,
+                    "competencies": j.competencies or [],
+                }
+                for j in jobs
+            ],
+        ).scalars().all()
+
+        question_params = [
+            {**row, "job_id": job_id}
+            for job_id, rows in zip(job_ids, per_job)
+            for row in rows
+        ]
+        if question_params:
+            db.execute(insert(models.JobQuestion), question_params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"jobs_created": len(job_ids), "questions_created": total, "job_ids": list(job_ids)}
+
+
+def add_question(db: Session, job_id: int, q_in: schemas.JobQuestionCreate) -> models.JobQuestion:
+    q = models.JobQuestion(
+        job_id=job_id,
+        text=q_in.text,
+        competency=q_in.competency,
+        order_index=q_in.order_index,
+    )
+    db.add(q)
+    bump_revision(db, job_id)
+    db.commit()
+    db.refresh(q)
+    return q
+
+
+def delete_job(db: Session, job: models.Job) -> None:
+    job_id = job.id
+    db.delete(job)
+    db.commit()
+    invalidate(job_id)
+
+
+# ----------------------------
+# Revisions and cached reads
+# ----------------------------
+# job_id -> (revision, serialized JobOut), least recently used evicted first
+_json_cache: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+_json_cache_lock = threading.Lock()
+
+
+def bump_revision(db: Session, job_id: int) -> None:
+    """Call inside the transaction that changes the job or its questions."""
+    db.execute(
+        update(models.Job)
+        .where(models.Job.id == job_id)
+        .values(revision=models.Job.revision + 1)
+    )
+
+
+def get_revision(db: Session, job_id: int) -> Optional[int]:
+    return db.execute(select(models.Job.revision).where(models.Job.id == job_id)).scalar_one_or_none()
+
+
+def job_etag(job_id: int, revision: int) -> str:
+    return f'"job-{job_id}-{revision}"'
+
+
+def job_json(db: Session, job_id: int, revision: int) -> Optional[Tuple[int, bytes]]:
+    """
+    (revision, JobOut JSON) for the job, from the cache if it holds `revision`.
+    On a miss the job is loaded and the revision it was loaded at is returned,
+    which can be newer than the one asked for. None if the job is gone.
+    """
+    with _json_cache_lock:
+        hit = _json_cache.get(job_id)
+        if hit is not None and hit[0] == revision:
+            _json_cache.move_to_end(job_id)
+            return hit
+
+    job = (
+        db.query(models.Job)
+        .options(selectinload(models.Job.questions))
+        .filter(models.Job.id == job_id)
+        .first()
+    )
+    if job is None:
+        return None
+    entry = (job.revision, _job_out_adapter.dump_json(_job_out_adapter.validate_python(job, from_attributes=True)))
+
+    with _json_cache_lock:
+        _json_cache[job_id] = entry
+        _json_cache.move_to_end(job_id)
+        while len(_json_cache) > max(1, settings.JOB_JSON_CACHE_SIZE):
+            _json_cache.popitem(last=False)
+    return entry
+
+
+def invalidate(job_id: Optional[int] = None) -> None:
+    with _json_cache_lock:
+        if job_id is None:
+            _json_cache.clear()
+        else:
+            _json_cache.pop(job_id, None)
+
+
+def cache_control() -> str:
+    max_age = settings.JOB_CACHE_MAX_AGE_SECONDS
+    return f"private, max-age={max_age}" if max_age > 0 else "private, no-cache"
+
+
+# ----------------------------
+# Import file parsing
+# ----------------------------
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith((".yaml", ".yml")) or "yaml" in ctype:
+        return "yaml"
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    return "json"
+
+
+def _split_list(value: Optional[str]) -> Optional[List[str]]:
+    if not value or not value.strip():
+        return None
+    sep = ";" if ";" in value else "|" if "|" in value else ","
+    return [v.strip() for v in value.split(sep) if v.strip()]
+
+
+def _csv_jobs(text: str) -> List[Dict[str, Any]]:
+    """
+    One row per question: title, description, competencies (";"-separated),
+    question_text, question_competency, order_index. Consecutive or repeated
+    rows with the same title and description belong to the same job; a row
+    without question_text creates a job with no questions.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    headers = {(h or "").strip().lower() for h in (reader.fieldnames or [])}
+    if not {"title", "description"} <= headers:
+        raise ValueError("CSV needs at least 'title' and 'description' columns")
+
+    jobs: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    for record in reader:
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in record.items()}
+        key = (row.get("title", ""), row.get("description", ""))
+        job = jobs.get(key)
+        if job is None:
+            job = jobs[key] = {
+                "title": key[0],
+                "description": key[1],
+                "competencies": _split_list(row.get("competencies")),
+                "questions": [],
+            }
+        if row.get("question_text"):
+            q: Dict[str, Any] = {
+                "text": row["question_text"],
+                "competency": row.get("question_competency") or row.get("competency") or None,
+            }
+            if row.get("order_index"):
+                q["order_index"] = row["order_index"]
+            job["questions"].append(q)
+    return list(jobs.values())
+
+
+def parse_import(content: bytes, fmt: str) -> List[schemas.JobCreate]:
+    """
+    Parse and validate an import file. JSON/YAML hold a list of jobs (or
+    {"jobs": [...]}) shaped like JobCreate. Raises ValueError on bad input.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt} (use one of {', '.join(FORMATS)})")
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("File must be UTF-8 encoded")
+
+    if fmt == "csv":
+        data: Any = _csv_jobs(text)
+    elif fmt == "yaml":
+        import yaml
+
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}")
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    if isinstance(data, dict) and "jobs" in data:
+        data = data["jobs"]
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of jobs")
+
+    try:
+        return _jobs_adapter.validate_python(data)
+    except ValidationError as e:
+        first = e.errors()[0]
+        loc = ".".join(str(p) for p in first["loc"])
+        raise ValueError(f"{e.error_count()} validation error(s); first at {loc}: {first['msg']}")
@@ -1,71 +1,350 @@
-from typing import Dict, List
-from openai import OpenAI
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
 from ..config import settings
+from ..utils.profiling import span
+from .adaptive_interview_service import decide_followup
+from .transcript_service import compact_transcript, estimate_tokens, truncate_to_tokens
+
+# The OpenAI SDK is slow to import, so the client is built on first use
+# rather than at import time (keeps cold start cheap for /health-only workers).
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                _client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _client
+
+
+# ----------------------------
+# Resilience: deadlines, retries, concurrency cap, circuit breaker
+# ----------------------------
+class LLMUnavailableError(RuntimeError):
+    """Raised when the LLM could not be reached (breaker open, saturated, or retries exhausted)."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                # Let exactly one probe call through
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def cancel_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    _incr("breaker_opened")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_metrics: Dict[str, int] = {
+    "calls": 0,
+    "successes": 0,
+    "failures": 0,
+    "retries": 0,
+    "timeouts": 0,
+    "rejected_open": 0,
+    "rejected_busy": 0,
+    "fallbacks": 0,
+    "breaker_opened": 0,
+    # LLM calls skipped (pre-gate, follow-up bank) or moved off the request path
+    "pregate_hits": 0,
+    "llm_calls_saved": 0,
+    "llm_calls_deferred": 0,
+    # Follow-up bank lookups (followup_bank_service)
+    "followup_bank_hits": 0,
+    "followup_bank_misses": 0,
+    "followup_bank_low_confidence": 0,
+    # Scores reused from a near-duplicate answer (answer_similarity_service)
+    "similarity_reuse_hits": 0,
+}
+_metrics_lock = threading.Lock()
+_in_flight = 0
+
+# Live request-path calls and background ("batch") calls draw from separate
+# slots, so a rescore run or a burst of deferred scoring can't starve /answer
+_lanes = {
+    "live": (threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY), settings.LLM_QUEUE_TIMEOUT_SECONDS),
+    "batch": (
+        threading.BoundedSemaphore(max(1, settings.LLM_BATCH_MAX_CONCURRENCY)),
+        settings.LLM_BATCH_QUEUE_TIMEOUT_SECONDS,
+    ),
+}
+_breaker = CircuitBreaker(
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+)
+
+
+def _incr(key: str, n: int = 1) -> None:
+    with _metrics_lock:
+        _metrics[key] = _metrics.get(key, 0) + n
+
+
+def record_metric(key: str, n: int = 1) -> None:
+    """For callers outside this module that avoid or defer LLM calls."""
+    _incr(key, n)
+
+
+def get_metrics() -> Dict[str, Any]:
+    with _metrics_lock:
+        data: Dict[str, Any] = dict(_metrics)
+        data["in_flight"] = _in_flight
+    data["max_concurrency"] = settings.LLM_MAX_CONCURRENCY
+    data["batch_max_concurrency"] = max(1, settings.LLM_BATCH_MAX_CONCURRENCY)
+    data["breaker_state"] = _breaker.state
+    data["breaker_failures"] = _breaker.failures
+    return data
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+def _is_retryable(exc: Exception) -> bool:
+    import openai
 
-def build_scoring_prompt(question: str, answer: str, competencies: List[str]) -> str:
-    comp_str = ", ".join(competencies) if competencies else "overall quality"
-    return f"""
-You are an expert recruiter. Score the candidate's answer to the interview question.
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status is not None and (status in (408, 409, 429) or status >= 500)
 
-Question:
-\"\"\"{question}\"\"\"
 
-Candidate answer:
-\"\"\"{answer}\"\"\"
+def _chat_json(op: str, messages: List[Dict[str, str]], lane: str = "live") -> Tuple[Dict, Any]:
+    """
+    Run one JSON chat completion under the shared resilience policy.
+    Returns (parsed_json, raw_response). Raises LLMUnavailableError on
+    upstream trouble; other errors (bad request, invalid JSON) propagate.
+    lane is "live" (request path) or "batch" (background work).
+    """
+    global _in_flight
+
+    if not _breaker.allow():
+        _incr("rejected_open")
+        raise LLMUnavailableError("LLM circuit breaker is open")
+
+    semaphore, queue_timeout = _lanes[lane]
+    if not semaphore.acquire(timeout=queue_timeout):
+        _breaker.cancel_probe()
+        _incr("rejected_busy")
+        raise LLMUnavailableError("Too many in-flight LLM calls")
+
+    with _metrics_lock:
+        _in_flight += 1
+    _incr("calls")
+
+    try:
+        deadline = time.monotonic() + settings.LLM_DEADLINE_SECONDS
+        last_exc: Optional[Exception] = None
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                with span(f"llm.{op}", model=settings.OPENAI_MODEL, attempt=attempt):
+                    resp = get_client().with_options(
+                        timeout=min(settings.LLM_TIMEOUT_SECONDS, remaining),
+                        max_retries=0,
+                    ).chat.completions.create(
+                        model=settings.OPENAI_MODEL,
+                        messages=messages,
+                        response_format={"type": "json_object"},
+                    )
+            except Exception as e:
+                if not _is_retryable(e):
+                    # Upstream answered (e.g. 400); not a brownout signal
+                    _breaker.record_success()
+                    raise
+                last_exc = e
+                if type(e).__name__ == "APITimeoutError":
+                    _incr("timeouts")
+
+                # Full jitter backoff, never sleeping past the deadline
+                backoff = min(settings.LLM_BACKOFF_MAX_SECONDS, settings.LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+                sleep_for = min(random.uniform(0, backoff), deadline - time.monotonic())
+                if attempt < settings.LLM_MAX_RETRIES and sleep_for > 0:
+                    _incr("retries")
+                    time.sleep(sleep_for)
+                continue
+
+            _breaker.record_success()
+            _incr("successes")
+            return json.loads(resp.choices[0].message.content), resp
+
+        _breaker.record_failure()
+        _incr("failures")
+        raise LLMUnavailableError(f"LLM call '{op}' failed: {last_exc or 'deadline exceeded'}") from last_exc
+    finally:
+        with _metrics_lock:
+            _in_flight -= 1
+        semaphore.release()
+
+
+# ----------------------------
+# Prompt layout (prompt-cache friendly)
+# ----------------------------
+# Providers cache the longest identical message prefix, so every call is laid out as:
+#   1. system: fixed rubric, rules and JSON schema (identical for every call)
+#   2. user:   job context (identical for every call within the same job)
+#   3. user:   the variable part (question, answer, scoring signals)
+# Keep anything that varies per answer out of the first two messages.
+
+SCORING_SYSTEM_PROMPT = """
+You are an expert recruiter. Score the candidate's answer to the interview question.
 
 You should:
 - Evaluate from 1 to 5 (5 = excellent, 1 = very poor).
-- Evaluate the following competencies: {comp_str}.
+- Evaluate every competency listed in the job context (or "overall quality" if none are listed).
 - Provide short, constructive feedback.
 
 Return ONLY valid JSON with this structure:
-{{
+{
   "overall_score": <int 1-5>,
-  "competency_scores": {{
+  "competency_scores": {
     "<competency_name>": <int 1-5>,
     ...
-  }},
+  },
   "feedback": "<short textual feedback>"
-}}
+}
 """
 
+FOLLOWUP_SYSTEM_PROMPT = """
+You are an expert interviewer conducting a REAL interview.
 
-def score_answer(question: str, answer: str, competencies: List[str]) -> Dict:
-    prompt = build_scoring_prompt(question, answer, competencies)
+Your job: ask ONE follow-up question based on the candidate's answer, to clarify, probe depth, or fix gaps.
 
-    # Use Chat Completions API instead of Responses API
-    resp = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
-    )
+Rules:
+- Ask exactly ONE follow-up question.
+- The follow-up must be natural and human, like a real interviewer.
+- It must be specific to the candidate’s answer (not generic).
+- Keep it short (max 1-2 sentences).
+- Do NOT provide scoring or feedback.
+- Do NOT mention that you are an AI.
+
+Return ONLY valid JSON:
+{
+  "followup_question": "<string>"
+}
+"""
 
-    content = resp.choices[0].message.content
-    import json
 
-    data = json.loads(content)
-    return data
+def build_job_context(job_title: str, job_description: str, competencies: List[str]) -> str:
+    comp_str = ", ".join(competencies) if competencies else "overall quality"
+    return f"""
+Job title: {job_title or "(not specified)"}
 
+Job description:
+{job_description or "(not specified)"}
 
-def build_summary_prompt(job_title: str, job_description: str, qa_list: List[Dict]) -> str:
+Rubric competencies: {comp_str}
+"""
+
+
+def build_scoring_messages(
+    question: str,
+    answer: str,
+    competencies: List[str],
+    job_title: str = "",
+    job_description: str = "",
+) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+        {"role": "user", "content": build_job_context(job_title, job_description, competencies)},
+        {
+            "role": "user",
+            "content": f"""
+Question:
+\"\"\"{question}\"\"\"
+
+Candidate answer:
+\"\"\"{answer}\"\"\"
+""",
+        },
+    ]
+
+
+def score_answer(
+    question: str,
+    answer: str,
+    competencies: List[str],
+    job_title: str = "",
+    job_description: str = "",
+    fallback: bool = True,
+    lane: str = "live",
+) -> Dict:
     """
-    qa_list: [{"question": "...", "answer": "...", "score": int, "competency_scores": {...}}]
+    LLM scoring. When the LLM is unavailable, returns a heuristic score marked
+    "fallback": True, or raises LLMUnavailableError if fallback=False (batch
+    callers that should stop rather than store heuristic scores).
     """
-    qa_str = ""
-    for i, qa in enumerate(qa_list, start=1):
-        qa_str += f"""
-Q{i}: {qa['question']}
-A{i}: {qa['answer']}
-Score: {qa.get('score')}
-Competency scores: {qa.get('competency_scores')}
-"""
+    messages = build_scoring_messages(question, answer, competencies, job_title, job_description)
 
-    return f"""
+    # Use Chat Completions API instead of Responses API
+    try:
+        data, _ = _chat_json("score_answer", messages, lane=lane)
+    except LLMUnavailableError as e:
+        if not fallback:
+            raise
+        print(f"LLM unavailable, using heuristic scoring: {e}")
+        return _heuristic_scoring(answer, competencies)
+    return data
+
+
+def _heuristic_scoring(answer: str, competencies: List[str]) -> Dict:
+    _incr("fallbacks")
+    decision = decide_followup(competency=None, answer_text=answer, followup_round=0, max_followups=1)
+    score = decision["score"]
+    return {
+        "overall_score": score,
+        "competency_scores": {c: score for c in competencies},
+        "feedback": decision["feedback"],
+        "fallback": True,
+    }
+
+
+SUMMARY_PROMPT_TEMPLATE = """
 You are an expert recruiter summarising a structured interview.
 
 Job title: {job_title}
@@ -74,7 +353,7 @@ Job description:
 {job_description}
 
 Interview transcript:
-{qa_str}
+{transcript}
 
 Task:
 - Provide an overall recommendation from this set: ["Strong Hire","Hire","Leaning Hire","Neutral","Leaning No","No Hire"].
@@ -95,67 +374,95 @@ Return ONLY valid JSON:
 """
 
 
-def summarise_interview(job_title: str, job_description: str, qa_list: List[Dict]) -> Dict:
-    prompt = build_summary_prompt(job_title, job_description, qa_list)
-
-    resp = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
+def build_summary_prompt_with_stats(
+    job_title: str,
+    job_description: str,
+    qa_list: List[Dict],
+    token_budget: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    qa_list: [{"question": "...", "answer": "...", "score": int, "competency_scores": {...},
+               "is_followup": bool, "followup_round": int, "question_id": int, "parent_question_id": int}]
+
+    Follow-up rounds are collapsed under their spine question and answers are
+    shortened as needed so the whole prompt stays within token_budget.
+    """
+    budget = token_budget or settings.SUMMARY_PROMPT_TOKEN_BUDGET
+
+    # Job description gets at most a quarter of the budget
+    description, _ = truncate_to_tokens(job_description or "", max(1, budget // 4))
+    overhead = estimate_tokens(
+        SUMMARY_PROMPT_TEMPLATE.format(job_title=job_title, job_description=description, transcript="")
     )
 
-    content = resp.choices[0].message.content
-    import json
+    transcript, stats = compact_transcript(
+        qa_list,
+        token_budget=max(0, budget - overhead),
+        answer_max_tokens=settings.SUMMARY_ANSWER_MAX_TOKENS,
+    )
+    prompt = SUMMARY_PROMPT_TEMPLATE.format(
+        job_title=job_title,
+        job_description=description,
+        transcript=transcript,
+    )
+
+    stats["token_budget"] = budget
+    stats["prompt_tokens"] = estimate_tokens(prompt)
+    return prompt, stats
+
+
+def build_summary_prompt(job_title: str, job_description: str, qa_list: List[Dict]) -> str:
+    prompt, _ = build_summary_prompt_with_stats(job_title, job_description, qa_list)
+    return prompt
+
 
-    return json.loads(content)
+def summarise_interview(job_title: str, job_description: str, qa_list: List[Dict]) -> Dict:
+    prompt, prompt_stats = build_summary_prompt_with_stats(job_title, job_description, qa_list)
+
+    # No heuristic fallback for summaries: LLMUnavailableError propagates
+    data, resp = _chat_json("summarise_interview", [{"role": "user", "content": prompt}])
+
+    usage = getattr(resp, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        prompt_stats["provider_prompt_tokens"] = usage.prompt_tokens
+    data["prompt_stats"] = prompt_stats
+    return data
 
 
-def build_followup_prompt(
+def build_followup_messages(
     base_question: str,
     answer: str,
     competencies: List[str],
     scoring: Dict,
     followup_round: int,
-) -> str:
-    comp_str = ", ".join(competencies) if competencies else "overall quality"
+    job_title: str = "",
+    job_description: str = "",
+) -> List[Dict[str, str]]:
     feedback = scoring.get("feedback", "")
     overall = scoring.get("overall_score", 3)
     comp_scores = scoring.get("competency_scores", {})
 
-    return f"""
-You are an expert interviewer conducting a REAL interview.
-
-Your job: ask ONE follow-up question based on the candidate's answer, to clarify, probe depth, or fix gaps.
-
-Context:
+    return [
+        {"role": "system", "content": FOLLOWUP_SYSTEM_PROMPT},
+        {"role": "user", "content": build_job_context(job_title, job_description, competencies)},
+        {
+            "role": "user",
+            "content": f"""
 Base interview question:
 \"\"\"{base_question}\"\"\"
 
 Candidate answer:
 \"\"\"{answer}\"\"\"
 
-Rubric competencies: {comp_str}
 Model scoring signals:
 - overall_score: {overall}
 - competency_scores: {comp_scores}
 - feedback: \"\"\"{feedback}\"\"\"
 
-Rules:
-- Ask exactly ONE follow-up question.
-- The follow-up must be natural and human, like a real interviewer.
-- It must be specific to the candidate’s answer (not generic).
-- Keep it short (max 1-2 sentences).
-- Do NOT provide scoring or feedback.
-- Do NOT mention that you are an AI.
-- This is follow-up round #{followup_round + 1} for this base question.
-
-Return ONLY valid JSON:
-{{
-  "followup_question": "<string>"
-}}
-"""
+This is follow-up round #{followup_round + 1} for this base question.
+""",
+        },
+    ]
 
 
 def generate_followup_question(
@@ -164,15 +471,86 @@ def generate_followup_question(
     competencies: List[str],
     scoring: Dict,
     followup_round: int,
+    job_title: str = "",
+    job_description: str = "",
 ) -> Dict:
-    prompt = build_followup_prompt(base_question, answer, competencies, scoring, followup_round)
-
-    resp = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        response_format={"type": "json_object"},
+    messages = build_followup_messages(
+        base_question, answer, competencies, scoring, followup_round, job_title, job_description
     )
 
-    import json
-    content = resp.choices[0].message.content
-    return json.loads(content)
+    try:
+        data, _ = _chat_json("generate_followup_question", messages)
+    except LLMUnavailableError as e:
+        print(f"LLM unavailable, using heuristic follow-up: {e}")
+        _incr("fallbacks")
+        decision = decide_followup(
+            competency=None,
+            answer_text=answer,
+            followup_round=0,
+            max_followups=1,
+        )
+        return {"followup_question": decision["followup_question"] or "", "fallback": True}
+    return data
+
+
+FOLLOWUP_BANK_SYSTEM_PROMPT = """
+You are an expert interviewer preparing follow-up questions in advance.
+
+For the interview question below, write follow-up questions for each of these gaps
+a candidate's answer might have:
+- DETAIL: the answer is too brief or vague
+- OWNERSHIP: it is unclear what the candidate personally did
+- IMPACT: there is no measurable outcome
+- REFLECTION: the answer is fine but lacks lessons learned or trade-offs
+
+Rules:
+- Each follow-up must fit THIS question (not generic), be natural, and at most 1-2 sentences.
+- Do NOT mention that you are an AI.
+
+Return ONLY valid JSON:
+{
+  "DETAIL": ["<string>", ...],
+  "OWNERSHIP": ["<string>", ...],
+  "IMPACT": ["<string>", ...],
+  "REFLECTION": ["<string>", ...]
+}
+"""
+
+
+def generate_followup_bank(
+    question: str,
+    competencies: List[str],
+    per_category: int,
+    job_title: str = "",
+    job_description: str = "",
+) -> Dict[str, List[str]]:
+    """
+    One call per spine question: {category: [follow-up, ...]}.
+    Raises LLMUnavailableError, or ValueError when the reply is not a JSON
+    object; the offline job decides what to do about it.
+    """
+    messages = [
+        {"role": "system", "content": FOLLOWUP_BANK_SYSTEM_PROMPT},
+        {"role": "user", "content": build_job_context(job_title, job_description, competencies)},
+        {
+            "role": "user",
+            "content": f"""
+Interview question:
+\"\"\"{question}\"\"\"
+
+Write {per_category} follow-ups per category.
+""",
+        },
+    ]
+    data, _ = _chat_json("generate_followup_bank", messages, lane="batch")
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object of categories, got {type(data).__name__}")
+
+    bank: Dict[str, List[str]] = {}
+    for category, items in data.items():
+        if not isinstance(items, list):
+            continue
+        texts = [str(t).strip() for t in items if str(t).strip()]
+        if texts:
+            bank[str(category).upper()] = texts[:per_category]
+    return bank
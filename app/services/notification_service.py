@@ -1,13 +1,15 @@
-from app.services.email_service import email_service
-from app.config import settings
+import time
+from typing import List, Tuple
 
+from app.services.email_service import get_email_service
+from app.config import settings
 
-def send_candidate_invite(candidate_email: str, invite_token: str, job_title: str):
-    link = f"{settings.FRONTEND_BASE_URL}/start?token={invite_token}"
+# Substitution tag replaced per recipient in batched invite emails
+INVITE_LINK_TAG = "-invite_link-"
 
-    subject = f"Interview Invitation – {job_title}"
 
-    html = f"""
+def _invite_html(job_title: str, link: str) -> str:
+    return f"""
     <h2>Interview Invitation</h2>
     <p>You have been invited to an interview for <b>{job_title}</b>.</p>
     <p>Click the button below to start your interview:</p>
@@ -20,7 +22,39 @@ def send_candidate_invite(candidate_email: str, invite_token: str, job_title: st
     <p>{link}</p>
     """
 
-    email_service.send_email(candidate_email, subject, html)
+
+def _invite_link(invite_token: str) -> str:
+    return f"{settings.FRONTEND_BASE_URL}/start?token={invite_token}"
+
+
+def send_candidate_invite(candidate_email: str, invite_token: str, job_title: str):
+    subject = f"Interview Invitation – {job_title}"
+    get_email_service().send_email(candidate_email, subject, _invite_html(job_title, _invite_link(invite_token)))
+
+
+def send_candidate_invites_bulk(invites: List[Tuple[str, str]], job_title: str) -> int:
+    """
+    invites: [(candidate_email, invite_token)]. Sends EMAIL_BATCH_SIZE
+    recipients per API call (one shared body, per-recipient link via
+    substitution) and waits EMAIL_BATCH_INTERVAL_SECONDS between calls to
+    stay under the provider's rate limit. Returns how many were accepted.
+    """
+    subject = f"Interview Invitation – {job_title}"
+    html = _invite_html(job_title, INVITE_LINK_TAG)
+    batch_size = max(1, min(settings.EMAIL_BATCH_SIZE, 1000))  # SendGrid caps personalizations at 1000
+
+    sent = 0
+    for start in range(0, len(invites), batch_size):
+        if start:
+            time.sleep(settings.EMAIL_BATCH_INTERVAL_SECONDS)
+        batch = invites[start:start + batch_size]
+        sent += get_email_service().send_batch(
+            [(email, {INVITE_LINK_TAG: _invite_link(token)}) for email, token in batch],
+            subject,
+            html,
+        )
+    print(f"Bulk invites for {job_title!r}: {sent}/{len(invites)} accepted")
+    return sent
 
 
 def notify_admin_interview_completed(candidate_email: str, job_title: str):
@@ -43,4 +77,4 @@ def notify_admin_interview_completed(candidate_email: str, job_title: str):
     ]
 
     for admin_email in admin_list:
-        email_service.send_email(admin_email, subject, html)
+        get_email_service().send_email(admin_email, subject, html)
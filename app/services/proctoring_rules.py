@@ -0,0 +1,165 @@
+"""
+Versioned proctoring rule sets.
+
+A RuleSet is plain data (weights, count escalations, time-window rules).
+get_ruleset(version) compiles it once per process into a CompiledRuleSet that
+can score a full event list, or be fed one event at a time with state kept in
+Interview.integrity_flags.
+
+To change scoring, add a new version to RULESETS rather than editing an
+existing one, so historical interviews stay explainable.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Escalation:
+    """Extra penalty per event of event_type from the from_count-th event on."""
+    event_type: str
+    from_count: int
+    per_event: int
+
+
+@dataclass(frozen=True)
+class WindowRule:
+    """`threshold` events of event_type within window_seconds counts as one hit."""
+    name: str
+    event_type: str
+    threshold: int
+    window_seconds: float
+    penalty: int
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    version: str
+    weights: Dict[str, int]
+    escalations: Tuple[Escalation, ...] = ()
+    window_rules: Tuple[WindowRule, ...] = field(default_factory=tuple)
+
+
+V1_WEIGHTS = {
+    "TAB_HIDDEN": 8,
+    "WINDOW_BLUR": 6,
+    "PASTE": 10,
+    "COPY": 4,
+    "CUT": 4,
+    "FULLSCREEN_EXIT": 12,
+}
+
+RULESETS: Dict[str, RuleSet] = {
+    "v1": RuleSet(
+        version="v1",
+        weights=V1_WEIGHTS,
+        escalations=(Escalation("TAB_HIDDEN", from_count=3, per_event=5),),
+    ),
+    "v2": RuleSet(
+        version="v2",
+        weights=V1_WEIGHTS,
+        escalations=(Escalation("TAB_HIDDEN", from_count=3, per_event=5),),
+        window_rules=(
+            WindowRule("paste_burst", "PASTE", threshold=3, window_seconds=60, penalty=15),
+            WindowRule("tab_burst", "TAB_HIDDEN", threshold=4, window_seconds=120, penalty=10),
+        ),
+    ),
+}
+
+
+def _normalize(event_type: Optional[str]) -> str:
+    return (event_type or "").upper().strip()
+
+
+class CompiledRuleSet:
+    def __init__(self, rules: RuleSet):
+        self.version = rules.version
+        self.rules = rules
+        self.event_types: Tuple[str, ...] = tuple(rules.weights.keys())
+        self.weights = dict(rules.weights)
+        self.escalations: Tuple[Tuple[str, int, int], ...] = tuple(
+            (e.event_type, e.from_count, e.per_event) for e in rules.escalations
+        )
+        # event_type -> rules watching it, so each event only touches relevant windows
+        self.windows_by_type: Dict[str, Tuple[WindowRule, ...]] = {}
+        for w in rules.window_rules:
+            self.windows_by_type[w.event_type] = self.windows_by_type.get(w.event_type, ()) + (w,)
+        self.window_penalty = {w.name: w.penalty for w in rules.window_rules}
+
+    # ---- incremental evaluation ----
+    def new_state(self) -> Dict[str, Any]:
+        return {"counts": {}, "windows": {}, "window_hits": {}}
+
+    def state_from_flags(self, flags: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Resume from stored flags; None if they were produced by another version."""
+        if not flags or flags.get("version") != self.version or "state" not in flags:
+            return None
+        return {
+            "counts": dict(flags.get("counts") or {}),
+            "windows": {k: list(v) for k, v in (flags["state"].get("windows") or {}).items()},
+            "window_hits": dict(flags.get("window_hits") or {}),
+        }
+
+    def apply(self, state: Dict[str, Any], event_type: Optional[str], ts: Optional[float] = None) -> None:
+        """Fold one event into state. ts is epoch seconds; window rules skip events without it."""
+        et = _normalize(event_type)
+        counts = state["counts"]
+        counts[et] = counts.get(et, 0) + 1
+
+        if ts is None:
+            return
+        for w in self.windows_by_type.get(et, ()):
+            window = [t for t in state["windows"].get(w.name, ()) if ts - t < w.window_seconds]
+            window.append(ts)
+            if len(window) >= w.threshold:
+                # Count the burst once, then start a fresh window
+                state["window_hits"][w.name] = state["window_hits"].get(w.name, 0) + 1
+                window = []
+            state["windows"][w.name] = window
+
+    def penalty_for_counts(self, counts: Dict[str, int]) -> int:
+        penalty = sum(self.weights.get(et, 0) * n for et, n in counts.items())
+        for et, from_count, per_event in self.escalations:
+            n = counts.get(et, 0)
+            if n >= from_count:
+                penalty += (n - (from_count - 1)) * per_event
+        return penalty
+
+    def result(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns:
+          {"score": int 0-100, "flags": {...}}
+        flags include the resumable state for incremental updates.
+        """
+        penalty = self.penalty_for_counts(state["counts"])
+        penalty += sum(self.window_penalty.get(name, 0) * hits for name, hits in state["window_hits"].items())
+
+        score = max(0, min(100, 100 - penalty))
+        flags = {
+            "version": self.version,
+            "counts": dict(state["counts"]),
+            "penalty": penalty,
+            "window_hits": dict(state["window_hits"]),
+            "state": {"windows": {k: list(v) for k, v in state["windows"].items()}},
+        }
+        return {"score": score, "flags": flags}
+
+    # ---- batch evaluation ----
+    def evaluate(self, events: Iterable[Tuple[Optional[str], Optional[float]]]) -> Dict[str, Any]:
+        """events: (event_type, epoch_seconds_or_None) in chronological order."""
+        state = self.new_state()
+        for et, ts in events:
+            self.apply(state, et, ts)
+        return self.result(state)
+
+
+def available_versions() -> List[str]:
+    return list(RULESETS.keys())
+
+
+@lru_cache(maxsize=None)
+def get_ruleset(version: str) -> CompiledRuleSet:
+    rules = RULESETS.get(version)
+    if rules is None:
+        raise ValueError(f"Unknown proctoring rules version: {version}")
+    return CompiledRuleSet(rules)
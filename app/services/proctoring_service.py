@@ -1,43 +1,340 @@
-from typing import Dict, List, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+
+from ..config import settings
+from .proctoring_rules import RULESETS, get_ruleset
 
 DEFAULT_VERSION = "v1"
 
-# Simple, transparent, deterministic rules.
-# You can tune later without changing the frontend.
-WEIGHTS = {
-    "TAB_HIDDEN": 8,
-    "WINDOW_BLUR": 6,
-    "PASTE": 10,
-    "COPY": 4,
-    "CUT": 4,
-    "FULLSCREEN_EXIT": 12,
-}
+# Simple, transparent, deterministic rules (v1). Versioned rule sets live in
+# proctoring_rules; add a new version there instead of editing these.
+WEIGHTS = RULESETS[DEFAULT_VERSION].weights
+
+
+def active_version() -> str:
+    return settings.PROCTORING_RULES_VERSION or DEFAULT_VERSION
+
+
+def _epoch(ts: Optional[datetime]) -> Optional[float]:
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        # SQLite hands back naive datetimes; they were stored as UTC
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
 
-def compute_integrity(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+def compute_integrity(events: List[Dict[str, Any]], version: Optional[str] = None) -> Dict[str, Any]:
     """
+    events: dicts with event_type and optionally created_at, oldest first.
     Returns:
       {"score": int 0-100, "flags": {...}}
     """
-    counts: Dict[str, int] = {}
-    penalty = 0
+    ruleset = get_ruleset(version or active_version())
+    return ruleset.evaluate((e.get("event_type"), _epoch(e.get("created_at"))) for e in events)
 
-    for e in events:
-        et = (e.get("event_type") or "").upper().strip()
-        counts[et] = counts.get(et, 0) + 1
-        penalty += WEIGHTS.get(et, 0)
-
-    # Escalation rule: repeated tab switches hurt more
-    tab = counts.get("TAB_HIDDEN", 0)
-    if tab >= 3:
-        penalty += (tab - 2) * 5
-
-    # clamp
-    score = max(0, min(100, 100 - penalty))
-
-    # map to readable flags
-    flags = {
-        "version": DEFAULT_VERSION,
-        "counts": counts,
-        "penalty": penalty,
+
+# Optimistic attempts before record_event falls back to locking the interview row
+RECORD_EVENT_ATTEMPTS = 3
+
+
+def record_event(db: Session, interview_id: int, event: models.InterviewProctorEvent) -> Optional[Dict[str, Any]]:
+    """
+    Fold a newly added (flushed) event into the interview's integrity score.
+    Returns the computed {"score", "flags"}, or None if the interview is gone.
+
+    The evaluator state is kept in integrity_flags, so this is O(1) per event.
+    If the stored flags come from another rule version (or predate the state
+    field), the interview's full history is re-evaluated once.
+
+    The interview row is not locked (answer scoring writes the same row): the
+    state is read, advanced and written back with an UPDATE that only matches
+    while integrity_seq is unchanged. A concurrent event makes it miss, and
+    the read is retried; the last attempt reads FOR UPDATE so it always lands.
+    """
+    ruleset = get_ruleset(active_version())
+    Interview = models.Interview
+
+    for attempt in range(RECORD_EVENT_ATTEMPTS):
+        q = select(Interview.integrity_flags, Interview.integrity_seq).where(Interview.id == interview_id)
+        if attempt == RECORD_EVENT_ATTEMPTS - 1:
+            q = q.with_for_update()
+        row = db.execute(q).first()
+        if row is None:
+            return None
+
+        state = ruleset.state_from_flags(row.integrity_flags)
+        if state is None:
+            state = ruleset.new_state()
+            for et, ts in _history(db, [interview_id]).get(interview_id, []):
+                ruleset.apply(state, et, ts)
+        else:
+            ruleset.apply(state, event.event_type, _epoch(event.created_at))
+
+        computed = ruleset.result(state)
+        seq = row.integrity_seq or 0
+        written = db.execute(
+            update(Interview)
+            .where(Interview.id == interview_id, Interview.integrity_seq == seq)
+            .values(
+                integrity_score=computed["score"],
+                integrity_flags=computed["flags"],
+                proctoring_version=ruleset.version,
+                integrity_seq=seq + 1,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if written:
+            return computed
+
+    raise RuntimeError(f"Could not record proctoring event for interview {interview_id}")
+
+
+def _history(db: Session, interview_ids: List[int]) -> Dict[int, List[Tuple[str, Optional[float]]]]:
+    """
+    (event_type, epoch) per interview in time order, from downsampled buckets and
+    raw events. A bucket stands for `count` events at its minute, so window rules
+    on downsampled history are evaluated at minute resolution.
+    """
+    Event = models.InterviewProctorEvent
+    Bucket = models.InterviewProctorBucket
+    merged: Dict[int, List[Tuple[Optional[float], str]]] = {}
+
+    for b in (
+        db.query(Bucket.interview_id, Bucket.bucket_start, Bucket.event_type, Bucket.count)
+        .filter(Bucket.interview_id.in_(interview_ids))
+        .all()
+    ):
+        ts = _epoch(b.bucket_start)
+        merged.setdefault(b.interview_id, []).extend([(ts, b.event_type)] * int(b.count))
+
+    for e in (
+        db.query(Event.interview_id, Event.created_at, Event.event_type)
+        .filter(Event.interview_id.in_(interview_ids))
+        .order_by(Event.interview_id.asc(), Event.created_at.asc(), Event.id.asc())
+        .all()
+    ):
+        merged.setdefault(e.interview_id, []).append((_epoch(e.created_at), e.event_type))
+
+    return {
+        iid: [(et, ts) for ts, et in sorted(evs, key=lambda x: x[0] or 0.0)]
+        for iid, evs in merged.items()
     }
-    return {"score": score, "flags": flags}
+
+
+def reevaluate_interviews(
+    db: Session,
+    version: str,
+    job_id: Optional[int] = None,
+    batch_size: int = 200,
+) -> Dict[str, Any]:
+    """
+    Re-score historical interviews under rule set `version`, which must be the
+    active one: record_event re-derives state from history whenever stored
+    flags come from another version, so the next event would silently undo a
+    re-evaluation under any other version.
+
+    The rule set is compiled once; interviews are processed in id-ordered
+    batches, each loading its events in two queries and committing once.
+    Rows are written like record_event does, with an UPDATE guarded by the
+    integrity_seq they were read with; an interview whose seq moved
+    (a concurrent event) is re-read and re-scored.
+    """
+    ruleset = get_ruleset(version)  # raises ValueError for unknown versions
+    if ruleset.version != active_version():
+        raise ValueError(
+            f"Rules version {ruleset.version} is not active (PROCTORING_RULES_VERSION={active_version()}); "
+            "new events would re-score these interviews under the active version"
+        )
+
+    Interview = models.Interview
+    totals: Dict[str, Any] = {"version": ruleset.version, "interviews": 0, "changed": 0}
+    last_id = 0
+
+    while True:
+        q = select(Interview.id).where(Interview.id > last_id)
+        if job_id is not None:
+            q = q.where(Interview.job_id == job_id)
+        pending = db.execute(q.order_by(Interview.id.asc()).limit(batch_size)).scalars().all()
+        if not pending:
+            break
+        totals["interviews"] += len(pending)
+        last_id = pending[-1]
+
+        for _ in range(RECORD_EVENT_ATTEMPTS):
+            rows = db.execute(
+                select(Interview.id, Interview.integrity_score, Interview.integrity_seq).where(Interview.id.in_(pending))
+            ).all()
+            history = _history(db, pending)
+            missed = []
+            for row in rows:
+                computed = ruleset.evaluate(history.get(row.id, []))
+                seq = row.integrity_seq or 0
+                written = db.execute(
+                    update(Interview)
+                    .where(Interview.id == row.id, Interview.integrity_seq == seq)
+                    .values(
+                        integrity_score=computed["score"],
+                        integrity_flags=computed["flags"],
+                        proctoring_version=ruleset.version,
+                        integrity_seq=seq + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if not written:
+                    missed.append(row.id)
+                elif row.integrity_score is not None and computed["score"] != row.integrity_score:
+                    totals["changed"] += 1
+            db.commit()
+            if not missed:
+                break
+            pending = missed
+
+    return totals
+
+
+# ----------------------------
+# Retention / downsampling
+# ----------------------------
+def _minute(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+def bucketize(events: Iterable[Any]) -> Dict[Tuple[datetime, str], Dict[str, int]]:
+    """
+    Roll events (objects/rows with created_at, event_type, severity) into
+    per-minute, per-type buckets: {(minute, type): {"count": n, "max_severity": s}}.
+    """
+    buckets: Dict[Tuple[datetime, str], Dict[str, int]] = {}
+    for e in events:
+        key = (_minute(e.created_at), (e.event_type or "").upper().strip())
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = {"count": 1, "max_severity": int(e.severity or 1)}
+        else:
+            b["count"] += 1
+            b["max_severity"] = max(b["max_severity"], int(e.severity or 1))
+    return buckets
+
+
+def downsample_completed_interviews(
+    db: Session,
+    older_than_days: int,
+    batch_size: int = 100,
+) -> Dict[str, int]:
+    """
+    For interviews completed more than older_than_days ago, replace raw proctor
+    events with per-minute buckets. Each batch of interviews is one transaction
+    (insert buckets + delete raw rows), so the job can be stopped and re-run safely.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    Event = models.InterviewProctorEvent
+    totals = {"interviews": 0, "events_removed": 0, "buckets_created": 0}
+
+    while True:
+        interview_ids = [
+            row[0]
+            for row in db.query(models.Interview.id)
+            .filter(
+                models.Interview.status == models.InterviewStatus.COMPLETED,
+                models.Interview.completed_at < cutoff,
+                db.query(Event.id).filter(Event.interview_id == models.Interview.id).exists(),
+            )
+            .order_by(models.Interview.id.asc())
+            .limit(batch_size)
+            .all()
+        ]
+        if not interview_ids:
+            break
+
+        events = (
+            db.query(Event.interview_id, Event.created_at, Event.event_type, Event.severity)
+            .filter(Event.interview_id.in_(interview_ids))
+            .order_by(Event.interview_id.asc(), Event.created_at.asc())
+            .all()
+        )
+
+        # Events that arrived after an earlier run land in buckets that may already exist
+        existing = {
+            (b.interview_id, b.bucket_start, b.event_type): b
+            for b in db.query(models.InterviewProctorBucket)
+            .filter(models.InterviewProctorBucket.interview_id.in_(interview_ids))
+            .all()
+        }
+
+        rows: List[Dict[str, Any]] = []
+        by_interview: Dict[int, List[Any]] = {}
+        for e in events:
+            by_interview.setdefault(e.interview_id, []).append(e)
+        for interview_id, evs in by_interview.items():
+            for (minute, event_type), b in bucketize(evs).items():
+                current = existing.get((interview_id, minute, event_type))
+                if current is not None:
+                    current.count += b["count"]
+                    current.max_severity = max(current.max_severity, b["max_severity"])
+                    continue
+                rows.append(
+                    {
+                        "interview_id": interview_id,
+                        "bucket_start": minute,
+                        "event_type": event_type,
+                        "count": b["count"],
+                        "max_severity": b["max_severity"],
+                    }
+                )
+
+        if rows:
+            db.execute(insert(models.InterviewProctorBucket), rows)
+        removed = (
+            db.query(Event)
+            .filter(Event.interview_id.in_(interview_ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+
+        totals["interviews"] += len(interview_ids)
+        totals["events_removed"] += removed
+        totals["buckets_created"] += len(rows)
+
+    return totals
+
+
+def get_timeline(db: Session, interview_id: int) -> List[Dict[str, Any]]:
+    """
+    Per-minute timeline, oldest first. Served from stored buckets, plus an
+    on-the-fly rollup of any raw events not yet downsampled.
+    """
+    Bucket = models.InterviewProctorBucket
+    merged: Dict[Tuple[datetime, str], Dict[str, int]] = {}
+
+    for b in (
+        db.query(Bucket.bucket_start, Bucket.event_type, Bucket.count, Bucket.max_severity)
+        .filter(Bucket.interview_id == interview_id)
+        .all()
+    ):
+        merged[(b.bucket_start, b.event_type)] = {"count": b.count, "max_severity": b.max_severity}
+
+    Event = models.InterviewProctorEvent
+    raw = (
+        db.query(Event.created_at, Event.event_type, Event.severity)
+        .filter(Event.interview_id == interview_id)
+        .order_by(Event.created_at.asc())
+        .all()
+    )
+    for key, b in bucketize(raw).items():
+        cur = merged.get(key)
+        if cur is None:
+            merged[key] = b
+        else:
+            cur["count"] += b["count"]
+            cur["max_severity"] = max(cur["max_severity"], b["max_severity"])
+
+    return [
+        {"bucket_start": minute, "event_type": event_type, **b}
+        for (minute, event_type), b in sorted(merged.items(), key=lambda kv: (kv[0][0], kv[0][1]))
+    ]
@@ -0,0 +1,194 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from . import answer_similarity_service
+from .llm_service import LLMUnavailableError, score_answer
+
+
+def _answers_query(job_id: Optional[int]):
+    q = select(
+        models.InterviewAnswer.id,
+        models.InterviewAnswer.answer_text,
+        models.InterviewAnswer.question_id,
+        models.InterviewAnswer.parent_question_id,
+        models.Interview.job_id,
+    ).join(models.Interview, models.Interview.id == models.InterviewAnswer.interview_id)
+
+    if job_id is not None:
+        q = q.where(models.Interview.job_id == job_id)
+    return q
+
+
+def count_answers(db: Session, job_id: Optional[int]) -> int:
+    q = select(func.count(models.InterviewAnswer.id)).join(
+        models.Interview, models.Interview.id == models.InterviewAnswer.interview_id
+    )
+    if job_id is not None:
+        q = q.where(models.Interview.job_id == job_id)
+    return db.execute(q).scalar_one()
+
+
+def progress(job: models.RescoreJob) -> Dict[str, Any]:
+    done = job.processed + job.failed
+    return {
+        "percent": round(100.0 * done / job.total, 1) if job.total else None,
+        "answers_per_second": round(done / job.elapsed_seconds, 2) if job.elapsed_seconds else None,
+    }
+
+
+def _load_context(
+    db: Session,
+    rows: List[Any],
+    question_texts: Dict[int, str],
+    job_context: Dict[int, Dict[str, Any]],
+) -> None:
+    """Fill the question/job context caches for the ids referenced by this chunk."""
+    q_ids = {r.question_id or r.parent_question_id for r in rows} - {None} - question_texts.keys()
+    if q_ids:
+        for qid, text in db.execute(
+            select(models.JobQuestion.id, models.JobQuestion.text).where(models.JobQuestion.id.in_(q_ids))
+        ):
+            question_texts[qid] = text
+
+    job_ids = {r.job_id for r in rows} - job_context.keys()
+    if job_ids:
+        for jid, title, description, comps in db.execute(
+            select(models.Job.id, models.Job.title, models.Job.description, models.Job.competencies)
+            .where(models.Job.id.in_(job_ids))
+        ):
+            job_context[jid] = {"title": title, "description": description, "competencies": comps or []}
+
+
+def run_rescore_job(rescore_job_id: int) -> None:
+    """
+    Re-score InterviewAnswer rows in id order with bounded concurrency.
+
+    Meant to run as a background task with its own session. Progress is
+    checkpointed after every chunk, so a failed or interrupted job can be
+    resumed from last_answer_id.
+
+    If the LLM becomes unavailable the job stops as PAUSED with the checkpoint
+    just before the first answer it couldn't score, so resuming picks up
+    exactly there. Answers that fail for other reasons (e.g. an unparseable
+    response) are counted as failed and skipped.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(models.RescoreJob, rescore_job_id)
+        if not job:
+            return
+
+        job.status = "RUNNING"
+        job.error = None
+        job.started_at = job.started_at or datetime.now(timezone.utc)
+        if job.total is None:
+            job.total = count_answers(db, job.job_id)
+        db.commit()
+
+        question_texts: Dict[int, str] = {}
+        job_context: Dict[int, Dict[str, Any]] = {}
+
+        # More threads than batch LLM slots would only queue (and time out) in llm_service
+        workers = max(1, min(job.concurrency, settings.LLM_BATCH_MAX_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                chunk_started = time.perf_counter()
+                rows = db.execute(
+                    _answers_query(job.job_id)
+                    .where(models.InterviewAnswer.id > job.last_answer_id)
+                    .order_by(models.InterviewAnswer.id.asc())
+                    .limit(job.batch_size)
+                ).all()
+                if not rows:
+                    break
+
+                _load_context(db, rows, question_texts, job_context)
+
+                def _score(row):
+                    # Score against the BASE question, like the live answer path
+                    base_q = question_texts.get(row.question_id or row.parent_question_id, "")
+                    ctx = job_context.get(row.job_id) or {}
+                    try:
+                        return row.id, score_answer(
+                            base_q,
+                            row.answer_text,
+                            ctx.get("competencies", []),
+                            job_title=ctx.get("title", ""),
+                            job_description=ctx.get("description", ""),
+                            fallback=False,
+                            lane="batch",
+                        )
+                    except LLMUnavailableError as e:
+                        return row.id, e
+                    except Exception as e:
+                        print(f"Rescore failed for answer {row.id}: {e}")
+                        return row.id, None
+
+                updates = []
+                failed = 0
+                checkpoint = job.last_answer_id
+                unavailable: Optional[LLMUnavailableError] = None
+                for answer_id, scoring in pool.map(_score, rows):
+                    if isinstance(scoring, LLMUnavailableError):
+                        # Results come back in id order: keep only what precedes this answer
+                        unavailable = scoring
+                        break
+                    checkpoint = answer_id
+                    if scoring is None:
+                        failed += 1
+                        continue
+                    updates.append(
+                        {
+                            "id": answer_id,
+                            "score": scoring.get("overall_score"),
+                            "competency_scores": scoring.get("competency_scores"),
+                            "ai_feedback": scoring.get("feedback"),
+                        }
+                    )
+
+                # Bulk UPDATE ... WHERE id = :id (executemany)
+                if updates:
+                    db.execute(update(models.InterviewAnswer), updates)
+
+                job.last_answer_id = checkpoint
+                job.processed += len(updates)
+                job.failed += failed
+                job.elapsed_seconds += time.perf_counter() - chunk_started
+                job.updated_at = datetime.now(timezone.utc)
+                if unavailable is not None:
+                    job.status = "PAUSED"
+                    job.error = f"Paused after answer {checkpoint}, resume when the LLM is back: {unavailable}"[:2000]
+                db.commit()
+
+                if updates:
+                    # Cached similarity entries still carry the old scores
+                    rescored = {u["id"] for u in updates}
+                    answer_similarity_service.invalidate(
+                        {r.question_id or r.parent_question_id for r in rows if r.id in rescored} - {None}
+                    )
+                if unavailable is not None:
+                    print(f"Rescore job {rescore_job_id} paused: {unavailable}")
+                    return
+
+        job.status = "COMPLETED"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        job = db.get(models.RescoreJob, rescore_job_id)
+        if job:
+            job.status = "FAILED"
+            job.error = str(e)[:2000]
+            job.updated_at = datetime.now(timezone.utc)
+            db.commit()
+        print(f"Rescore job {rescore_job_id} failed: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,254 @@
+"""
+Admin full-text search over interview answers, candidates and contact leads.
+
+Postgres: tsvector expressions backed by GIN indexes, ranked with ts_rank and
+highlighted with ts_headline (only for the rows of the returned page).
+SQLite: FTS5 external-content tables, ranked with bm25() and highlighted with
+snippet(). Both are created by migration 7; if a SQLite build lacks FTS5 the
+search degrades to LIKE matching.
+
+Results are keyset-paginated on (rank, id): the cursor carries the last
+row's pair, so deep pages cost the same as the first one.
+"""
+import base64
+import html
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Highlight markers used inside the database; swapped for <mark> after escaping
+_OPEN, _CLOSE = "\x02", "\x03"
+MAX_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class Scope:
+    table: str
+    columns: Tuple[str, ...]
+    config: str           # Postgres text search config
+    prefix: bool          # match word prefixes (names/emails) instead of whole words
+    fields: str           # SELECT list, aliased id/interview_id/title/subtitle
+    joins: str
+    body: str             # text to highlight
+
+
+SCOPES: Dict[str, Scope] = {
+    "answers": Scope(
+        table="interview_answers",
+        columns=("answer_text",),
+        config="english",
+        prefix=False,
+        fields="t.id AS id, t.interview_id AS interview_id, i.candidate_name AS title, t.question_text AS subtitle",
+        joins="JOIN interviews i ON i.id = t.interview_id",
+        body="t.answer_text",
+    ),
+    "interviews": Scope(
+        table="interviews",
+        columns=("candidate_name", "candidate_email"),
+        config="simple",
+        prefix=True,
+        fields="t.id AS id, t.id AS interview_id, t.candidate_name AS title, t.candidate_email AS subtitle",
+        joins="",
+        body="t.candidate_name || ' <' || t.candidate_email || '>'",
+    ),
+    "leads": Scope(
+        table="contact_leads",
+        columns=("name", "email", "message"),
+        config="english",
+        prefix=False,
+        fields="t.id AS id, NULL AS interview_id, t.name AS title, t.email AS subtitle",
+        joins="",
+        body="t.message",
+    ),
+}
+
+
+def pg_document(scope: Scope) -> str:
+    # Must match the index expressions in migrations/versions/m0007_search_indexes.py
+    joined = " || ' ' || ".join(f"coalesce({c}, '')" for c in scope.columns)
+    return f"to_tsvector('{scope.config}', {joined})"
+
+
+# ----------------------------
+# Cursor
+# ----------------------------
+def encode_cursor(rank: float, row_id: int) -> str:
+    raw = json.dumps({"r": rank, "id": row_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(data["r"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+# ----------------------------
+# Query text
+# ----------------------------
+def _pg_tsquery(scope: Scope, q: str) -> Tuple[str, str]:
+    """(tsquery SQL, bound query string)"""
+    if scope.prefix:
+        # Keep @ and . so emails stay one token for the simple parser
+        tokens = [t.strip(".") for t in re.findall(r"[\w@.]+", q)]
+        return f"to_tsquery('{scope.config}', :q)", " & ".join(f"{t}:*" for t in tokens if t)
+    return f"websearch_to_tsquery('{scope.config}', :q)", q
+
+
+def _fts5_query(scope: Scope, q: str) -> str:
+    # Quote every token: user input never reaches FTS5 query syntax
+    tokens = re.findall(r"\w+", q)
+    return " ".join(f'"{t}"*' if scope.prefix else f'"{t}"' for t in tokens)
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet and turn the DB markers into <mark> tags."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def _like_snippet(body: str, tokens: List[str], width: int = 160) -> str:
+    lowered = body.lower()
+    pos = min((lowered.find(t) for t in tokens if t in lowered), default=0)
+    start = max(0, pos - width // 4)
+    window = body[start:start + width]
+    for t in sorted(set(tokens), key=len, reverse=True):
+        window = re.sub(re.escape(t), lambda m: f"{_OPEN}{m.group(0)}{_CLOSE}", window, flags=re.IGNORECASE)
+    return ("…" if start else "") + window + ("…" if start + width < len(body) else "")
+
+
+# ----------------------------
+# Backends
+# ----------------------------
+def _keyset(rank_sql: str, cursor: Optional[Tuple[float, int]]) -> str:
+    return f" AND ({rank_sql}, t.id) < (:cursor_rank, :cursor_id)" if cursor else ""
+
+
+def _search_postgres(db: Session, scope: Scope, q: str, limit: int, cursor) -> List[Dict[str, Any]]:
+    doc = pg_document(scope)
+    tsquery, bound = _pg_tsquery(scope, q)
+    if not bound:
+        return []
+    rank_sql = f"ts_rank({doc}, {tsquery})::float8"
+    sql = f"""
+        SELECT page.*, ts_headline('{scope.config}', page.body, {tsquery}, :headline_opts) AS snippet
+        FROM (
+            SELECT {scope.fields}, {scope.body} AS body, {rank_sql} AS rank
+            FROM {scope.table} t {scope.joins}
+            WHERE {doc} @@ {tsquery}{_keyset(rank_sql, cursor)}
+            ORDER BY rank DESC, t.id DESC
+            LIMIT :limit
+        ) page
+        ORDER BY page.rank DESC, page.id DESC
+    """
+    params = {
+        "q": bound,
+        "limit": limit,
+        "headline_opts": f"StartSel={_OPEN}, StopSel={_CLOSE}, MaxFragments=2, MaxWords=24, MinWords=8",
+    }
+    if cursor:
+        params.update(cursor_rank=cursor[0], cursor_id=cursor[1])
+    return [dict(r._mapping) for r in db.execute(text(sql), params)]
+
+
+def _has_fts5(db: Session, scope: Scope) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": f"{scope.table}_fts"},
+    ).first() is not None
+
+
+def _search_sqlite(db: Session, scope: Scope, q: str, limit: int, cursor) -> List[Dict[str, Any]]:
+    match = _fts5_query(scope, q)
+    if not match:
+        return []
+    fts = f"{scope.table}_fts"
+    # bm25() is lower-is-better; negate so both backends rank descending
+    rank_sql = f"-bm25({fts})"
+    sql = f"""
+        SELECT {scope.fields}, {rank_sql} AS rank,
+               snippet({fts}, -1, :open, :close, '…', 24) AS snippet
+        FROM {fts} f
+        JOIN {scope.table} t ON t.id = f.rowid {scope.joins}
+        WHERE {fts} MATCH :q{_keyset(rank_sql, cursor)}
+        ORDER BY rank DESC, t.id DESC
+        LIMIT :limit
+    """
+    params = {"q": match, "limit": limit, "open": _OPEN, "close": _CLOSE}
+    if cursor:
+        params.update(cursor_rank=cursor[0], cursor_id=cursor[1])
+    return [dict(r._mapping) for r in db.execute(text(sql), params)]
+
+
+def _search_like(db: Session, scope: Scope, q: str, limit: int, cursor) -> List[Dict[str, Any]]:
+    tokens = [t.lower() for t in re.findall(r"\w+", q)]
+    if not tokens:
+        return []
+    doc = " || ' ' || ".join(f"coalesce(t.{c}, '')" for c in scope.columns)
+    where = " AND ".join(f"lower({doc}) LIKE :t{i}" for i in range(len(tokens)))
+    sql = f"""
+        SELECT {scope.fields}, {scope.body} AS body, 0.0 AS rank
+        FROM {scope.table} t {scope.joins}
+        WHERE {where}{" AND t.id < :cursor_id" if cursor else ""}
+        ORDER BY t.id DESC
+        LIMIT :limit
+    """
+    params: Dict[str, Any] = {f"t{i}": f"%{t}%" for i, t in enumerate(tokens)}
+    params["limit"] = limit
+    if cursor:
+        params["cursor_id"] = cursor[1]
+    rows = [dict(r._mapping) for r in db.execute(text(sql), params)]
+    for row in rows:
+        row["snippet"] = _like_snippet(row.pop("body") or "", tokens)
+    return rows
+
+
+def search(
+    db: Session,
+    q: str,
+    scope: str = "answers",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Returns {"items": [{kind, id, interview_id, title, subtitle, snippet, rank}], "next_cursor"}.
+    Raises ValueError for an unknown scope or a malformed cursor.
+    """
+    s = SCOPES.get(scope)
+    if s is None:
+        raise ValueError(f"Unknown search scope: {scope}")
+    limit = max(1, min(limit, MAX_LIMIT))
+    after = decode_cursor(cursor) if cursor else None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        rows = _search_postgres(db, s, q, limit + 1, after)
+    elif dialect == "sqlite" and _has_fts5(db, s):
+        rows = _search_sqlite(db, s, q, limit + 1, after)
+    else:
+        rows = _search_like(db, s, q, limit + 1, after)
+
+    # One extra row tells us whether another page exists
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [
+        {
+            "kind": scope,
+            "id": r["id"],
+            "interview_id": r["interview_id"],
+            "title": r["title"],
+            "subtitle": r["subtitle"],
+            "snippet": highlight(r["snippet"]),
+            "rank": round(float(r["rank"] or 0.0), 6),
+        }
+        for r in rows
+    ]
+    next_cursor = encode_cursor(float(rows[-1]["rank"] or 0.0), rows[-1]["id"]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
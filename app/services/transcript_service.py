@@ -0,0 +1,142 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough OpenAI-style estimate: ~4 characters per token for English prose.
+# Good enough for budgeting; we only need to stay safely under the limit.
+CHARS_PER_TOKEN = 4
+
+MIN_ANSWER_TOKENS = 32
+TRUNCATION_MARKER = " […] "
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Keep the head and tail of an overlong answer (the setup and the outcome
+    are usually the informative parts) and drop the middle.
+    Returns (text, was_truncated).
+    """
+    text = (text or "").strip()
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text, False
+
+    keep = max(0, max_chars - len(TRUNCATION_MARKER))
+    head = text[: (keep * 2) // 3].rsplit(" ", 1)[0]
+    tail = text[len(text) - keep // 3 :].split(" ", 1)[-1]
+    return f"{head}{TRUNCATION_MARKER}{tail}", True
+
+
+def _group_by_spine(qa_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse follow-up rounds under the spine question they belong to.
+    Follow-ups are matched by parent_question_id, falling back to the
+    previous spine question when the id is missing.
+    """
+    groups: List[Dict[str, Any]] = []
+    by_question_id: Dict[Any, Dict[str, Any]] = {}
+
+    for qa in qa_list:
+        if qa.get("is_followup") and groups:
+            group = by_question_id.get(qa.get("parent_question_id")) or groups[-1]
+            group["followups"].append(qa)
+            continue
+
+        group = {"main": qa, "followups": []}
+        groups.append(group)
+        if qa.get("question_id") is not None:
+            by_question_id[qa["question_id"]] = group
+
+    return groups
+
+
+def _competency_averages(entries: List[Dict[str, Any]]) -> Dict[str, float]:
+    totals: Dict[str, List[float]] = {}
+    for e in entries:
+        for comp, val in (e.get("competency_scores") or {}).items():
+            if isinstance(val, (int, float)):
+                totals.setdefault(comp, []).append(float(val))
+    return {comp: round(sum(v) / len(v), 1) for comp, v in totals.items()}
+
+
+def _render_groups(
+    groups: List[Dict[str, Any]],
+    answer_tokens: int,
+    followup_tokens: Optional[int],
+) -> Tuple[str, int]:
+    """
+    followup_tokens=None drops follow-up Q/A text and keeps only their scores.
+    Returns (transcript, truncated_answer_count).
+    """
+    parts: List[str] = []
+    truncated = 0
+
+    for i, g in enumerate(groups, start=1):
+        main = g["main"]
+        answer, cut = truncate_to_tokens(main.get("answer") or "", answer_tokens)
+        truncated += int(cut)
+        lines = [f"Q{i}: {main.get('question') or ''}", f"A{i}: {answer}"]
+
+        if followup_tokens is not None:
+            for f in g["followups"]:
+                f_answer, cut = truncate_to_tokens(f.get("answer") or "", followup_tokens)
+                truncated += int(cut)
+                lines.append(f"  Follow-up {f.get('followup_round') or ''}: {f.get('question') or ''}")
+                lines.append(f"  Reply: {f_answer}")
+
+        entries = [main] + g["followups"]
+        scores = [e.get("score") for e in entries if e.get("score") is not None]
+        score_line = f"Scores: {', '.join(str(s) for s in scores) if scores else 'n/a'}"
+        comps = _competency_averages(entries)
+        if comps:
+            score_line += " | " + ", ".join(f"{k}={v}" for k, v in comps.items())
+        lines.append(score_line)
+
+        parts.append("\n".join(lines))
+
+    return "\n\n".join(parts), truncated
+
+
+def compact_transcript(
+    qa_list: List[Dict[str, Any]],
+    token_budget: int,
+    answer_max_tokens: int,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Render the Q/A list into a transcript that fits in token_budget.
+
+    Degrades in steps: cap answer length, halve the caps down to MIN_ANSWER_TOKENS,
+    drop follow-up text (scores are kept), and finally hard-truncate.
+    stats["answer_token_cap"] is the cap the returned text was rendered with.
+    """
+    groups = _group_by_spine(qa_list)
+    stats: Dict[str, Any] = {
+        "questions": len(groups),
+        "followups": sum(len(g["followups"]) for g in groups),
+        "followups_dropped": False,
+        "hard_truncated": False,
+    }
+
+    answer_tokens = max(MIN_ANSWER_TOKENS, answer_max_tokens)
+    while True:
+        text, truncated = _render_groups(groups, answer_tokens, max(MIN_ANSWER_TOKENS, answer_tokens // 2))
+        if estimate_tokens(text) <= token_budget or answer_tokens <= MIN_ANSWER_TOKENS:
+            break
+        answer_tokens = max(MIN_ANSWER_TOKENS, answer_tokens // 2)
+
+    if estimate_tokens(text) > token_budget:
+        text, truncated = _render_groups(groups, answer_tokens, None)
+        stats["followups_dropped"] = True
+
+    if estimate_tokens(text) > token_budget:
+        text = text[: max(0, token_budget) * CHARS_PER_TOKEN]
+        stats["hard_truncated"] = True
+
+    stats["answer_token_cap"] = answer_tokens
+    stats["truncated_answers"] = truncated
+    stats["transcript_tokens"] = estimate_tokens(text)
+    return text, stats
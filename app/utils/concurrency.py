@@ -0,0 +1,84 @@
+# app/utils/concurrency.py
+"""
+In-process coordination helpers for sync (threadpool) endpoints.
+These only coordinate threads within one worker; cross-worker safety
+still comes from database row locks.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Run fn once per key at a time. Callers that arrive with the same key while
+    a call is in flight wait for it and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, shared) where shared=True means another caller did the work."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result, False
+
+
+class KeyedLock:
+    """A lock per key, created on demand and dropped when nobody holds or waits on it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: Hashable):
+        with self._lock:
+            lock, refs = self._locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._locks[key] = (lock, refs + 1)
+
+        lock.acquire()
+        try:
+            yield
+        finally:
+            lock.release()
+            with self._lock:
+                lock, refs = self._locks[key]
+                if refs <= 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, refs - 1)
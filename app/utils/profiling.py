@@ -0,0 +1,163 @@
+# app/utils/profiling.py
+"""
+Lightweight per-request span tree.
+
+A trace is only active while the profiling middleware has started one for the
+current request, so `span(...)` is a cheap no-op everywhere else.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+MAX_STATEMENT_CHARS = 500
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "end", "children")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000.0, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "attrs": self.attrs,
+            "children": [c.to_dict(origin) for c in self.children],
+        }
+
+
+class Trace:
+    def __init__(self, name: str, **attrs: Any):
+        self.root = Span(name, attrs)
+        self._stack: List[Span] = [self.root]
+        self.finished = False
+
+    def begin(self, name: str, **attrs: Any) -> Span:
+        s = Span(name, attrs)
+        self._stack[-1].children.append(s)
+        self._stack.append(s)
+        return s
+
+    def finish(self, s: Span) -> None:
+        s.end = time.perf_counter()
+        if s in self._stack:
+            # Pop the span and anything left open underneath it
+            while self._stack and self._stack[-1] is not s:
+                self._stack.pop()
+            if len(self._stack) > 1:
+                self._stack.pop()
+
+    def close(self) -> None:
+        self.root.end = time.perf_counter()
+        self.finished = True
+
+    def totals_by_category(self) -> Dict[str, float]:
+        """
+        Sum of top-most span durations per category ("db", "llm", "email", ...).
+        Nested spans of the same category are not double counted.
+        """
+        totals: Dict[str, float] = {}
+
+        def walk(s: Span, seen: frozenset) -> None:
+            for c in s.children:
+                cat = c.name.split(".", 1)[0]
+                if cat not in seen:
+                    totals[cat] = totals.get(cat, 0.0) + c.duration_ms
+                walk(c, seen | {cat})
+
+        walk(self.root, frozenset())
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace": self.root.to_dict(self.root.start),
+            "totals_ms": {k: round(v, 3) for k, v in self.totals_by_category().items()},
+        }
+
+
+def start_trace(name: str, **attrs: Any):
+    trace = Trace(name, **attrs)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(trace: Trace, token) -> None:
+    trace.close()
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    trace = _current_trace.get()
+    if trace is None or trace.finished:
+        return None
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """
+    Record a child span on the active request trace (if any).
+    Use as: with span("llm.score_answer", model=...): ...
+    """
+    trace = current_trace()
+    if trace is None:
+        yield None
+        return
+
+    s = trace.begin(name, **attrs)
+    try:
+        yield s
+    finally:
+        trace.finish(s)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach cursor listeners so every SQL statement becomes a "db.query" span.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        trace = current_trace()
+        if trace is None:
+            return
+        s = trace.begin(
+            "db.query",
+            statement=statement[:MAX_STATEMENT_CHARS],
+            executemany=bool(executemany),
+        )
+        conn.info.setdefault("_profiling_spans", []).append((trace, s))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_profiling_spans")
+        if stack:
+            trace, s = stack.pop()
+            trace.finish(s)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        stack = conn.info.get("_profiling_spans") if conn is not None else None
+        if stack:
+            trace, s = stack.pop()
+            s.attrs["error"] = True
+            trace.finish(s)
@@ -0,0 +1,58 @@
+# app/utils/responses.py
+"""
+Response helpers for hot paths.
+
+FastAPI validates whatever an endpoint returns against its response_model
+before serializing it. Endpoints that already hold a validated model (or can
+validate ORM rows once through a prebuilt TypeAdapter) return a ready-made
+Response instead, which skips that second validation. Keep `response_model`
+on those routes for the OpenAPI docs.
+"""
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, for endpoints returning plain dicts/lists."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        status_code=status_code,
+    )
+
+
+def adapter_response(adapter: TypeAdapter, data: Any, status_code: int = 200) -> Response:
+    """Validate ORM objects once (from_attributes) and dump straight to JSON bytes."""
+    value = adapter.validate_python(data, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(value),
+        media_type="application/json",
+        status_code=status_code,
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for this header)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def etag_response(etag: str, cache_control: str, body: Optional[bytes] = None) -> Response:
+    """200 with `body`, or 304 Not Modified when body is None."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,67 @@
+"""
+Shared setup for the benchmark scripts.
+
+Each script runs against a throwaway SQLite database migrated on first use,
+or against BENCH_DATABASE_URL when set (use a scratch database: scripts
+insert their own data). Run them from the repository root:
+
+    python -m benchmarks.bench_serialization
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Settings are read at import time, so configure the environment before any app import
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='ai-interviewer-bench-'), 'bench.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("ADMIN_API_KEY", "bench-admin-key")
+os.environ.setdefault("ADMIN_EMAILS", "bench-admin@example.com")
+os.environ.setdefault("PROFILING_ENABLED", "false")
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+ADMIN_HEADERS = {"X-API-Key": os.environ["ADMIN_API_KEY"]}
+
+
+def migrate() -> None:
+    from app import migrations
+    from app.database import engine
+
+    migrations.upgrade(engine)
+
+
+def admin_bearer(client) -> dict:
+    """Bearer headers for an ADMIN_EMAILS user (registered on first call)."""
+    email = os.environ["ADMIN_EMAILS"].split(",")[0].strip()
+    body = {"name": "Bench Admin", "email": email, "password": "bench-password"}
+    r = client.post("/auth/register", json=body)
+    if r.status_code != 200:
+        r = client.post("/auth/login", json={"email": email, "password": body["password"]})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> List[float]:
+    """Milliseconds per call for `repeat` runs of `number` calls each (after one warm-up call)."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000.0 / number)
+    return samples
+
+
+def report(label: str, samples: List[float], unit: str = "ms") -> None:
+    print(f"{label:<48} median {statistics.median(samples):9.3f} {unit}   min {min(samples):9.3f} {unit}")
@@ -0,0 +1,95 @@
+"""
+Heuristic answer analyzer micro-benchmark (user-041).
+
+Per-answer cost of the submit pre-filter (decide_followup + too-short check)
+with the previous helpers, which each re-stripped, re-lowercased and
+re-split the text, against the single-pass analyze_answer().
+
+    python -m benchmarks.bench_answer_analyzer [--answers 20000]
+"""
+import argparse
+import random
+import re
+
+from benchmarks._common import measure, report
+
+VOCAB = (
+    "i my we team the service migration latency results impact improved reduced "
+    "increased optimized 40% 2 3.5 p99 rollout deploy database queue cache"
+).split()
+
+
+# Previous helpers, as they were before the analyzer
+def _old_has_number(text):
+    return bool(re.search(r"\b\d+(\.\d+)?\b", text))
+
+
+def _old_is_too_short(text):
+    t = text.strip()
+    return len(t) < 60 or len(t.split()) < 15
+
+
+def _old_missing_ownership(text):
+    lowered = text.lower()
+    return (" i " not in f" {lowered} ") and (" my " not in f" {lowered} ")
+
+
+def _old_score_answer(answer):
+    a = answer.strip()
+    if len(a) < 40:
+        return 1
+    score = 2
+    if len(a.split()) >= 30:
+        score += 1
+    if _old_has_number(a):
+        score += 1
+    if any(k in a.lower() for k in ["result", "impact", "improved", "reduced", "increased", "optimized"]):
+        score += 1
+    return max(1, min(5, score))
+
+
+def _old_prefilter(text):
+    score = _old_score_answer(text)
+    if score < 4:
+        _old_is_too_short(text) or _old_missing_ownership(text) or _old_has_number(text)
+    return _old_is_too_short(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=20_000)
+    parser.add_argument("--max-words", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.services.adaptive_interview_service import analyze_answer, decide_followup
+
+    rng = random.Random(41)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, args.max_words))) for _ in range(args.answers)]
+
+    def old_path():
+        for t in texts:
+            _old_prefilter(t)
+
+    def new_path():
+        for t in texts:
+            f = analyze_answer(t)
+            decide_followup(competency=None, answer_text=t, followup_round=0, max_followups=2, features=f)
+            f.too_short
+
+    def analyze_only():
+        for t in texts:
+            analyze_answer(t)
+
+    per_answer = 1000.0 / args.answers  # ms per batch -> us per answer
+    print(f"{args.answers} answers of 1-{args.max_words} words (per answer)")
+    for label, fn in (
+        ("previous helpers (score + probes + too_short)", old_path),
+        ("analyze_answer + decide_followup(features=)", new_path),
+        ("analyze_answer alone", analyze_only),
+    ):
+        report(label, [ms * per_answer for ms in measure(fn, repeat=args.repeat)], unit="us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Typing signals under synthetic keystroke load (user-040).
+
+Generates keystroke logs with lognormal inter-key gaps, a few pauses and an
+optional scripted burst, then times analyze_answer_meta() per log size and
+stream format. It also times parsing the request body into AnswerSubmit,
+which is the other cost a large answer_meta adds to a submit.
+
+    python -m benchmarks.bench_answer_signals [--sizes 1000,10000,100000,200000]
+"""
+import argparse
+import json
+
+from benchmarks._common import measure, report
+
+
+def keystroke_log(n: int, seed: int, burst: bool = False):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    gaps = rng.lognormal(mean=np.log(180.0), sigma=0.6, size=n)
+    gaps[rng.random(n) < 0.01] += 4000.0  # pauses
+    if burst:
+        start = n // 2
+        gaps[start:start + min(500, n // 4)] = 8.0  # scripted input
+    return np.cumsum(gaps).round(1).tolist()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000,200000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app import schemas
+    from app.services.answer_signals_service import analyze_answer_meta
+
+    answer = "I led the migration of our billing service to Postgres. " * 20
+    for n in (int(s) for s in args.sizes.split(",")):
+        times = keystroke_log(n, seed=n, burst=True)
+        pastes = [{"t": times[len(times) // 3], "length": 300}]
+        formats = {
+            "numbers": {"keystrokes": times, "pastes": pastes},
+            "dicts": {"keystrokes": [{"t": t} for t in times], "pastes": pastes},
+        }
+        print(f"{n} keystrokes")
+        for name, meta in formats.items():
+            result = analyze_answer_meta(answer, meta)
+            report(f"  analyze_answer_meta ({name})", measure(lambda: analyze_answer_meta(answer, meta), repeat=args.repeat))
+            body = json.dumps({"answer_text": answer, "answer_meta": meta})
+            report(
+                f"  parse {len(body) // 1024} KiB body into AnswerSubmit ({name})",
+                measure(lambda: schemas.AnswerSubmit.model_validate_json(body), repeat=args.repeat),
+            )
+        print(f"  -> score {result['score']}, signals {[s['code'] for s in result['reasons']['signals']]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cohort integrity analytics (user-038): compute_cohort_integrity end to end
+(cohort query, fetch into arrays, scoring, percentiles and outliers), plus
+the NumPy scoring core on its own for comparison.
+
+    python -m benchmarks.bench_integrity_cohort [--interviews 50000] [--events 1000000]
+"""
+import argparse
+import random
+import secrets
+from datetime import datetime, timezone
+
+from benchmarks._common import measure, migrate, report
+
+EVENT_TYPES = ["TAB_HIDDEN", "WINDOW_BLUR", "PASTE", "COPY", "CUT", "FULLSCREEN_EXIT", "MOUSE_LEAVE"]
+
+
+def seed(db, n_interviews: int, n_events: int) -> int:
+    from sqlalchemy import insert
+
+    from app import models
+
+    job = models.Job(title="Bench Engineer", description="Benchmark job.", competencies=[])
+    db.add(job)
+    db.flush()
+
+    rng = random.Random(38)
+    db.execute(
+        insert(models.Interview),
+        [
+            {
+                "job_id": job.id,
+                "candidate_name": f"Candidate {i}",
+                "candidate_email": f"c{i}@example.com",
+                "invite_token": secrets.token_urlsafe(24),
+            }
+            for i in range(n_interviews)
+        ],
+    )
+    ids = [row[0] for row in db.query(models.Interview.id).filter(models.Interview.job_id == job.id)]
+    now = datetime.now(timezone.utc)
+    chunk = 50_000
+    for start in range(0, n_events, chunk):
+        db.execute(
+            insert(models.InterviewProctorEvent),
+            [
+                {"interview_id": rng.choice(ids), "created_at": now, "event_type": rng.choice(EVENT_TYPES), "severity": 1}
+                for _ in range(min(chunk, n_events - start))
+            ],
+        )
+    db.commit()
+    return job.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=50_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    migrate()
+    import numpy as np
+
+    from app.database import SessionLocal
+    from app.services.integrity_analytics_service import _load_cohort, compute_cohort_integrity, score_event_arrays
+    from app.services.proctoring_rules import get_ruleset
+
+    with SessionLocal() as db:
+        job_id = seed(db, args.interviews, args.events)
+        ruleset = get_ruleset("v1")
+        print(f"{args.interviews} interviews, {args.events} events")
+
+        report("compute_cohort_integrity (whole function)", measure(lambda: compute_cohort_integrity(db, job_id=job_id), repeat=args.repeat))
+        report("  _load_cohort (query + fetch into arrays)", measure(lambda: _load_cohort(db, job_id, None, ruleset.event_types), repeat=args.repeat))
+
+        ids, rows = _load_cohort(db, job_id, None, ruleset.event_types)
+        idx = np.searchsorted(ids, rows["interview_id"])
+        report(
+            "  score_event_arrays (NumPy core)",
+            measure(lambda: score_event_arrays(idx, rows["type"], rows["n"], len(ids), ruleset), repeat=args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
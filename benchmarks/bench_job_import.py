@@ -0,0 +1,79 @@
+"""
+Bulk job import from CSV (user-047): parsing, the single-transaction
+import_jobs() write, the whole POST /admin/jobs/import request, and the
+per-row ORM path job creation used before (one job, its questions and a
+commit at a time) for comparison.
+
+    python -m benchmarks.bench_job_import [--jobs 50] [--questions 100]
+"""
+import argparse
+import csv
+import io
+
+from benchmarks._common import admin_bearer, measure, migrate, report
+
+
+def make_csv(n_jobs: int, n_questions: int) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["title", "description", "competencies", "question_text", "question_competency", "order_index"])
+    for j in range(n_jobs):
+        for q in range(n_questions):
+            writer.writerow(
+                [f"Engineer {j}", f"Build and run service {j}.", "python;sql", f"Question {q} for job {j}?", "python", q]
+            )
+    return out.getvalue().encode("utf-8")
+
+
+def per_row_import(db, jobs) -> None:
+    from app import models
+
+    for job_in in jobs:
+        job = models.Job(title=job_in.title, description=job_in.description, competencies=job_in.competencies)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        for q in job_in.questions:
+            db.add(models.JobQuestion(job_id=job.id, text=q.text, competency=q.competency, order_index=q.order_index))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    migrate()
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.services import job_service
+
+    content = make_csv(args.jobs, args.questions)
+    jobs = job_service.parse_import(content, "csv")
+    print(f"{args.jobs} jobs x {args.questions} questions ({len(content) // 1024} KiB CSV)")
+
+    report("parse_import (csv -> JobCreate)", measure(lambda: job_service.parse_import(content, "csv"), repeat=args.repeat))
+    with SessionLocal() as db:
+        report("import_jobs (one transaction)", measure(lambda: job_service.import_jobs(db, jobs), repeat=args.repeat))
+        report("per-row ORM inserts and commits", measure(lambda: per_row_import(db, jobs), repeat=args.repeat))
+
+    with TestClient(app) as client:
+        headers = admin_bearer(client)
+
+        def upload():
+            r = client.post(
+                "/admin/jobs/import",
+                headers=headers,
+                files={"file": ("jobs.csv", content, "text/csv")},
+            )
+            r.raise_for_status()
+
+        report("POST /admin/jobs/import (whole request)", measure(upload, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
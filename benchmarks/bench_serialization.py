@@ -0,0 +1,150 @@
+"""
+Per-endpoint response serialization (user-033).
+
+For the list endpoints that return ORM rows, compares the path FastAPI takes
+for a plain `return rows` with response_model (validate, dump to Python,
+json.dumps) against the adapter_response path (validate once, dump_json).
+Then times the whole request for each hot GET endpoint through TestClient,
+so the serialization share can be read against query and routing cost.
+
+    python -m benchmarks.bench_serialization [--jobs 50] [--interviews 3000]
+"""
+import argparse
+import json
+import secrets
+from datetime import datetime, timezone
+from typing import List
+
+from benchmarks._common import ADMIN_HEADERS, admin_bearer, measure, migrate, report
+
+CANDIDATE_EMAIL = "bench-candidate@example.com"
+
+
+def seed(db, n_jobs: int, n_interviews: int, n_events: int) -> int:
+    from sqlalchemy import insert
+
+    from app import models
+
+    for j in range(n_jobs):
+        job = models.Job(title=f"Bench Engineer {j}", description="Benchmark job.", competencies=["python", "sql"])
+        job.questions = [models.JobQuestion(text=f"Question {i}?", order_index=i) for i in range(5)]
+        db.add(job)
+    db.flush()
+
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(models.Interview),
+        [
+            {
+                "job_id": job.id,
+                "candidate_name": f"Candidate {i}",
+                "candidate_email": CANDIDATE_EMAIL if i % 15 == 0 else f"c{i}@example.com",
+                "invite_token": secrets.token_urlsafe(24),
+                "status": models.InterviewStatus.COMPLETED,
+                "started_at": now,
+                "completed_at": now,
+                "overall_score": i % 5 + 1,
+                "transcript": "Q: ...\nA: ..." * 20,
+            }
+            for i in range(n_interviews)
+        ],
+    )
+    interview_id = db.query(models.Interview.id).order_by(models.Interview.id.desc()).limit(1).scalar()
+    db.execute(
+        insert(models.InterviewProctorEvent),
+        [
+            {"interview_id": interview_id, "created_at": now, "event_type": "TAB_HIDDEN", "severity": 2, "payload": {"i": i}}
+            for i in range(n_events)
+        ],
+    )
+    db.commit()
+    return interview_id
+
+
+def compare_serialization(db, repeat: int) -> None:
+    from pydantic import TypeAdapter
+    from sqlalchemy import desc
+    from sqlalchemy.orm import selectinload
+
+    from app import models, schemas
+
+    cases = [
+        (
+            "GET /jobs/ (List[JobOut])",
+            TypeAdapter(List[schemas.JobOut]),
+            db.query(models.Job).options(selectinload(models.Job.questions)).all(),
+        ),
+        (
+            "GET /admin/interviews (List[AdminInterviewOut])",
+            TypeAdapter(List[schemas.AdminInterviewOut]),
+            db.query(models.Interview).order_by(models.Interview.id.desc()).all(),
+        ),
+        (
+            "GET /admin/interviews/{id}/proctoring",
+            TypeAdapter(List[schemas.ProctorEventOut]),
+            db.query(models.InterviewProctorEvent).order_by(desc(models.InterviewProctorEvent.created_at)).limit(500).all(),
+        ),
+    ]
+
+    print("Serialization only (rows already loaded)")
+    for label, adapter, rows in cases:
+        def default_path():
+            value = adapter.validate_python(rows, from_attributes=True)
+            return json.dumps(adapter.dump_python(value, mode="json")).encode("utf-8")
+
+        def adapter_path():
+            return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+        print(f"  {label} ({len(rows)} rows)")
+        report("    validate + dump_python + json.dumps", measure(default_path, repeat=repeat))
+        report("    validate + dump_json (adapter_response)", measure(adapter_path, repeat=repeat))
+
+
+def time_endpoints(client, interview_id: int, repeat: int) -> None:
+    admin = admin_bearer(client)
+    r = client.post("/auth/register", json={"name": "Bench Candidate", "email": CANDIDATE_EMAIL, "password": "bench-password"})
+    candidate = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    job_id = client.get("/jobs/", headers=ADMIN_HEADERS).json()[0]["id"]
+
+    endpoints = [
+        ("GET /jobs/", "/jobs/", ADMIN_HEADERS),
+        ("GET /jobs/{id}", f"/jobs/{job_id}", ADMIN_HEADERS),
+        ("GET /admin/interviews", "/admin/interviews", admin),
+        ("GET /admin/interviews/{id}/proctoring", f"/admin/interviews/{interview_id}/proctoring", admin),
+        ("GET /candidate/interviews", "/candidate/interviews", candidate),
+        ("GET /admin/llm/metrics", "/admin/llm/metrics", admin),
+    ]
+
+    print("Whole request through TestClient")
+    for label, path, headers in endpoints:
+        def call():
+            r = client.get(path, headers=headers)
+            r.raise_for_status()
+
+        report(f"  {label}", measure(call, repeat=repeat, number=3))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--interviews", type=int, default=3000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    migrate()
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal
+    from app.main import app
+
+    with SessionLocal() as db:
+        interview_id = seed(db, args.jobs, args.interviews, args.events)
+        compare_serialization(db, args.repeat)
+
+    with TestClient(app) as client:
+        time_endpoints(client, interview_id, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Answer similarity index (user-044): embedding, cold index build from the
+database (what the first /answer for a question pays on a worker), and
+queries against indexes of growing size.
+
+    python -m benchmarks.bench_similarity [--sizes 100,1000,5000]
+"""
+import argparse
+import random
+import secrets
+
+from benchmarks._common import measure, migrate, report
+
+WORDS = (
+    "migration postgres billing rollout latency incident pager dashboard queue cache "
+    "retry backoff owner team plan shim dual write cutover rollback metrics p99 reduced "
+    "improved customers weeks million requests service"
+).split()
+
+
+def _answer(rng: random.Random) -> str:
+    return "I " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + "."
+
+
+def seed(db, n: int) -> int:
+    from sqlalchemy import insert
+
+    from app import models
+
+    rng = random.Random(n)
+    job = models.Job(title="Bench Engineer", description="Benchmark job.", competencies=["python"])
+    job.questions = [models.JobQuestion(text="Tell me about a migration you led.", order_index=0)]
+    db.add(job)
+    db.flush()
+    question_id = job.questions[0].id
+
+    db.execute(
+        insert(models.Interview),
+        [
+            {"job_id": job.id, "candidate_name": f"C{i}", "candidate_email": f"c{i}@example.com", "invite_token": secrets.token_urlsafe(24)}
+            for i in range(n)
+        ],
+    )
+    ids = [r[0] for r in db.query(models.Interview.id).filter(models.Interview.job_id == job.id)]
+    db.execute(
+        insert(models.InterviewAnswer),
+        [
+            {
+                "interview_id": iv,
+                "question_id": question_id,
+                "question_text": "Tell me about a migration you led.",
+                "answer_text": _answer(rng),
+                "score": rng.randint(1, 5),
+                "competency_scores": {"python": 3},
+                "ai_feedback": "ok",
+            }
+            for iv in ids
+        ],
+    )
+    db.commit()
+    return question_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    migrate()
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.services import answer_similarity_service as similarity
+
+    rng = random.Random(44)
+    text = _answer(rng)
+    report("embed (one answer)", measure(lambda: similarity.embed(text), repeat=args.repeat, number=200))
+
+    with SessionLocal() as db:
+        for n in (int(s) for s in args.sizes.split(",")):
+            settings.SIMILARITY_INDEX_CAPACITY = n
+            question_id = seed(db, n)
+            print(f"{n} scored answers")
+            report("  cold build from the database (_build)", measure(lambda: similarity._build(db, question_id), repeat=args.repeat))
+            index = similarity._build(db, question_id)
+            query = similarity.embed(_answer(rng))
+            report("  best() over the index", measure(lambda: index.best(query, exclude_interview_id=-1), repeat=args.repeat, number=50))
+            own = index.entries[0]["interview_id"]
+            report("  best() excluding an interview", measure(lambda: index.best(query, exclude_interview_id=own), repeat=args.repeat, number=50))
+
+
+if __name__ == "__main__":
+    main()
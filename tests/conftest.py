@@ -0,0 +1,173 @@
+"""
+Shared fixtures: a throwaway SQLite database migrated on app startup, the app
+behind a TestClient with the OpenAI client replaced by FakeLLM, and helpers to
+create jobs and interviews or capture the SQL a request runs.
+"""
+import json
+import os
+import sys
+import tempfile
+import types
+
+# Settings are read at import time, so configure the environment before any app import
+TMP_DIR = tempfile.mkdtemp(prefix="ai-interviewer-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("ADMIN_API_KEY", "test-admin-key")
+os.environ.setdefault("AUTO_MIGRATE", "true")
+os.environ.setdefault("ADMIN_EMAILS", "admin@example.com")
+os.environ.setdefault("PROFILING_DIR", os.path.join(TMP_DIR, "profiles"))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+ADMIN_HEADERS = {"X-API-Key": os.environ["ADMIN_API_KEY"]}
+
+GOOD_ANSWER = (
+    "I led the migration of our billing service to Postgres. I owned the rollout plan, "
+    "wrote the dual-write shim and cut p99 latency by 40% for 2 million requests a day."
+)
+
+
+class FakeLLM:
+    """
+    Stands in for the OpenAI client. Records every call; scoring calls return
+    `score` and follow-up calls a fixed question. Set `error` to an exception
+    to make every call raise it.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.score = 4
+        self.error = None
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def reset(self):
+        self.calls.clear()
+        self.score = 4
+        self.error = None
+
+    def with_options(self, **kwargs):
+        return self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        text = json.dumps(kwargs["messages"])
+        if "followup_question" in text:
+            out = {"followup_question": "Can you walk me through the rollout?"}
+        elif "recommendation" in text:
+            out = {"summary": "Solid candidate.", "overall_score": self.score, "recommendation": "hire"}
+        else:
+            out = {"overall_score": self.score, "competency_scores": {"python": self.score}, "feedback": "Clear and specific."}
+        message = types.SimpleNamespace(content=json.dumps(out))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+@pytest.fixture(scope="session")
+def _fake_llm():
+    from app.services import llm_service
+
+    fake = FakeLLM()
+    llm_service._client = fake
+    return fake
+
+
+@pytest.fixture
+def fake_llm(_fake_llm):
+    _fake_llm.reset()
+    yield _fake_llm
+    _fake_llm.reset()
+
+
+@pytest.fixture(scope="session")
+def client(_fake_llm):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def admin_auth(client):
+    """Bearer headers for an admin user (ADMIN_EMAILS), for the /admin routes."""
+    r = client.post("/auth/register", json={"name": "Admin", "email": "admin@example.com", "password": "secret1"})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def create_job(client, questions=3, **fields):
+    payload = {
+        "title": "Backend Engineer",
+        "description": "Build and run our APIs.",
+        "competencies": ["python"],
+        "questions": [
+            {"text": text, "order_index": i}
+            for i, text in enumerate(
+                [
+                    "Tell me about a migration you led.",
+                    "How do you handle incidents?",
+                    "Describe a design trade-off you made.",
+                ][:questions]
+            )
+        ],
+        **fields,
+    }
+    r = client.post("/jobs/", headers=ADMIN_HEADERS, json=payload)
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+
+def create_interview(client, job_id, name="Test Candidate", email="candidate@example.com"):
+    r = client.post("/interviews/", json={"job_id": job_id, "candidate_name": name, "candidate_email": email})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture
+def job_id(client):
+    return create_job(client)
+
+
+@pytest.fixture
+def interview(client, job_id):
+    return create_interview(client, job_id)
+
+
+@pytest.fixture
+def started(client, interview):
+    r = client.post(f"/interviews/start/{interview['invite_token']}")
+    assert r.status_code == 200, r.text
+    return interview
+
+
+@pytest.fixture
+def sql_statements():
+    """Every SQL statement sent to the primary engine while the test runs."""
+    from app.database import engine
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
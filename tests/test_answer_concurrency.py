@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.routers import interviews as interviews_router
+from conftest import GOOD_ANSWER
+
+
+@pytest.fixture(autouse=True)
+def _no_reuse(monkeypatch):
+    monkeypatch.setattr(settings, "SIMILARITY_ENABLED", False)
+
+
+class _SignallingEvent(threading.Event):
+    """Sets `waiting` as soon as somebody waits on it."""
+
+    def __init__(self, waiting):
+        super().__init__()
+        self.waiting = waiting
+
+    def wait(self, timeout=None):
+        self.waiting.set()
+        return super().wait(timeout)
+
+
+def test_duplicate_submit_joins_the_in_flight_one(client, started, fake_llm, monkeypatch):
+    flights = interviews_router._answer_flights
+    real_process = interviews_router._process_answer
+    follower_waiting = threading.Event()
+
+    def process_once_follower_waits(db, interview_id, payload, key):
+        # Leader: let the duplicate request join the flight before doing the work
+        (call,) = flights._calls.values()
+        call.event = _SignallingEvent(follower_waiting)
+        follower.start()
+        assert follower_waiting.wait(5)
+        return real_process(db, interview_id, payload, key)
+
+    responses = {}
+
+    def submit(name):
+        responses[name] = client.post(f"/interviews/{started['id']}/answer", json={"answer_text": GOOD_ANSWER})
+
+    follower = threading.Thread(target=submit, args=("follower",))
+
+    monkeypatch.setattr(interviews_router, "_process_answer", process_once_follower_waits)
+    calls = len(fake_llm.calls)
+    submit("leader")
+    follower.join(5)
+
+    first, duplicate = responses["leader"], responses["follower"]
+    assert first.status_code == duplicate.status_code == 200
+    assert duplicate.json() == first.json()
+    assert duplicate.headers["Idempotent-Replayed"] == "true"
+    assert len(fake_llm.calls) == calls + 1
+    with SessionLocal() as s:
+        assert s.query(models.InterviewAnswer).filter_by(interview_id=started["id"]).count() == 1
+
+
+def test_interview_moved_on_during_scoring_is_409(client, started, fake_llm, monkeypatch):
+    real_create = fake_llm.create
+
+    def create_while_another_request_advances(**kwargs):
+        # The read transaction is closed while the LLM runs, so another request can commit
+        with SessionLocal() as other:
+            other.execute(
+                models.Interview.__table__.update()
+                .where(models.Interview.id == started["id"])
+                .values(current_question_index=1)
+            )
+            other.commit()
+        return real_create(**kwargs)
+
+    monkeypatch.setattr(fake_llm.chat.completions, "create", create_while_another_request_advances)
+    r = client.post(f"/interviews/{started['id']}/answer", json={"answer_text": GOOD_ANSWER})
+
+    assert r.status_code == 409, r.text
+    with SessionLocal() as s:
+        assert s.query(models.InterviewAnswer).filter_by(interview_id=started["id"]).count() == 0
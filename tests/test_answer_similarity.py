@@ -0,0 +1,90 @@
+import numpy as np
+
+from app import models
+from app.services import answer_similarity_service as similarity
+from app.services.rescoring_service import run_rescore_job
+from conftest import GOOD_ANSWER, create_interview, create_job
+
+
+def _unit(v):
+    v = np.asarray(v, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def _entry(answer_id, interview_id):
+    return {"answer_id": answer_id, "interview_id": interview_id, "overall_score": 4, "competency_scores": {}, "feedback": ""}
+
+
+# ----------------------------
+# QuestionIndex
+# ----------------------------
+def test_best_skips_every_row_of_the_same_interview():
+    index = similarity.QuestionIndex(capacity=64, dim=4, initial=2)
+    # More closer rows from the candidate's own interview than any fixed look-ahead
+    for i in range(20):
+        index.add(_unit([1.0, 0.001 * i, 0, 0]), _entry(i, interview_id=1))
+    index.add(_unit([1.0, 0.5, 0, 0]), _entry(100, interview_id=2))
+
+    match = index.best(_unit([1, 0, 0, 0]), exclude_interview_id=1)
+
+    assert match["answer_id"] == 100
+    assert index.best(_unit([1, 0, 0, 0]))["interview_id"] == 1
+
+
+def test_best_is_none_when_only_the_same_interview_answered():
+    index = similarity.QuestionIndex(capacity=8, dim=4)
+    index.add(_unit([1, 0, 0, 0]), _entry(1, interview_id=7))
+
+    assert index.best(_unit([1, 0, 0, 0]), exclude_interview_id=7) is None
+
+
+def test_ring_keeps_interview_ids_aligned_after_wraparound():
+    index = similarity.QuestionIndex(capacity=3, dim=4, initial=1)
+    for i in range(5):
+        index.add(_unit([1, i, 0, 0]), _entry(i, interview_id=i))
+
+    assert [e["answer_id"] for e in index.entries] == [3, 4, 2]
+    assert index.interview_ids.tolist() == [3, 4, 2]
+    assert index.best(_unit([1, 4, 0, 0]), exclude_interview_id=4)["answer_id"] == 3
+
+
+# ----------------------------
+# Reuse and invalidation
+# ----------------------------
+def _first_question_id(db, job_id):
+    return (
+        db.query(models.JobQuestion.id)
+        .filter_by(job_id=job_id)
+        .order_by(models.JobQuestion.order_index)
+        .limit(1)
+        .scalar()
+    )
+
+
+def _answer(client, interview):
+    client.post(f"/interviews/start/{interview['invite_token']}")
+    r = client.post(f"/interviews/{interview['id']}/answer", json={"answer_text": GOOD_ANSWER})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_rescore_drops_the_index_so_reuse_sees_new_scores(client, db, fake_llm):
+    job_id = create_job(client)
+    question_id = _first_question_id(db, job_id)
+    first = create_interview(client, job_id, email="first@example.com")
+    assert _answer(client, first)["score"] == 4
+    assert question_id in similarity._indexes
+
+    fake_llm.score = 5
+    rescore = models.RescoreJob(job_id=job_id)
+    db.add(rescore)
+    db.commit()
+    run_rescore_job(rescore.id)
+    assert question_id not in similarity._indexes
+
+    calls = len(fake_llm.calls)
+    second = _answer(client, create_interview(client, job_id, email="second@example.com"))
+
+    # Scored from the rebuilt index: the re-scored 5, no LLM call
+    assert second["score"] == 5
+    assert len(fake_llm.calls) == calls
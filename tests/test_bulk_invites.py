@@ -0,0 +1,155 @@
+import types
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.services import notification_service
+from conftest import create_interview, create_job
+
+
+class RecordingEmailService:
+    def __init__(self):
+        self.batches = []
+
+    def send_batch(self, recipients, subject, html_content):
+        self.batches.append(recipients)
+        return len(recipients)
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Batches handed to the email provider, and the pauses taken between them."""
+    service = RecordingEmailService()
+    service.sleeps = []
+    monkeypatch.setattr(notification_service, "get_email_service", lambda: service)
+    monkeypatch.setattr(notification_service, "time", types.SimpleNamespace(sleep=service.sleeps.append))
+    return service
+
+
+def _bulk(client, admin_auth, job_id, candidates, **fields):
+    r = client.post(
+        "/admin/interviews/bulk",
+        headers=admin_auth,
+        json={"job_id": job_id, "candidates": candidates, **fields},
+    )
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+# ----------------------------
+# Creating interviews
+# ----------------------------
+def test_bulk_invite_reports_every_row_in_order(client, admin_auth, db, outbox):
+    job_id = create_job(client)
+    existing = create_interview(client, job_id, email="taken@example.com")
+    r = client.post("/auth/register", json={"name": "Has Account", "email": "member@example.com", "password": "secret1"})
+    assert r.status_code == 200, r.text
+
+    out = _bulk(
+        client,
+        admin_auth,
+        job_id,
+        [
+            {"candidate_name": "Ada", "candidate_email": "ada@example.com"},
+            {"candidate_email": "not-an-email"},
+            {"candidate_email": "ADA@example.com"},
+            {"candidate_email": "taken@example.com"},
+            {"candidate_email": "member@example.com"},
+        ],
+        send_emails=False,
+    )
+
+    assert (out["created"], out["skipped"], out["failed"], out["emails_queued"]) == (2, 2, 1, 0)
+    assert [r["status"] for r in out["results"]] == ["created", "error", "duplicate", "exists", "created"]
+    assert out["results"][3]["interview_id"] == existing["id"]
+    assert out["results"][4]["candidate_name"] == "member"
+    assert outbox.batches == []
+
+    db.expire_all()
+    ada = db.get(models.Interview, out["results"][0]["interview_id"])
+    member = db.get(models.Interview, out["results"][4]["interview_id"])
+    assert (ada.candidate_name, ada.invite_token) == ("Ada", out["results"][0]["invite_token"])
+    assert ada.candidate_user_id is None
+    # candidate_user_id is a String column in the baseline schema
+    assert member.candidate_user_id == str(db.query(models.User.id).filter_by(email="member@example.com").scalar())
+
+
+def test_skip_existing_false_creates_a_second_interview(client, admin_auth):
+    job_id = create_job(client)
+    create_interview(client, job_id, email="again@example.com")
+
+    out = _bulk(client, admin_auth, job_id, [{"candidate_email": "again@example.com"}], send_emails=False, skip_existing=False)
+
+    assert out["created"] == 1
+
+
+def test_too_many_rows_is_a_400(client, admin_auth, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INVITE_MAX_ROWS", 2)
+    job_id = create_job(client)
+    candidates = [{"candidate_email": f"c{i}@example.com"} for i in range(3)]
+
+    r = client.post("/admin/interviews/bulk", headers=admin_auth, json={"job_id": job_id, "candidates": candidates})
+
+    assert r.status_code == 400
+
+
+def test_csv_upload(client, admin_auth, outbox):
+    job_id = create_job(client)
+    csv_bytes = "﻿Name,Email\nGrace,grace@example.com\n,linus@example.com\n".encode("utf-8")
+
+    r = client.post(
+        "/admin/interviews/bulk/csv",
+        headers=admin_auth,
+        data={"job_id": str(job_id), "send_emails": "false"},
+        files={"file": ("invites.csv", csv_bytes, "text/csv")},
+    )
+
+    assert r.status_code == 200, r.text
+    assert [(row["candidate_name"], row["status"]) for row in r.json()["results"]] == [
+        ("Grace", "created"),
+        ("linus", "created"),
+    ]
+
+    r = client.post(
+        "/admin/interviews/bulk/csv",
+        headers=admin_auth,
+        data={"job_id": str(job_id)},
+        files={"file": ("invites.csv", b"name\nGrace\n", "text/csv")},
+    )
+    assert r.status_code == 400
+
+
+# ----------------------------
+# Sending
+# ----------------------------
+def test_invites_are_sent_in_rate_limited_batches(outbox, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "EMAIL_BATCH_INTERVAL_SECONDS", 1.5)
+    invites = [(f"c{i}@example.com", f"token-{i}") for i in range(5)]
+
+    sent = notification_service.send_candidate_invites_bulk(invites, "Backend Engineer")
+
+    assert sent == 5
+    assert [len(b) for b in outbox.batches] == [2, 2, 1]
+    assert outbox.sleeps == [1.5, 1.5]  # between calls, not before the first
+    email, substitutions = outbox.batches[2][0]
+    assert email == "c4@example.com"
+    assert substitutions == {notification_service.INVITE_LINK_TAG: f"{settings.FRONTEND_BASE_URL}/start?token=token-4"}
+
+
+def test_bulk_invite_queues_one_email_per_created_interview(client, admin_auth, outbox, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_BATCH_SIZE", 2)
+    job_id = create_job(client)
+    create_interview(client, job_id, email="taken2@example.com")
+    emails = ["a@example.com", "b@example.com", "taken2@example.com", "c@example.com"]
+
+    out = _bulk(client, admin_auth, job_id, [{"candidate_email": e} for e in emails])
+
+    assert out["emails_queued"] == 3
+    # The background task runs before TestClient returns
+    assert [[email for email, _ in batch] for batch in outbox.batches] == [
+        ["a@example.com", "b@example.com"],
+        ["c@example.com"],
+    ]
+    assert len(outbox.sleeps) == 1
@@ -0,0 +1,106 @@
+import json
+import types
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.services import followup_bank_service as bank_service
+from app.services.adaptive_interview_service import DEFICIENCY_CATEGORIES, DETAIL, FOLLOWUP_TEMPLATES, IMPACT
+from conftest import create_job
+
+
+def _reply_with(fake_llm, monkeypatch, payload):
+    def create(**kwargs):
+        fake_llm.calls.append(kwargs)
+        message = types.SimpleNamespace(content=json.dumps(payload))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(fake_llm.chat.completions, "create", create)
+
+
+def _question_ids(db, job_id):
+    return [
+        row.id
+        for row in db.query(models.JobQuestion.id).filter_by(job_id=job_id).order_by(models.JobQuestion.order_index)
+    ]
+
+
+def _templates(db, question_id):
+    db.expire_all()
+    return {
+        (t.category, t.text, t.source)
+        for t in db.query(models.FollowupTemplate).filter_by(question_id=question_id)
+    }
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    bank_service.invalidate()
+    yield
+    bank_service.invalidate()
+
+
+# ----------------------------
+# Offline generation
+# ----------------------------
+def test_generate_bank_stores_llm_followups_and_fills_missing_categories(client, db, fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "FOLLOWUP_BANK_PER_CATEGORY", 2)
+    _reply_with(fake_llm, monkeypatch, {"detail": ["Which queries?", "  ", "Which tables?", "Which indexes?"], "IMPACT": "n/a"})
+    job_id = create_job(client, questions=1)
+    (qid,) = _question_ids(db, job_id)
+
+    totals = bank_service.generate_bank(db, job_id=job_id)
+
+    assert totals == {"questions": 1, "templates": 5, "defaults": 3, "failed": 0}
+    templates = _templates(db, qid)
+    assert {(c, t) for c, t, s in templates if s == "LLM"} == {(DETAIL, "Which queries?"), (DETAIL, "Which tables?")}
+    assert (IMPACT, FOLLOWUP_TEMPLATES[IMPACT], "DEFAULT") in templates
+    assert {c for c, _, _ in templates} == set(DEFICIENCY_CATEGORIES)
+
+
+@pytest.mark.parametrize("reply", [["Which queries?"], "Which queries?", 3])
+def test_non_object_reply_is_skipped_and_retried_next_run(client, db, fake_llm, monkeypatch, reply):
+    _reply_with(fake_llm, monkeypatch, reply)
+    job_id = create_job(client, questions=2)
+    qids = _question_ids(db, job_id)
+
+    totals = bank_service.generate_bank(db, job_id=job_id)
+
+    assert totals == {"questions": 0, "templates": 0, "defaults": 0, "failed": 2}
+    assert all(_templates(db, qid) == set() for qid in qids)
+
+    _reply_with(fake_llm, monkeypatch, {DETAIL: ["Which queries?"]})
+    assert bank_service.generate_bank(db, job_id=job_id)["questions"] == 2
+
+
+# ----------------------------
+# Process cache
+# ----------------------------
+def test_cache_evicts_the_least_recently_used_question(client, db, sql_statements, monkeypatch):
+    monkeypatch.setattr(settings, "FOLLOWUP_BANK_CACHE_SIZE", 2)
+    q1, q2, q3 = _question_ids(db, create_job(client, questions=3))
+
+    bank_service.get_bank(db, q1)
+    bank_service.get_bank(db, q2)
+    bank_service.get_bank(db, q1)  # q1 is now the most recently used
+    bank_service.get_bank(db, q3)
+
+    assert list(bank_service._cache) == [q1, q3]
+    sql_statements.clear()
+    bank_service.get_bank(db, q1)
+    assert sql_statements == []
+    bank_service.get_bank(db, q2)
+    assert len(sql_statements) == 1
+    assert list(bank_service._cache) == [q1, q2]
+
+
+def test_cached_bank_is_dropped_when_the_bank_is_regenerated(client, db, fake_llm, monkeypatch):
+    _reply_with(fake_llm, monkeypatch, {DETAIL: ["Which queries?"]})
+    job_id = create_job(client, questions=1)
+    (qid,) = _question_ids(db, job_id)
+    assert bank_service.get_bank(db, qid) == {}  # no bank yet, cached as empty
+
+    bank_service.generate_bank(db, job_id=job_id)
+
+    assert bank_service.get_bank(db, qid)[DETAIL] == ["Which queries?"]
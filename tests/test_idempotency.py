@@ -0,0 +1,80 @@
+import pytest
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import interview_service
+from conftest import GOOD_ANSWER
+
+
+@pytest.fixture(autouse=True)
+def _no_reuse(monkeypatch):
+    # Similarity reuse would skip the LLM for GOOD_ANSWER once another test stored it
+    monkeypatch.setattr(settings, "SIMILARITY_ENABLED", False)
+
+
+def _answers(interview_id):
+    with SessionLocal() as s:
+        return s.query(models.InterviewAnswer).filter_by(interview_id=interview_id).count()
+
+
+def _answer(client, interview_id, key=None, **payload):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post(f"/interviews/{interview_id}/answer", headers=headers, json={"answer_text": GOOD_ANSWER, **payload})
+
+
+def test_retried_key_replays_the_stored_response(client, started, fake_llm):
+    first = _answer(client, started["id"], key="k-1")
+    calls = len(fake_llm.calls)
+
+    again = _answer(client, started["id"], key="k-1")
+
+    assert first.status_code == again.status_code == 200
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert again.json() == first.json()
+    assert len(fake_llm.calls) == calls
+    assert _answers(started["id"]) == 1
+
+
+def test_key_can_travel_in_answer_meta(client, started):
+    first = _answer(client, started["id"], answer_meta={"client_answer_id": "meta-1"})
+    again = _answer(client, started["id"], answer_meta={"client_answer_id": "meta-1"})
+
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json() == first.json()
+    assert _answers(started["id"]) == 1
+
+
+def test_overlong_key_is_400(client, started):
+    r = _answer(client, started["id"], key="k" * 256)
+    assert r.status_code == 400
+
+
+def test_key_committed_by_another_worker_wins(client, started, monkeypatch):
+    winner = {
+        "asked_question_text": "Tell me about a migration you led.",
+        "is_followup": False,
+        "followup_round": 0,
+        "score": 5,
+        "competency_scores": None,
+        "ai_feedback": "from the other worker",
+        "next_question": None,
+        "interview_status": "IN_PROGRESS",
+    }
+    real_lock = interview_service._lock_progress
+
+    def lock_after_other_worker(db, interview_id, expected):
+        # Another worker stores the same key between our checks and our commit
+        with SessionLocal() as other:
+            other.add(models.AnswerIdempotencyKey(interview_id=interview_id, key="k-race", response=winner))
+            other.commit()
+        real_lock(db, interview_id, expected)
+
+    monkeypatch.setattr(interview_service, "_lock_progress", lock_after_other_worker)
+    r = _answer(client, started["id"], key="k-race")
+
+    assert r.status_code == 200, r.text
+    assert r.json()["ai_feedback"] == "from the other worker"
+    # Our transaction (answer row, progress update) was rolled back with the duplicate key
+    assert _answers(started["id"]) == 0
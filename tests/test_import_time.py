@@ -0,0 +1,41 @@
+"""
+Cold import budget for app.main, measured in a fresh interpreter with
+-X importtime. The heavy SDKs must stay out of the import graph; they are
+loaded on first use.
+"""
+import os
+import re
+import subprocess
+import sys
+
+from conftest import ROOT
+
+# Cumulative microseconds for app.main; ~0.75s locally, so this only trips on a real regression
+IMPORT_BUDGET_US = 2_000_000
+DEFERRED_MODULES = ("openai", "sendgrid", "passlib", "jose")
+
+
+def _import_times():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)", line)
+        if m:
+            times[m.group(3)] = int(m.group(1))
+    return times
+
+
+def test_app_import_stays_within_budget():
+    times = _import_times()
+
+    assert times["app.main"] < IMPORT_BUDGET_US, f"import app.main took {times['app.main'] / 1e6:.2f}s"
+    loaded = sorted(name for name in times if name.split(".")[0] in DEFERRED_MODULES)
+    assert loaded == [], loaded
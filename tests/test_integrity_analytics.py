@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from app import models
+from app.services.integrity_analytics_service import compute_cohort_integrity
+from conftest import create_interview, create_job
+
+NOW = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def _events(db, interview_id, *types):
+    for et in types:
+        db.add(models.InterviewProctorEvent(interview_id=interview_id, created_at=NOW, event_type=et, severity=1))
+
+
+def test_cohort_scores_match_a_hand_computed_cohort(client, db):
+    job_id = create_job(client)
+    a, b, c = (create_interview(client, job_id, email=f"{n}@example.com")["id"] for n in "abc")
+
+    # a: 4 x TAB_HIDDEN = 32, escalation (4 - 2) * 5 = 10 -> penalty 42, score 58
+    _events(db, a, *["TAB_HIDDEN"] * 4)
+    # b: PASTE raw + 2 in a bucket = 30, " copy" normalizes to COPY = 4 -> penalty 34, score 66
+    _events(db, b, "PASTE", " copy")
+    db.add(models.InterviewProctorBucket(interview_id=b, bucket_start=NOW, event_type="PASTE", count=2, max_severity=1))
+    # c: unknown types weigh nothing -> score 100
+    _events(db, c, "MOUSE_WIGGLE")
+    db.commit()
+
+    out = compute_cohort_integrity(db, job_id=job_id, top_n=2, version="v1")
+
+    assert out["interviews"] == 3
+    assert out["events"] == 4 + 3 + 1 + 1
+    assert out["mean_score"] == round((58 + 66 + 100) / 3, 2)
+    assert out["percentiles"]["50"] == 66.0
+    # penalties 42, 34, 0: median 34, MAD 8
+    assert out["outliers"] == [
+        {"interview_id": a, "score": 58, "penalty": 42, "z_score": 0.67, "counts": {"TAB_HIDDEN": 4}},
+        {"interview_id": b, "score": 66, "penalty": 34, "z_score": 0.0, "counts": {"PASTE": 3, "COPY": 1}},
+    ]
+
+
+def test_empty_cohort(client, db):
+    job_id = create_job(client)
+
+    out = compute_cohort_integrity(db, job_id=job_id)
+
+    assert (out["interviews"], out["outliers"]) == (0, [])
+
+
+def test_cohort_without_events_scores_100(client, db):
+    job_id = create_job(client)
+    iv = create_interview(client, job_id)["id"]
+
+    out = compute_cohort_integrity(db, interview_ids=[iv], version="v2")
+
+    assert out["window_rules_ignored"] is True
+    assert out["outliers"] == [{"interview_id": iv, "score": 100, "penalty": 0, "z_score": 0.0, "counts": {}}]
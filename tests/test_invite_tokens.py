@@ -0,0 +1,47 @@
+from app.config import settings
+from app.services import interview_service
+from conftest import GOOD_ANSWER
+
+
+def _start(client, token):
+    return client.post(f"/interviews/start/{token}")
+
+
+def test_unknown_token_is_negatively_cached(client, sql_statements):
+    assert _start(client, "no-such-token-1").status_code == 404
+    assert len(sql_statements) == 1
+    sql_statements.clear()
+
+    assert _start(client, "no-such-token-1").status_code == 404
+    assert sql_statements == []
+
+
+def test_negative_entry_expires(client, sql_statements, monkeypatch):
+    monkeypatch.setattr(settings, "INVITE_TOKEN_NEGATIVE_CACHE_SECONDS", 0)
+    _start(client, "no-such-token-2")
+    sql_statements.clear()
+
+    assert _start(client, "no-such-token-2").status_code == 404
+    assert len(sql_statements) == 1
+
+
+def test_cache_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(settings, "INVITE_TOKEN_CACHE_SIZE", 2)
+    for i in range(4):
+        _start(client, f"bounded-{i}")
+
+    assert list(interview_service._token_cache)[-2:] == ["bounded-2", "bounded-3"]
+    assert len(interview_service._token_cache) == 2
+
+
+def test_started_interview_is_reported_without_writing(client, started, fake_llm, sql_statements):
+    fake_llm.score = 2  # low score: the answer gets a follow-up
+    client.post(f"/interviews/{started['id']}/answer", json={"answer_text": GOOD_ANSWER})
+    sql_statements.clear()
+
+    r = _start(client, started["invite_token"])
+
+    assert r.status_code == 200
+    assert r.json()["status"] == "IN_PROGRESS"
+    assert r.json()["next_question"]["is_followup"] is True
+    assert not any(s.lstrip().upper().startswith(("UPDATE", "INSERT")) for s in sql_statements), sql_statements
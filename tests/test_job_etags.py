@@ -0,0 +1,44 @@
+from conftest import ADMIN_HEADERS, create_job
+
+
+def _get(client, job_id, etag=None):
+    headers = {**ADMIN_HEADERS, "If-None-Match": etag} if etag else ADMIN_HEADERS
+    return client.get(f"/jobs/{job_id}", headers=headers)
+
+
+def test_matching_etag_is_304_from_the_revision_query(client, job_id, sql_statements):
+    first = _get(client, job_id)
+    etag = first.headers["ETag"]
+    sql_statements.clear()
+
+    again = _get(client, job_id, etag)
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+    # Only the one-column revision lookup; the job is not loaded
+    assert len(sql_statements) == 1, sql_statements
+    assert _get(client, job_id, f"W/{etag}, \"other\"").status_code == 304
+
+
+def test_question_edit_bumps_the_revision(client, admin_auth):
+    job_id = create_job(client, questions=1)
+    before = _get(client, job_id)
+
+    r = client.post(
+        f"/admin/jobs/{job_id}/questions",
+        headers=admin_auth,
+        json={"text": "What would you automate next?", "order_index": 5},
+    )
+    assert r.status_code == 200, r.text
+
+    after = _get(client, job_id, before.headers["ETag"])
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert [q["text"] for q in after.json()["questions"]][-1] == "What would you automate next?"
+    assert _get(client, job_id, after.headers["ETag"]).status_code == 304
+
+
+def test_unknown_job_is_404(client):
+    assert _get(client, 999999, '"job-999999-1"').status_code == 404
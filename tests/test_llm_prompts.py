@@ -0,0 +1,52 @@
+"""
+Scoring and follow-up calls rely on the provider's prompt cache, which only
+reuses an identical message prefix. Everything before the last message must
+depend on the job alone, never on the question, answer or scores.
+"""
+from app.services import llm_service
+
+JOB = ("Backend Engineer", "Build and run our APIs.", ["python", "sql"])
+
+
+def _scoring(question, answer, job=JOB):
+    title, description, comps = job
+    return llm_service.build_scoring_messages(question, answer, comps, job_title=title, job_description=description)
+
+
+def _followup(question, answer, scoring, round_, job=JOB):
+    title, description, comps = job
+    return llm_service.build_followup_messages(
+        question, answer, comps, scoring, round_, job_title=title, job_description=description
+    )
+
+
+def test_scoring_prefix_is_identical_across_answers_in_a_job():
+    a = _scoring("Tell me about a migration.", "I moved billing to Postgres.")
+    b = _scoring("How do you handle incidents?", "I write a timeline first.")
+
+    assert a[:-1] == b[:-1]
+    assert a[-1] != b[-1]
+
+
+def test_followup_prefix_is_identical_across_answers_in_a_job():
+    a = _followup("Q1", "short", {"overall_score": 2, "feedback": "vague"}, 0)
+    b = _followup("Q2", "longer answer", {"overall_score": 4, "competency_scores": {"python": 4}}, 1)
+
+    assert a[:-1] == b[:-1]
+
+
+def test_system_prompts_do_not_depend_on_the_job():
+    other = ("Data Analyst", "Dashboards.", [])
+
+    assert _scoring("Q", "A")[0] == _scoring("Q", "A", job=other)[0]
+    assert _followup("Q", "A", {}, 0)[0] == _followup("Q", "A", {}, 0, job=other)[0]
+    assert _scoring("Q", "A")[0]["content"] == llm_service.SCORING_SYSTEM_PROMPT
+    assert _followup("Q", "A", {}, 0)[0]["content"] == llm_service.FOLLOWUP_SYSTEM_PROMPT
+
+
+def test_variable_parts_stay_in_the_last_message():
+    question, answer = "UNIQUE-QUESTION-MARKER", "UNIQUE-ANSWER-MARKER"
+    for messages in (_scoring(question, answer), _followup(question, answer, {"feedback": "F-MARKER"}, 0)):
+        prefix = "".join(m["content"] for m in messages[:-1])
+        assert question not in prefix and answer not in prefix and "F-MARKER" not in prefix
+        assert question in messages[-1]["content"] and answer in messages[-1]["content"]
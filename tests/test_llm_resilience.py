@@ -0,0 +1,156 @@
+import types
+
+import httpx
+import openai
+import pytest
+
+from app.config import settings
+from app.services import llm_service
+from app.services.llm_service import CircuitBreaker, LLMUnavailableError
+from conftest import GOOD_ANSWER
+
+MESSAGES = [{"role": "user", "content": "score this"}]
+
+
+def _connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    fresh = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    monkeypatch.setattr(llm_service, "_breaker", fresh)
+    return fresh
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff sleeps requested by _chat_json (not actually slept)."""
+    slept = []
+    clock = types.SimpleNamespace(monotonic=llm_service.time.monotonic, sleep=slept.append)
+    monkeypatch.setattr(llm_service, "time", clock)
+    return slept
+
+
+# ----------------------------
+# Circuit breaker
+# ----------------------------
+def test_breaker_opens_at_threshold_and_lets_one_probe_through(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.allow()
+    breaker.record_success()
+    assert (breaker.state, breaker.failures) == (CircuitBreaker.CLOSED, 0)
+
+
+def test_cancelled_probe_frees_the_slot(breaker):
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.allow()
+
+    breaker.cancel_probe()
+    assert breaker.allow()
+
+
+# ----------------------------
+# Retries
+# ----------------------------
+def test_retryable_errors_back_off_with_full_jitter(fake_llm, breaker, sleeps, monkeypatch):
+    fake_llm.error = _connection_error()
+    ranges = []
+
+    def uniform(low, high):
+        ranges.append((low, high))
+        return high / 2
+
+    monkeypatch.setattr(llm_service.random, "uniform", uniform)
+
+    with pytest.raises(LLMUnavailableError):
+        llm_service._chat_json("score_answer", MESSAGES)
+
+    attempts = settings.LLM_MAX_RETRIES + 1
+    assert len(fake_llm.calls) == attempts
+    base = settings.LLM_BACKOFF_BASE_SECONDS
+    assert ranges == [(0, min(settings.LLM_BACKOFF_MAX_SECONDS, base * 2**i)) for i in range(attempts)]
+    # No sleep after the last attempt
+    assert sleeps == [high / 2 for _, high in ranges[:-1]]
+    assert breaker.failures == 1
+
+
+def test_retry_that_succeeds_records_success(fake_llm, breaker, sleeps, monkeypatch):
+    breaker.failures = 2
+    real_create = fake_llm.create
+    errors = [_connection_error()]
+
+    def flaky(**kwargs):
+        if errors:
+            fake_llm.calls.append(kwargs)
+            raise errors.pop()
+        return real_create(**kwargs)
+
+    monkeypatch.setattr(fake_llm.chat.completions, "create", flaky)
+    data, _ = llm_service._chat_json("score_answer", MESSAGES)
+
+    assert data["overall_score"] == fake_llm.score
+    assert len(fake_llm.calls) == 2 and len(sleeps) == 1
+    assert (breaker.state, breaker.failures) == (CircuitBreaker.CLOSED, 0)
+
+
+def test_non_retryable_error_counts_as_a_healthy_upstream(fake_llm, breaker, sleeps):
+    # A 400 means the provider answered: it must not push the breaker towards open,
+    # and it resets the failure streak like any other answer
+    breaker.failures = 2
+    fake_llm.error = _BadRequest("invalid request")
+
+    with pytest.raises(_BadRequest):
+        llm_service._chat_json("score_answer", MESSAGES)
+
+    assert len(fake_llm.calls) == 1 and sleeps == []
+    assert (breaker.state, breaker.failures) == (CircuitBreaker.CLOSED, 0)
+
+
+# ----------------------------
+# Fallback while the breaker is open
+# ----------------------------
+def test_open_breaker_falls_back_to_heuristic_scoring(fake_llm, breaker):
+    for _ in range(3):
+        breaker.record_failure()
+
+    scoring = llm_service.score_answer("Tell me about a migration.", GOOD_ANSWER, ["python"])
+
+    assert fake_llm.calls == []
+    assert scoring["fallback"] is True
+    assert scoring["competency_scores"] == {"python": scoring["overall_score"]}
+    with pytest.raises(LLMUnavailableError):
+        llm_service.score_answer("Q", GOOD_ANSWER, [], fallback=False)
+
+
+def test_answer_is_scored_while_the_breaker_is_open(client, started, fake_llm, breaker):
+    for _ in range(3):
+        breaker.record_failure()
+
+    r = client.post(f"/interviews/{started['id']}/answer", json={"answer_text": GOOD_ANSWER})
+
+    assert r.status_code == 200, r.text
+    assert r.json()["score"] is not None
+    assert fake_llm.calls == []
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app import migrations, models
+from conftest import TMP_DIR
+
+
+@pytest.fixture
+def fresh_engine(request):
+    path = os.path.join(TMP_DIR, f"{request.node.name}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def test_startup_refuses_an_unmigrated_database(fresh_engine):
+    with pytest.raises(RuntimeError, match="python -m app.migrate"):
+        migrations.check_schema(fresh_engine, auto_migrate=False)
+
+
+def test_auto_migrate_upgrades_then_check_passes(fresh_engine):
+    migrations.check_schema(fresh_engine, auto_migrate=True)
+
+    with fresh_engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.latest_version()
+        assert migrations.pending(conn) == []
+    migrations.check_schema(fresh_engine, auto_migrate=False)
+    assert migrations.upgrade(fresh_engine) == []
+
+
+def test_migrated_schema_matches_models(fresh_engine):
+    migrations.upgrade(fresh_engine)
+    inspector = inspect(fresh_engine)
+
+    for table in models.Base.metadata.sorted_tables:
+        migrated = {c["name"] for c in inspector.get_columns(table.name)}
+        assert migrated == set(table.columns.keys()), table.name
+
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import interview_service
+
+
+@pytest.fixture
+def scoring_pool(monkeypatch):
+    """A private deferred-scoring pool the test can drain."""
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(interview_service, "_get_scoring_pool", lambda: pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def _answer(client, interview_id, text="yes"):
+    r = client.post(f"/interviews/{interview_id}/answer", json={"answer_text": text})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _stored(interview_id):
+    with SessionLocal() as s:
+        (a,) = s.query(models.InterviewAnswer).filter_by(interview_id=interview_id).all()
+        return a.score, a.ai_feedback
+
+
+def test_pregated_answer_skips_the_llm(client, started, fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PREGATE_ASYNC_SCORING", False)
+
+    out = _answer(client, started["id"])
+
+    assert fake_llm.calls == []
+    assert out["next_question"]["is_followup"] is True
+    assert out["next_question"]["question_text"]
+    assert _stored(started["id"])[0] is not None
+
+
+def test_deferred_scoring_writes_the_llm_score_back(client, started, fake_llm, scoring_pool, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PREGATE_ASYNC_SCORING", True)
+    fake_llm.score = 1
+    real_score = interview_service.score_answer
+    seen = {}
+
+    def score_answer(*args, **kwargs):
+        seen.update(kwargs)
+        return real_score(*args, **kwargs)
+
+    monkeypatch.setattr(interview_service, "score_answer", score_answer)
+    out = _answer(client, started["id"])
+    provisional = out["score"]
+    scoring_pool.shutdown(wait=True)
+
+    assert len(fake_llm.calls) == 1
+    assert seen["lane"] == "batch"
+    assert seen["job_title"] == "Backend Engineer"
+    assert _stored(started["id"]) == (1, "Clear and specific.")
+    assert provisional is not None
+
+
+def test_deferred_scoring_keeps_the_provisional_score_on_fallback(client, started, fake_llm, scoring_pool, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PREGATE_ASYNC_SCORING", True)
+    fake_llm.error = RuntimeError("provider down")
+
+    out = _answer(client, started["id"])
+    scoring_pool.shutdown(wait=True)
+
+    assert _stored(started["id"])[0] == out["score"]
@@ -0,0 +1,311 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import proctoring_service
+from app.services.proctoring_rules import get_ruleset
+from conftest import create_interview
+
+
+def _post_event(client, interview_id, event_type):
+    r = client.post(f"/interviews/{interview_id}/proctoring/event", json={"event_type": event_type})
+    assert r.status_code == 200, r.text
+    return r.json()["integrity_score"]
+
+
+def _integrity(interview_id):
+    with SessionLocal() as s:
+        iv = s.get(models.Interview, interview_id)
+        return iv.integrity_score, iv.integrity_flags, iv.integrity_seq
+
+
+def _event(interview_id, event_type):
+    return models.InterviewProctorEvent(
+        interview_id=interview_id,
+        created_at=datetime.now(timezone.utc),
+        event_type=event_type,
+        severity=1,
+        payload={},
+    )
+
+
+# ----------------------------
+# Rule sets
+# ----------------------------
+def test_v1_weights_and_tab_escalation():
+    v1 = get_ruleset("v1")
+    # 4 x TAB_HIDDEN (8 each) + escalation from the 3rd on: (4 - 2) * 5
+    assert v1.evaluate([("TAB_HIDDEN", None)] * 4)["score"] == 100 - 32 - 10
+    assert v1.evaluate([("paste ", None), ("UNKNOWN", None)])["score"] == 90
+
+
+def test_v2_window_rule_counts_a_burst_once():
+    events = [("PASTE", 0.0), ("PASTE", 10.0), ("PASTE", 20.0), ("PASTE", 500.0)]
+
+    assert get_ruleset("v1").evaluate(events)["score"] == 60
+    result = get_ruleset("v2").evaluate(events)
+    assert result["flags"]["window_hits"] == {"paste_burst": 1}
+    assert result["score"] == 60 - 15
+
+
+def test_incremental_state_matches_batch_evaluation():
+    v2 = get_ruleset("v2")
+    events = [("PASTE", 0.0), ("TAB_HIDDEN", 5.0), ("PASTE", 30.0), ("PASTE", 40.0), ("COPY", None)]
+
+    flags = None
+    for et, ts in events:
+        state = v2.state_from_flags(flags) or v2.new_state()
+        v2.apply(state, et, ts)
+        flags = v2.result(state)["flags"]
+
+    assert flags == v2.evaluate(events)["flags"]
+    assert get_ruleset("v1").state_from_flags(flags) is None
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        get_ruleset("v999")
+
+
+# ----------------------------
+# record_event compare-and-swap
+# ----------------------------
+def test_event_endpoint_folds_events_incrementally(client, interview):
+    assert _post_event(client, interview["id"], "TAB_HIDDEN") == 92
+    assert _post_event(client, interview["id"], "PASTE") == 82
+
+    score, flags, seq = _integrity(interview["id"])
+    assert (score, seq) == (82, 2)
+    assert flags["counts"] == {"TAB_HIDDEN": 1, "PASTE": 1}
+
+
+def test_unknown_interview_is_404(client):
+    r = client.post("/interviews/999999/proctoring/event", json={"event_type": "PASTE"})
+    assert r.status_code == 404
+
+
+def test_record_event_retries_when_a_concurrent_write_wins(client, interview, db, monkeypatch):
+    _post_event(client, interview["id"], "PASTE")
+    ruleset = get_ruleset(proctoring_service.active_version())
+    real_apply = ruleset.apply
+    applied = []
+
+    def apply_with_concurrent_event(state, event_type, ts=None):
+        # First attempt: another request records an event between our read and our write
+        first = not applied
+        applied.append(event_type)
+        if first:
+            with SessionLocal() as other:
+                ev = _event(interview["id"], "COPY")
+                other.add(ev)
+                other.flush()
+                proctoring_service.record_event(other, interview["id"], ev)
+                other.commit()
+        real_apply(state, event_type, ts)
+
+    monkeypatch.setattr(ruleset, "apply", apply_with_concurrent_event)
+    # SQLite allows one writer: add our event after the racing write has committed
+    ev = _event(interview["id"], "PASTE")
+    computed = proctoring_service.record_event(db, interview["id"], ev)
+    db.add(ev)
+    db.commit()
+
+    # Ours ran twice; the racing request's COPY went through the wrapper in between
+    assert applied == ["PASTE", "COPY", "PASTE"]
+    score, flags, seq = _integrity(interview["id"])
+    assert flags["counts"] == {"PASTE": 2, "COPY": 1}
+    assert seq == 3
+    assert score == computed["score"] == 100 - 10 - 10 - 4
+
+
+def test_record_event_falls_back_to_a_locked_read(client, interview, db, monkeypatch):
+    _post_event(client, interview["id"], "PASTE")
+    ruleset = get_ruleset(proctoring_service.active_version())
+    real_apply = ruleset.apply
+    attempts = []
+
+    def apply_losing_every_race(state, event_type, ts=None):
+        attempts.append(event_type)
+        if len(attempts) < proctoring_service.RECORD_EVENT_ATTEMPTS:
+            # Moves the seq between our read and write (same connection: SQLite has one writer)
+            db.execute(
+                models.Interview.__table__.update()
+                .where(models.Interview.id == interview["id"])
+                .values(integrity_seq=models.Interview.integrity_seq + 1)
+            )
+        real_apply(state, event_type, ts)
+
+    monkeypatch.setattr(ruleset, "apply", apply_losing_every_race)
+    ev = _event(interview["id"], "PASTE")
+    assert proctoring_service.record_event(db, interview["id"], ev) is not None
+    db.add(ev)
+    db.commit()
+
+    assert len(attempts) == proctoring_service.RECORD_EVENT_ATTEMPTS
+    _, flags, seq = _integrity(interview["id"])
+    assert flags["counts"] == {"PASTE": 2}
+    assert seq == 1 + (proctoring_service.RECORD_EVENT_ATTEMPTS - 1) + 1
+
+
+# ----------------------------
+# Re-evaluation
+# ----------------------------
+def test_reevaluate_rescores_history_and_bumps_seq(client, job_id, interview, db, monkeypatch):
+    for et in ("PASTE", "PASTE", "PASTE"):
+        _post_event(client, interview["id"], et)
+    _, _, seq = _integrity(interview["id"])
+
+    monkeypatch.setattr(settings, "PROCTORING_RULES_VERSION", "v2")
+    totals = proctoring_service.reevaluate_interviews(db, "v2", job_id=job_id)
+
+    assert totals == {"version": "v2", "interviews": 1, "changed": 1}
+    score, flags, new_seq = _integrity(interview["id"])
+    assert (score, new_seq) == (70 - 15, seq + 1)
+    assert flags["version"] == "v2"
+
+    # The next event resumes the v2 state instead of re-deriving it
+    assert _post_event(client, interview["id"], "COPY") == 70 - 15 - 4
+    assert _integrity(interview["id"])[1]["window_hits"] == {"paste_burst": 1}
+
+
+def test_reevaluate_rejects_an_inactive_version(job_id, db):
+    assert proctoring_service.active_version() == "v1"
+    with pytest.raises(ValueError, match="not active"):
+        proctoring_service.reevaluate_interviews(db, "v2", job_id=job_id)
+
+
+def test_event_racing_a_reevaluation_is_reapplied_on_top(client, job_id, interview, db, monkeypatch):
+    for et in ("PASTE", "PASTE", "PASTE"):
+        _post_event(client, interview["id"], et)
+    stale = _integrity(interview["id"])[1]
+    monkeypatch.setattr(settings, "PROCTORING_RULES_VERSION", "v2")
+    ruleset = get_ruleset("v2")
+    real_apply = ruleset.apply
+
+    # Stored flags are v2 state without the paste burst (e.g. written before a rule fix)
+    stale_state = ruleset.new_state()
+    stale_state["counts"] = dict(stale["counts"])
+    db.execute(
+        models.Interview.__table__.update()
+        .where(models.Interview.id == interview["id"])
+        .values(integrity_flags=ruleset.result(stale_state)["flags"])
+    )
+    db.commit()
+
+    def apply_during_reevaluation(state, event_type, ts=None):
+        if ruleset.apply is apply_during_reevaluation:
+            monkeypatch.setattr(ruleset, "apply", real_apply)
+            with SessionLocal() as other:
+                proctoring_service.reevaluate_interviews(other, "v2", job_id=job_id)
+        real_apply(state, event_type, ts)
+
+    monkeypatch.setattr(ruleset, "apply", apply_during_reevaluation)
+    ev = _event(interview["id"], "COPY")
+    proctoring_service.record_event(db, interview["id"], ev)
+    db.add(ev)
+    db.commit()
+
+    # Our first write lost to the re-evaluation; the retry folded COPY into its flags
+    score, flags, _ = _integrity(interview["id"])
+    assert flags["counts"] == {"PASTE": 3, "COPY": 1}
+    assert flags["window_hits"] == {"paste_burst": 1}
+    assert score == 70 - 15 - 4
+
+
+# ----------------------------
+# Retention rollup
+# ----------------------------
+T0 = datetime(2026, 1, 5, 10, 0, 15)
+
+
+def _add_events(interview_id, *events):
+    """events: (seconds after T0, event_type, severity)"""
+    with SessionLocal() as s:
+        for offset, event_type, severity in events:
+            s.add(
+                models.InterviewProctorEvent(
+                    interview_id=interview_id,
+                    created_at=T0 + timedelta(seconds=offset),
+                    event_type=event_type,
+                    severity=severity,
+                    payload={},
+                )
+            )
+        s.commit()
+
+
+def _complete(interview_id, days_ago):
+    with SessionLocal() as s:
+        iv = s.get(models.Interview, interview_id)
+        iv.status = models.InterviewStatus.COMPLETED
+        iv.completed_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+        s.commit()
+
+
+def _raw_count(interview_id):
+    with SessionLocal() as s:
+        return s.query(models.InterviewProctorEvent).filter_by(interview_id=interview_id).count()
+
+
+def _timeline(interview_id):
+    with SessionLocal() as s:
+        return [
+            (b["bucket_start"].replace(tzinfo=None), b["event_type"], b["count"], b["max_severity"])
+            for b in proctoring_service.get_timeline(s, interview_id)
+        ]
+
+
+def test_retention_rolls_old_interviews_into_minute_buckets(client, admin_auth, job_id, interview):
+    _add_events(interview["id"], (0, "PASTE", 2), (20, "paste", 3), (30, "TAB_HIDDEN", 1), (70, "PASTE", 1))
+    _complete(interview["id"], days_ago=40)
+    before = _timeline(interview["id"])
+
+    r = client.post("/admin/proctoring/retention?older_than_days=30", headers=admin_auth)
+
+    assert r.status_code == 200, r.text
+    assert r.json()["interviews"] >= 1
+    assert _raw_count(interview["id"]) == 0
+    minute = T0.replace(second=0)
+    assert _timeline(interview["id"]) == before == [
+        (minute, "PASTE", 2, 3),
+        (minute, "TAB_HIDDEN", 1, 1),
+        (minute + timedelta(minutes=1), "PASTE", 1, 1),
+    ]
+
+
+def test_retention_keeps_recent_and_unfinished_interviews_raw(client, job_id, db):
+    recent = create_interview(client, job_id, email="recent@example.com")
+    running = create_interview(client, job_id, email="running@example.com")
+    _add_events(recent["id"], (0, "COPY", 1))
+    _add_events(running["id"], (0, "COPY", 1))
+    _complete(recent["id"], days_ago=1)
+
+    proctoring_service.downsample_completed_interviews(db, older_than_days=30)
+
+    assert _raw_count(recent["id"]) == 1
+    assert _raw_count(running["id"]) == 1
+
+
+def test_rerun_merges_late_events_into_existing_buckets(job_id, interview, db):
+    _add_events(interview["id"], (0, "PASTE", 1))
+    _complete(interview["id"], days_ago=40)
+    proctoring_service.downsample_completed_interviews(db, older_than_days=30)
+
+    # Arrives after the first rollup, in the same minute
+    _add_events(interview["id"], (10, "PASTE", 5), (90, "COPY", 1))
+    assert _timeline(interview["id"])[0][2:] == (2, 5)  # raw events merged on read
+
+    totals = proctoring_service.downsample_completed_interviews(db, older_than_days=30)
+
+    assert totals["events_removed"] >= 2
+    assert _raw_count(interview["id"]) == 0
+    with SessionLocal() as s:
+        assert s.query(models.InterviewProctorBucket).filter_by(interview_id=interview["id"]).count() == 2
+    minute = T0.replace(second=0)
+    assert _timeline(interview["id"]) == [
+        (minute, "PASTE", 2, 5),
+        (minute + timedelta(minutes=1), "COPY", 1, 1),
+    ]
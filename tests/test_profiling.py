@@ -0,0 +1,36 @@
+import json
+import os
+
+from app.config import settings
+
+
+def _dumps():
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return set()
+    return set(os.listdir(settings.PROFILING_DIR))
+
+
+def test_forced_profile_names_the_route_template(client, interview, admin_auth):
+    before = _dumps()
+    r = client.post(
+        f"/interviews/start/{interview['invite_token']}",
+        headers={**admin_auth, "X-Profile": "1"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["Server-Timing"].startswith("total;dur=")
+
+    (name,) = _dumps() - before
+    assert interview["invite_token"] not in name
+    assert name.endswith("-POST_interviews_start_invite_token.json")
+    with open(os.path.join(settings.PROFILING_DIR, name), encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["trace"]["name"] == "POST /interviews/start/{invite_token}"
+    assert data["trace"]["attrs"]["path"] == "/interviews/start/{invite_token}"
+    assert interview["invite_token"] not in json.dumps(data)
+
+
+def test_profile_header_is_ignored_without_admin_token(client, interview):
+    before = _dumps()
+    r = client.get(f"/interviews/{interview['id']}", headers={"X-Profile": "1"})
+    assert "Server-Timing" not in r.headers
+    assert _dumps() == before
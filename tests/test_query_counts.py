@@ -0,0 +1,51 @@
+"""
+Statement budgets for the candidate hot paths. If one of these grows, a
+change added a query (a lazy load, a refresh, a per-row write) to a request
+that runs for every answer or page load.
+"""
+import pytest
+
+from app.config import settings
+from conftest import GOOD_ANSWER
+
+
+@pytest.fixture(autouse=True)
+def _no_process_caches(monkeypatch):
+    # The similarity index and follow-up bank load lazily and are cached per worker;
+    # keep them out so the counts don't depend on test order.
+    monkeypatch.setattr(settings, "SIMILARITY_ENABLED", False)
+    monkeypatch.setattr(settings, "FOLLOWUP_BANK_ENABLED", False)
+
+
+def test_first_start(client, interview, sql_statements):
+    r = client.post(f"/interviews/start/{interview['invite_token']}")
+
+    assert r.status_code == 200
+    # token -> id, joined load of interview + job + questions, UPDATE
+    assert len(sql_statements) == 3, sql_statements
+
+
+def test_repeat_start_is_a_single_read(client, interview, sql_statements):
+    client.post(f"/interviews/start/{interview['invite_token']}")
+    sql_statements.clear()
+
+    r = client.post(f"/interviews/start/{interview['invite_token']}")
+
+    assert r.status_code == 200
+    assert r.json()["status"] == "IN_PROGRESS"
+    assert len(sql_statements) == 1, sql_statements
+    assert sql_statements[0].lstrip().upper().startswith("SELECT")
+
+
+def test_answer(client, interview, sql_statements, fake_llm):
+    client.post(f"/interviews/start/{interview['invite_token']}")
+    sql_statements.clear()
+    llm_calls = len(fake_llm.calls)
+
+    r = client.post(f"/interviews/{interview['id']}/answer", json={"answer_text": GOOD_ANSWER})
+
+    assert r.status_code == 200, r.text
+    assert r.json()["next_question"]["is_followup"] is False
+    assert len(fake_llm.calls) == llm_calls + 1
+    # unlocked joined load, SELECT ... FOR UPDATE re-check, INSERT ... RETURNING, UPDATE
+    assert len(sql_statements) == 4, sql_statements
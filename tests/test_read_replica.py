@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.config import settings
+from conftest import ADMIN_HEADERS, TMP_DIR, create_job
+
+
+def _use_replica(monkeypatch, url):
+    engine = create_engine(url)
+    monkeypatch.setattr(database, "replica_engine", engine)
+    monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    monkeypatch.setattr(database, "_replica_state", {"usable": False, "lag": None, "checked_at": float("-inf")})
+    return engine
+
+
+@pytest.fixture
+def replica(client, monkeypatch):
+    """A copy of the primary SQLite file whose job titles say which database answered."""
+    create_job(client, title="Primary Engineer")
+    path = os.path.join(TMP_DIR, "replica.db")
+    shutil.copyfile(database.engine.url.database, path)
+    engine = _use_replica(monkeypatch, f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE jobs SET title = 'Replica Engineer' WHERE title = 'Primary Engineer'"))
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_CHECK_SECONDS", 0)
+    yield engine
+    engine.dispose()
+
+
+def _served_by(client):
+    r = client.get("/jobs/", headers=ADMIN_HEADERS)
+    assert r.status_code == 200, r.text
+    titles = {j["title"] for j in r.json()}
+    return "replica" if "Replica Engineer" in titles else "primary"
+
+
+def test_reads_go_to_a_current_replica(client, replica):
+    assert _served_by(client) == "replica"
+    assert database._replica_state["lag"] == 0.0
+
+
+def test_lagging_replica_falls_back_to_primary(client, replica, monkeypatch):
+    monkeypatch.setattr(database, "replica_lag_seconds", lambda: settings.DATABASE_REPLICA_MAX_LAG_SECONDS + 1)
+    assert _served_by(client) == "primary"
+
+    monkeypatch.setattr(database, "replica_lag_seconds", lambda: 0.0)
+    assert _served_by(client) == "replica"
+
+
+def test_unreachable_replica_falls_back_to_primary(client, monkeypatch):
+    create_job(client, title="Primary Engineer")
+    missing = os.path.join(TMP_DIR, "no-such-dir", "replica.db")
+    _use_replica(monkeypatch, f"sqlite:///{missing}?mode=ro")
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_CHECK_SECONDS", 0)
+
+    assert _served_by(client) == "primary"
+    state = database._replica_state
+    assert state["checked_at"] > float("-inf")
+    assert (state["usable"], state["lag"]) == (False, None)
+
+
+def test_lag_is_rechecked_only_after_the_interval(client, replica, monkeypatch):
+    checks = []
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_CHECK_SECONDS", 3600)
+    monkeypatch.setattr(database, "replica_lag_seconds", lambda: checks.append(1) or 0.0)
+
+    assert [_served_by(client) for _ in range(3)] == ["replica"] * 3
+    assert len(checks) == 1
+
+
+def test_writes_always_use_the_primary(client, replica):
+    job_id = create_job(client, title="Written Engineer")
+    with replica.connect() as conn:
+        assert conn.execute(text("SELECT 1 FROM jobs WHERE id = :id"), {"id": job_id}).first() is None
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app import models
+from app.services import rescoring_service
+from app.services.llm_service import LLMUnavailableError
+from conftest import GOOD_ANSWER, create_interview, create_job
+
+
+@pytest.fixture
+def answers(client, db, fake_llm):
+    """A fresh job with three answers scored 4: (job_id, answer ids in id order)."""
+    job_id = create_job(client)
+    for i in range(3):
+        iv = create_interview(client, job_id, email=f"rescore{i}@example.com")
+        client.post(f"/interviews/start/{iv['invite_token']}")
+        r = client.post(f"/interviews/{iv['id']}/answer", json={"answer_text": GOOD_ANSWER})
+        assert r.status_code == 200, r.text
+    ids = [
+        row.id
+        for row in db.query(models.InterviewAnswer.id)
+        .join(models.Interview)
+        .filter(models.Interview.job_id == job_id)
+        .order_by(models.InterviewAnswer.id)
+    ]
+    assert len(ids) == 3
+    return job_id, ids
+
+
+def _rescore_job(db, job_id, **fields):
+    job = models.RescoreJob(job_id=job_id, **fields)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _state(db, rescore_job_id):
+    db.expire_all()
+    return db.get(models.RescoreJob, rescore_job_id)
+
+
+def _scores(db, ids):
+    db.expire_all()
+    return [db.get(models.InterviewAnswer, i).score for i in ids]
+
+
+def test_rescore_updates_every_answer(db, fake_llm, answers):
+    job_id, ids = answers
+    fake_llm.score = 2
+    rescore_id = _rescore_job(db, job_id, batch_size=2)
+
+    rescoring_service.run_rescore_job(rescore_id)
+
+    job = _state(db, rescore_id)
+    assert (job.status, job.processed, job.failed, job.total) == ("COMPLETED", 3, 0, 3)
+    assert job.last_answer_id == ids[-1]
+    assert _scores(db, ids) == [2, 2, 2]
+
+
+def test_resume_continues_after_the_checkpoint(client, admin_auth, db, fake_llm, answers):
+    job_id, ids = answers
+    fake_llm.score = 5
+    # A run that failed after committing its first chunk
+    rescore_id = _rescore_job(db, job_id, status="FAILED", total=3, processed=1, last_answer_id=ids[0])
+    calls = len(fake_llm.calls)
+
+    r = client.post(f"/admin/rescore-jobs/{rescore_id}/resume", headers=admin_auth)
+    assert r.status_code == 200, r.text
+
+    job = _state(db, rescore_id)
+    assert (job.status, job.processed, job.last_answer_id) == ("COMPLETED", 3, ids[-1])
+    assert len(fake_llm.calls) - calls == 2  # only the answers after the checkpoint
+    assert _scores(db, ids) == [4, 5, 5]
+
+    r = client.post(f"/admin/rescore-jobs/{rescore_id}/resume", headers=admin_auth)
+    assert r.status_code == 400
+
+
+def test_unavailable_llm_pauses_at_the_checkpoint_and_resume_continues(client, admin_auth, db, fake_llm, answers, monkeypatch):
+    job_id, ids = answers
+    fake_llm.score = 5
+    real_score = rescoring_service.score_answer
+    scored = []
+
+    def score_until_outage(*args, **kwargs):
+        if len(scored) == 1:
+            raise LLMUnavailableError("LLM circuit breaker is open")
+        scored.append(args[1])
+        return real_score(*args, **kwargs)
+
+    monkeypatch.setattr(rescoring_service, "score_answer", score_until_outage)
+    rescore_id = _rescore_job(db, job_id, batch_size=10, concurrency=1)
+    rescoring_service.run_rescore_job(rescore_id)
+
+    # Stopped just before the first answer it couldn't score
+    job = _state(db, rescore_id)
+    assert (job.status, job.processed, job.last_answer_id) == ("PAUSED", 1, ids[0])
+    assert f"after answer {ids[0]}" in job.error
+    assert _scores(db, ids) == [5, 4, 4]
+
+    # Resume (the background task runs before the response returns in TestClient)
+    monkeypatch.setattr(rescoring_service, "score_answer", real_score)
+    calls = len(fake_llm.calls)
+    r = client.post(f"/admin/rescore-jobs/{rescore_id}/resume", headers=admin_auth)
+    assert r.status_code == 200, r.text
+
+    job = _state(db, rescore_id)
+    assert (job.status, job.processed, job.error) == ("COMPLETED", 3, None)
+    assert len(fake_llm.calls) - calls == 2  # only the two answers after the checkpoint
+    assert _scores(db, ids) == [5, 5, 5]
+
+    r = client.post(f"/admin/rescore-jobs/{rescore_id}/resume", headers=admin_auth)
+    assert r.status_code == 400
+
+
+def test_resume_refuses_a_job_that_is_still_checkpointing(client, admin_auth, db, answers):
+    job_id, _ = answers
+    rescore_id = _rescore_job(db, job_id, status="RUNNING", updated_at=datetime.now(timezone.utc))
+
+    r = client.post(f"/admin/rescore-jobs/{rescore_id}/resume", headers=admin_auth)
+
+    assert r.status_code == 409
+    assert _state(db, rescore_id).status == "RUNNING"
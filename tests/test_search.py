@@ -0,0 +1,81 @@
+import pytest
+
+from app.migrations.versions import m0007_search_indexes
+from app.services.search_service import SCOPES, pg_document
+from conftest import create_interview
+
+
+def test_index_snapshot_matches_search_queries():
+    # m0007 is frozen; if a scope changes, this fails until a migration rebuilds its index
+    by_table = {scope.table: scope for scope in SCOPES.values()}
+
+    assert {table for table, _, _ in m0007_search_indexes.DOCUMENTS} == set(by_table)
+    for table, columns, config in m0007_search_indexes.DOCUMENTS:
+        assert m0007_search_indexes._pg_expression(columns, config) == pg_document(by_table[table])
+
+
+@pytest.fixture
+def candidates(client, job_id):
+    ids = [
+        create_interview(client, job_id, name=f"Zqpage Candidate{i}", email=f"zqpage{i}@example.com")["id"]
+        for i in range(5)
+    ]
+    return ids
+
+
+def _search(client, admin_auth, **params):
+    r = client.get("/admin/search", params=params, headers=admin_auth)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_keyset_pages_cover_every_match_once(client, admin_auth, candidates):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"q": "zqpage", "scope": "interviews", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _search(client, admin_auth, **params)
+        pages += 1
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(candidates)
+
+
+def test_interview_scope_matches_word_prefixes(client, admin_auth, job_id):
+    iv = create_interview(client, job_id, name="Marguerite Zqvantastic", email="mzq@example.com")
+
+    items = _search(client, admin_auth, q="zqvan", scope="interviews")["items"]
+
+    assert [i["id"] for i in items] == [iv["id"]]
+    assert items[0]["interview_id"] == iv["id"]
+    assert "<mark>" in items[0]["snippet"]
+
+
+def test_answer_scope_matches_whole_words_only(client, admin_auth, started):
+    client.post(
+        f"/interviews/{started['id']}/answer",
+        json={"answer_text": "We sharded the zqledger tables and replayed writes from the queue for a week."},
+    )
+
+    assert len(_search(client, admin_auth, q="zqledger", scope="answers")["items"]) == 1
+    assert _search(client, admin_auth, q="zqledg", scope="answers")["items"] == []
+
+
+def test_snippets_escape_html(client, admin_auth, job_id):
+    create_interview(client, job_id, name="<b>Zqhtml</b>", email="zqhtml@example.com")
+
+    snippet = _search(client, admin_auth, q="zqhtml", scope="interviews")["items"][0]["snippet"]
+
+    assert "<b>" not in snippet
+    assert "&lt;b&gt;" in snippet
+
+
+@pytest.mark.parametrize("params", [{"cursor": "not-a-cursor"}, {"scope": "nope"}])
+def test_bad_cursor_or_scope_is_400(client, admin_auth, params):
+    r = client.get("/admin/search", params={"q": "anything", **params}, headers=admin_auth)
+    assert r.status_code == 400
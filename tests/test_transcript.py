@@ -0,0 +1,62 @@
+from app.services.transcript_service import (
+    CHARS_PER_TOKEN,
+    MIN_ANSWER_TOKENS,
+    compact_transcript,
+    estimate_tokens,
+)
+
+LONG = " ".join(f"word{i}" for i in range(400))  # ~700 tokens
+
+
+def _qa(n_questions=3, followups=1, answer=LONG):
+    qa = []
+    for q in range(n_questions):
+        qa.append({"question": f"Question {q}?", "answer": answer, "score": 3, "question_id": q, "is_followup": False})
+        for r in range(1, followups + 1):
+            qa.append({"question": f"Follow-up {r}?", "answer": answer, "score": 2, "is_followup": True, "parent_question_id": q, "followup_round": r})
+    return qa
+
+
+def test_transcript_exactly_at_budget_is_not_degraded():
+    qa = _qa()
+    full, _ = compact_transcript(qa, token_budget=10**6, answer_max_tokens=256)
+
+    text, stats = compact_transcript(qa, token_budget=estimate_tokens(full), answer_max_tokens=256)
+    assert text == full
+    assert stats["answer_token_cap"] == 256
+
+    _, stats = compact_transcript(qa, token_budget=estimate_tokens(full) - 1, answer_max_tokens=256)
+    assert stats["answer_token_cap"] == 128
+    assert not stats["followups_dropped"]
+
+
+def test_halving_stops_at_the_minimum_cap():
+    # 48 -> 24 would undercut MIN_ANSWER_TOKENS; the cap is clamped to 32 instead
+    qa = _qa(followups=0)
+    at_min, _ = compact_transcript(qa, token_budget=10**6, answer_max_tokens=MIN_ANSWER_TOKENS)
+
+    text, stats = compact_transcript(qa, token_budget=estimate_tokens(at_min), answer_max_tokens=48)
+
+    assert stats["answer_token_cap"] == MIN_ANSWER_TOKENS
+    assert text == at_min
+    assert not stats["followups_dropped"] and not stats["hard_truncated"]
+
+
+def test_dropping_followups_reports_the_cap_it_rendered_with():
+    qa = _qa(followups=3)
+    no_followups, _ = compact_transcript(_qa(followups=0), token_budget=10**6, answer_max_tokens=MIN_ANSWER_TOKENS)
+
+    text, stats = compact_transcript(qa, token_budget=estimate_tokens(no_followups) + 20, answer_max_tokens=200)
+
+    assert stats["followups_dropped"] and not stats["hard_truncated"]
+    assert stats["answer_token_cap"] == MIN_ANSWER_TOKENS
+    assert "Follow-up" not in text
+    assert "Scores: 3, 2, 2, 2" in text
+
+
+def test_hard_truncation_fits_the_budget():
+    text, stats = compact_transcript(_qa(n_questions=20), token_budget=50, answer_max_tokens=512)
+
+    assert stats["hard_truncated"]
+    assert len(text) <= 50 * CHARS_PER_TOKEN
+    assert stats["transcript_tokens"] <= 50